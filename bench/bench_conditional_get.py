@@ -0,0 +1,57 @@
+"""
+Benchmark a poll of a topic page that has not changed: a 304 needs the validator of the page only,
+TopicService.get_page_validator, while a 200 reads the page too and encodes the response.
+
+Run from the repository root: python -m bench.bench_conditional_get
+"""
+import argparse
+import os
+import tempfile
+from flask import Flask, Response
+from bench.bench_utils import create_bench_db, timed
+from src.services.topic_service import TopicService
+from src.utils.cache import TopicPageCache
+from src.utils.daos import PostDAO, TopicDAO, UserDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.response_helper import ResponseHelper
+
+r_helper = ResponseHelper()
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--topics", type=int, default=100)
+  parser.add_argument("--posts", type=int, default=50, help="posts per topic")
+  parser.add_argument("--iterations", type=int, default=5000)
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    db_path = os.path.join(tmp, "bench.sqlite")
+    create_bench_db(db_path, topics=args.topics, posts_per_topic=args.posts)
+    pool = ConnectionPool(db_path, size=1)
+    daos = (TopicDAO("topic", pool), UserDAO("user", pool, cache=None), PostDAO("post", pool))
+    topic_id, page = args.topics // 2, args.posts // PostDAO.PAGE_SIZE // 2
+
+    def full(service: TopicService) -> bytes:
+      service.get_page_validator(topic_id, page)
+      body, _ = r_helper.success_document_response(service.get_topic_page_json(topic_id, page))
+      return Response(body, mimetype="application/json").get_data()
+
+    def not_modified(service: TopicService) -> bytes:
+      service.get_page_validator(topic_id, page)
+      return Response(status=304).get_data()
+
+    with Flask(__name__).app_context():
+      for label, cache in (("no cache", TopicPageCache(0)), ("cached", TopicPageCache())):
+        service = TopicService(*daos, page_cache=cache)
+
+        before = timed(f"200 with page, {label}", lambda: full(service), args.iterations)
+        after = timed(f"304 without page, {label}", lambda: not_modified(service), args.iterations)
+        print(f"{'':<40} 304 is {before / after:.1f}x faster, {len(full(service))} bytes not sent")
+
+    pool.close()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,44 @@
+"""
+Benchmark PostDAO.get_one, the query behind GET /api/posts/<id>, with and without the connection pool.
+
+Run from the repository root: python -m bench.bench_connection_pool
+"""
+import argparse
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from bench.bench_utils import create_bench_db, timed
+from src.utils.daos import PostDAO
+from src.utils.daos.connection_pool import ConnectionPool
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--iterations", type=int, default=5000)
+  parser.add_argument("--threads", type=int, default=4)
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    db_path = os.path.join(tmp, "bench.sqlite")
+    create_bench_db(db_path)
+
+    results = {}
+
+    for label, size in (("connect per call (size=0)", 0), ("pooled (size=5)", 5)):
+      dao = PostDAO("post", ConnectionPool(db_path, size=size))
+      results[label] = timed(f"{label}, 1 thread", lambda dao=dao: dao.get_one(42), args.iterations)
+
+      with ThreadPoolExecutor(args.threads) as executor:
+        timed(
+          f"{label}, {args.threads} threads",
+          lambda dao=dao, executor=executor: list(executor.map(dao.get_one, range(1, args.threads + 1))),
+          args.iterations // args.threads
+        )
+
+    unpooled, pooled = results.values()
+    print(f"Pool saves {unpooled - pooled:.1f} us ({(1 - pooled / unpooled) * 100:.0f}%) per single threaded call.")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,35 @@
+"""
+Benchmark importing posts, one PostDAO.create per post against one PostDAO.create_many for all of them.
+
+Run from the repository root: python -m bench.bench_create_many
+"""
+import argparse
+import os
+import tempfile
+from bench.bench_utils import create_bench_db, timed
+from src.utils.daos import PostDAO
+from src.utils.daos.connection_pool import ConnectionPool
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--posts", type=int, default=2000)
+  args = parser.parse_args()
+
+  posts = [{"author": 1 + i % 100, "topic_id": 1 + i % 100, "body": f"Imported post {i}"} for i in range(args.posts)]
+
+  with tempfile.TemporaryDirectory() as tmp:
+    db_path = os.path.join(tmp, "bench.sqlite")
+    create_bench_db(db_path)
+    dao = PostDAO("post", ConnectionPool(db_path, size=1))
+    dao.rebuild_page_index()
+
+    one_by_one = timed(f"create, {args.posts} posts", lambda: [dao.create(post) for post in posts], 1)
+    batch = timed(f"create_many, {args.posts} posts", lambda: dao.create_many(posts), 1)
+
+  print(f"create_many is {one_by_one / batch:.1f}x faster.")
+
+
+if __name__ == "__main__":
+  main()
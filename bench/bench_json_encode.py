@@ -0,0 +1,65 @@
+"""
+Benchmark encoding the response bodies of the API, Flask's DefaultJSONProvider against FastJSONProvider, on
+payloads read by the services: a topic page, the latest topics and a page of posts with non-ASCII text.
+
+Run from the repository root: python -m bench.bench_json_encode
+"""
+import argparse
+import os
+import tempfile
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from bench.bench_utils import create_bench_db, timed
+from src.services.topic_service import TopicService
+from src.utils.cache import TopicPageCache
+from src.utils.daos import PostDAO, TopicDAO, UserDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.json_provider import FastJSONProvider
+from src.utils.response_helper import ResponseHelper
+
+r_helper = ResponseHelper()
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--topics", type=int, default=100)
+  parser.add_argument("--posts", type=int, default=50, help="posts per topic")
+  parser.add_argument("--iterations", type=int, default=5000)
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    db_path = os.path.join(tmp, "bench.sqlite")
+    create_bench_db(db_path, topics=args.topics, posts_per_topic=args.posts)
+    pool = ConnectionPool(db_path, size=1)
+    service = TopicService(
+      TopicDAO("topic", pool), UserDAO("user", pool, cache=None), PostDAO("post", pool), page_cache=TopicPageCache(0)
+    )
+
+    page = service.get_topic_posts_users(args.topics // 2, 1)
+    translated = {
+      **page, "posts": [{**post, "body": post["body"] + " Hälsningar från Göteborg ✓"} for post in page["posts"]]
+    }
+    payloads = {
+      "topic page": r_helper.success_response(page)[0],
+      "latest topics": r_helper.success_response(service.get_latest_topics(100))[0],
+      "topic page, non-ASCII": r_helper.success_response(translated)[0],
+    }
+
+    app = Flask(__name__)
+    default, fast = DefaultJSONProvider(app), FastJSONProvider(app)
+
+    with app.app_context():
+      for label, payload in payloads.items():
+        body = default.response(payload).get_data()
+        assert fast.response(payload).get_data() == body
+
+        before = timed(f"{label}, json", lambda: default.response(payload).get_data(), args.iterations)
+        after = timed(f"{label}, orjson", lambda: fast.response(payload).get_data(), args.iterations)
+        print(f"{'':<40} orjson is {before / after:.1f}x faster, same {len(body)} bytes")
+
+    pool.close()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,105 @@
+"""
+Benchmark the sqlite tuning profiles with a mixed workload: reader threads run the query behind
+GET /api/topics/latest while writer threads create posts like POST /api/posts.
+
+Run from the repository root: python -m bench.bench_profiles
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from bench.bench_utils import create_bench_db
+from src.utils.daos import PostDAO, TopicDAO
+from src.utils.daos.connection_pool import ConnectionPool, PROFILES
+
+
+def run_workload(db_path: str, profile: str, readers: int, writers: int, seconds: float) -> dict[str, float]:
+  """Run readers and writers against a database for some seconds.
+
+  Args:
+    db_path (str):    Path to the database.
+    profile (str):    Name of the tuning profile.
+    readers (int):    Number of reading threads.
+    writers (int):    Number of writing threads.
+    seconds (float):  How long to run.
+
+  Returns:
+    dict:             Reads and writes per second, locked errors and the slowest read in ms
+  """
+  pool = ConnectionPool(db_path, size=readers + writers, profile=profile)
+  topic_dao = TopicDAO("topic", pool)
+  post_dao = PostDAO("post", pool)
+  counts = {"reads": 0, "writes": 0, "locked": 0, "max_read_ms": 0.0}
+  lock = threading.Lock()
+  stop = time.perf_counter() + seconds
+
+  def count(key: str, read_ms: float = 0.0) -> None:
+    with lock:
+      counts[key] += 1
+      counts["max_read_ms"] = max(counts["max_read_ms"], read_ms)
+
+  def read() -> None:
+    while time.perf_counter() < stop:
+      start = time.perf_counter()
+      try:
+        topic_dao.get_latest_topics(10)
+        count("reads", (time.perf_counter() - start) * 1000)
+      except sqlite3.OperationalError:
+        count("locked")
+
+  def write() -> None:
+    n = 0
+    while time.perf_counter() < stop:
+      n += 1
+      try:
+        post_dao.create({"author": 1, "topic_id": 1 + n % 100, "body": f"Benchmark post {n}"})
+        count("writes")
+      except sqlite3.OperationalError:
+        count("locked")
+
+  threads = [threading.Thread(target=read) for _ in range(readers)]
+  threads += [threading.Thread(target=write) for _ in range(writers)]
+
+  for thread in threads:
+    thread.start()
+
+  for thread in threads:
+    thread.join()
+
+  pool.close()
+
+  return {
+    "reads/s": counts["reads"] / seconds,
+    "writes/s": counts["writes"] / seconds,
+    "locked": counts["locked"],
+    "max read ms": counts["max_read_ms"],
+  }
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--readers", type=int, default=4)
+  parser.add_argument("--writers", type=int, default=2)
+  parser.add_argument("--seconds", type=float, default=5)
+  parser.add_argument("--profiles", nargs="*", default=list(PROFILES))
+  args = parser.parse_args()
+
+  print(f"{'profile':<14}{'reads/s':>10}{'writes/s':>10}{'locked':>8}{'max read ms':>13}")
+
+  for profile in args.profiles:
+    with tempfile.TemporaryDirectory() as tmp:
+      db_path = os.path.join(tmp, "bench.sqlite")
+      create_bench_db(db_path)
+      result = run_workload(db_path, profile, args.readers, args.writers, args.seconds)
+
+    print(
+      f"{profile:<14}{result['reads/s']:>10.0f}{result['writes/s']:>10.0f}"
+      f"{result['locked']:>8}{result['max read ms']:>13.1f}"
+    )
+
+
+if __name__ == "__main__":
+  main()
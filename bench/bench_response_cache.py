@@ -0,0 +1,44 @@
+"""
+Benchmark anonymous GET requests through the whole app, answered by the routes against answered by the response
+cache. Requests with an Authorization header skip the cache, so they time the routes with the caches below it.
+
+Run from the repository root: python -m bench.bench_response_cache
+"""
+import argparse
+import os
+import tempfile
+from bench.bench_utils import create_bench_db, timed
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--topics", type=int, default=100)
+  parser.add_argument("--posts", type=int, default=50, help="posts per topic")
+  parser.add_argument("--iterations", type=int, default=2000)
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    db_path = os.path.join(tmp, "bench.sqlite")
+    create_bench_db(db_path, topics=args.topics, posts_per_topic=args.posts)
+    os.environ["SQLITE_PATH"] = db_path
+
+    # The controllers connect to SQLITE_PATH when the blueprints are imported
+    from passenger_wsgi import application  # pylint: disable=import-outside-toplevel
+    client = application.test_client()
+    routes = {
+      "topic page": f"/api/topics/{args.topics // 2}/page/1",
+      "latest topics": "/api/topics/latest",
+      "categories": "/api/categories",
+    }
+
+    for label, path in routes.items():
+      assert client.get(path).status_code == 200
+
+      before = timed(f"{label}, routes", lambda: client.get(path, headers={"Authorization": ""}), args.iterations)
+      after = timed(f"{label}, response cache", lambda: client.get(path), args.iterations)
+      print(f"{'':<40} response cache is {before / after:.1f}x faster")
+
+
+if __name__ == "__main__":
+  main()
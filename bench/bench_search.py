@@ -0,0 +1,88 @@
+"""
+Benchmark full-text search over a corpus of generated posts, SearchDAO.search with FTS5 against a LIKE scan
+over the posts, for a rare, a common and a prefix search. A common word is in most posts, its time is mostly
+bm25 ranking every match.
+
+Run from the repository root: python -m bench.bench_search [--posts 1000000]
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from bench.bench_utils import create_bench_db, timed
+from src.utils.daos import SearchDAO
+from src.utils.daos.connection_pool import ConnectionPool
+
+WORDS = 20_000
+WORDS_PER_POST = 30
+
+
+def word(n: int) -> str:
+  """The nth word of the generated vocabulary."""
+  letters = "abcdefghijklmnopqrstuvwxyz"
+  return "".join(letters[(n // 26 ** i) % 26] for i in range(4)) + "o"
+
+
+def fill(db_path: str, posts: int, topics: int) -> None:
+  """Add posts with words from a vocabulary with a Zipf like distribution, the index is kept by the triggers."""
+  rand = random.Random(1)
+  cum_weights = list(itertools.accumulate(1 / (n + 1) for n in range(WORDS)))
+  vocabulary = [word(n) for n in range(WORDS)]
+  conn = sqlite3.connect(db_path)
+  conn.execute("PRAGMA journal_mode = WAL")
+  conn.execute("PRAGMA synchronous = OFF")
+
+  for start in range(0, posts, 50_000):
+    conn.executemany(
+      "INSERT INTO post (author, topic_id, body, created) VALUES (?, ?, ?, '2024-01-01 00:00:00')",
+      (
+        (1 + i % 100, 1 + i % topics, " ".join(rand.choices(vocabulary, cum_weights=cum_weights, k=WORDS_PER_POST)))
+        for i in range(start, min(posts, start + 50_000))
+      )
+    )
+    conn.commit()
+
+  conn.close()
+
+
+def like_scan(db_path: str, term: str) -> list:
+  """The search as done without the index, a LIKE scan finding every matching post, as ranking needs them all."""
+  conn = sqlite3.connect(db_path)
+  rows = conn.execute(
+    "SELECT id FROM post WHERE deleted IS NULL AND (body LIKE ? OR title LIKE ?)",
+    (f"%{term}%", f"%{term}%")
+  ).fetchall()
+  conn.close()
+  return rows
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--posts", type=int, default=1_000_000)
+  parser.add_argument("--iterations", type=int, default=20)
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    db_path = os.path.join(tmp, "bench.sqlite")
+    create_bench_db(db_path, posts_per_topic=0)
+
+    start = time.perf_counter()
+    fill(db_path, args.posts, 100)
+    print(f"{args.posts} posts indexed by the triggers in {time.perf_counter() - start:.1f} s")
+
+    dao = SearchDAO("search", ConnectionPool(db_path, size=1, profile="read-heavy"))
+    searches = {"rare": f'"{word(WORDS - 1)}"', "common": f'"{word(0)}"', "prefix": f'"{word(WORDS - 1)[:3]}"*'}
+
+    for label, match in searches.items():
+      term = match.strip('"*')
+      fts = timed(f"fts5 {label} ({term})", lambda: dao.search(match), args.iterations)
+      like = timed(f"like {label} ({term})", lambda: like_scan(db_path, term), max(1, args.iterations // 10))
+      print(f"{'':<40} fts5 is {like / fts:.1f}x faster")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,58 @@
+"""
+Benchmark the response body of a topic page, the dictionaries of TopicService.get_topic_posts_users encoded
+by jsonify against the JSON document of TopicService.get_topic_page_json, with and without the page cache.
+
+Run from the repository root: python -m bench.bench_topic_page
+"""
+import argparse
+import json
+import os
+import tempfile
+from flask import Flask, Response, jsonify
+from bench.bench_utils import create_bench_db, timed
+from src.services.topic_service import TopicService
+from src.utils.cache import TopicPageCache
+from src.utils.daos import PostDAO, TopicDAO, UserDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.response_helper import ResponseHelper
+
+r_helper = ResponseHelper()
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--topics", type=int, default=100)
+  parser.add_argument("--posts", type=int, default=50, help="posts per topic")
+  parser.add_argument("--iterations", type=int, default=5000)
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    db_path = os.path.join(tmp, "bench.sqlite")
+    create_bench_db(db_path, topics=args.topics, posts_per_topic=args.posts)
+    pool = ConnectionPool(db_path, size=1)
+    daos = (TopicDAO("topic", pool), UserDAO("user", pool, cache=None), PostDAO("post", pool))
+    topic_id, page = args.topics // 2, args.posts // PostDAO.PAGE_SIZE // 2
+
+    def dicts(service: TopicService) -> bytes:
+      response, _ = r_helper.success_response(service.get_topic_posts_users(topic_id, page))
+      return jsonify(response).get_data()
+
+    def document(service: TopicService) -> bytes:
+      body, _ = r_helper.success_document_response(service.get_topic_page_json(topic_id, page))
+      return Response(body, mimetype="application/json").get_data()
+
+    with Flask(__name__).app_context():
+      for label, cache in (("no cache", TopicPageCache(0)), ("cached", TopicPageCache())):
+        service = TopicService(*daos, page_cache=cache)
+        assert json.loads(dicts(service)) == json.loads(document(service))
+
+        before = timed(f"dicts + jsonify, {label}", lambda: dicts(service), args.iterations)
+        after = timed(f"json document, {label}", lambda: document(service), args.iterations)
+        print(f"{'':<40} json document is {before / after:.1f}x faster")
+
+    pool.close()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,63 @@
+"""
+Benchmark the latest posts of a user, PostDAO.get_user_posts behind GET /api/users/<id>/posts, with the index
+on (author, deleted, created) against the old index on author only, for users with tens of thousands of posts.
+
+Run from the repository root: python -m bench.bench_user_activity
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+from bench.bench_utils import create_bench_db, timed
+from src.utils.daos import PostDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.pagination import decode_cursor, encode_cursor
+
+PAGE_SIZE = 20
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--users", type=int, default=2)
+  parser.add_argument("--topics", type=int, default=1000)
+  parser.add_argument("--posts", type=int, default=50, help="posts per topic")
+  parser.add_argument("--deep", type=int, default=100, help="page number for the deep page")
+  parser.add_argument("--iterations", type=int, default=200)
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    db_path = os.path.join(tmp, "bench.sqlite")
+    create_bench_db(db_path, users=args.users, topics=args.topics, posts_per_topic=args.posts)
+    indexes = {
+      "author index": "DROP INDEX post_author_created_IDX; CREATE INDEX post_author_IDX ON post (author);",
+      "author, deleted, created index": "DROP INDEX post_author_IDX; "
+                                        "CREATE INDEX post_author_created_IDX ON post (author, deleted, created);",
+    }
+    timings = []
+
+    for label, sql in indexes.items():
+      conn = sqlite3.connect(db_path)
+      conn.executescript(sql + " ANALYZE;")
+      conn.close()
+
+      pool = ConnectionPool(db_path, size=1)
+      dao = PostDAO("post", pool)
+      after = None
+
+      for _ in range(args.deep):
+        last = dao.get_user_posts(1, PAGE_SIZE, after)[-1]
+        after = decode_cursor(encode_cursor(last["created"], last["post_id"]), str, int)
+
+      first = timed(f"first page, {label}", lambda: dao.get_user_posts(1, PAGE_SIZE), args.iterations)
+      deep = timed(f"page {args.deep}, {label}", lambda: dao.get_user_posts(1, PAGE_SIZE, after), args.iterations)
+      timings.append((first, deep))
+      pool.close()
+
+    (first_before, deep_before), (first_after, deep_after) = timings
+    print(f"{'':<40} first page {first_before / first_after:.1f}x faster, "
+          f"page {args.deep} {deep_before / deep_after:.1f}x faster")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,76 @@
+"""
+Helpers shared by the benchmarks, run them from the repository root as modules,
+e.g. python -m bench.bench_connection_pool.
+"""
+import os
+import random
+import sqlite3
+import time
+from typing import Callable
+
+DDL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "ddl.sql")
+
+
+def create_bench_db(path: str, users: int = 100, topics: int = 100, posts_per_topic: int = 50) -> None:
+  """Create a database from db/ddl.sql filled with generated data.
+
+  Args:
+    path (str):             Path for the database, replaced if it exists.
+    users (int):            Number of users.
+    topics (int):           Number of topics.
+    posts_per_topic (int):  Number of posts in every topic.
+  """
+  if os.path.exists(path):
+    os.remove(path)
+
+  conn = sqlite3.connect(path)
+
+  with open(DDL_PATH, "r", encoding="utf-8") as f:
+    conn.executescript(f.read())
+
+  rand = random.Random(1)
+  conn.executemany(
+    "INSERT INTO user (id, username) VALUES (?, ?)",
+    ((i, f"user{i}") for i in range(1, users + 1))
+  )
+  conn.executemany(
+    "INSERT INTO topic (id, created_by, category, title, created) VALUES (?, ?, 1, ?, ?)",
+    ((i, rand.randint(1, users), f"Topic {i}", f"2024-01-01 00:00:{i % 60:02}") for i in range(1, topics + 1))
+  )
+  conn.executemany(
+    "INSERT INTO post (author, topic_id, body, created) VALUES (?, ?, ?, ?)",
+    (
+      (rand.randint(1, users), topic, f"Post {n} in topic {topic}, " * 5, _timestamp(n))
+      for topic in range(1, topics + 1)
+      for n in range(posts_per_topic)
+    )
+  )
+  conn.commit()
+  conn.close()
+
+
+def _timestamp(n: int) -> str:
+  """Timestamp n minutes into 2024, posts in a topic get increasing timestamps."""
+  return f"2024-{1 + n // 40320 % 12:02}-{1 + n // 1440 % 28:02} {n // 60 % 24:02}:{n % 60:02}:00"
+
+
+def timed(label: str, func: Callable[[], None], iterations: int) -> float:
+  """Run func a number of times and print the time per call.
+
+  Args:
+    label (str):        Name to print for the result.
+    func (callable):    Function to run.
+    iterations (int):   Number of calls.
+
+  Returns:
+    float:              Microseconds per call.
+  """
+  start = time.perf_counter()
+
+  for _ in range(iterations):
+    func()
+
+  per_call = (time.perf_counter() - start) / iterations * 1_000_000
+  print(f"{label:<40} {per_call:10.1f} us/call")
+
+  return per_call
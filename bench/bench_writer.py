@@ -0,0 +1,47 @@
+"""
+Benchmark concurrent PostDAO.create, every thread committing on its own connection against the single writer
+with group commit.
+
+Run from the repository root: python -m bench.bench_writer
+"""
+import argparse
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from bench.bench_utils import create_bench_db, timed
+from src.utils.daos import PostDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.writer import Writer
+
+
+def main():
+  """Run the benchmark."""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--posts", type=int, default=2000)
+  parser.add_argument("--threads", nargs="*", type=int, default=[1, 4, 16])
+  parser.add_argument("--profile", default="write-heavy")
+  args = parser.parse_args()
+
+  posts = [{"author": 1 + i % 100, "topic_id": 1 + i % 100, "body": f"Post {i}"} for i in range(args.posts)]
+
+  for threads in args.threads:
+    for label in ("own connection", "single writer"):
+      with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.sqlite")
+        create_bench_db(db_path)
+        pool = ConnectionPool(db_path, size=threads, timeout=60, profile=args.profile)
+        writer = Writer(pool) if label == "single writer" else None
+        dao = PostDAO("post", pool, writer)
+
+        with ThreadPoolExecutor(threads) as executor:
+          per_run = timed(f"{label}, {threads} threads", lambda: list(executor.map(dao.create, posts)), 1)
+
+        print(f"{'':<40} {args.posts / per_run * 1_000_000:10.0f} posts/s")
+
+        if writer is not None:
+          writer.close()
+        pool.close()
+
+
+if __name__ == "__main__":
+  main()
@@ -1,5 +1,22 @@
 DROP TRIGGER IF EXISTS trg_update_post;
+DROP TRIGGER IF EXISTS trg_version_topic;
+DROP TRIGGER IF EXISTS trg_version_post;
+DROP TRIGGER IF EXISTS trg_version_user;
+DROP TRIGGER IF EXISTS trg_insert_post_activity;
+DROP TRIGGER IF EXISTS trg_delete_post_activity;
+DROP TRIGGER IF EXISTS trg_restore_post_activity;
+DROP TRIGGER IF EXISTS trg_insert_post_search;
+DROP TRIGGER IF EXISTS trg_update_post_search;
+DROP TRIGGER IF EXISTS trg_delete_post_search;
+DROP TRIGGER IF EXISTS trg_insert_topic_search;
+DROP TRIGGER IF EXISTS trg_update_topic_search;
+DROP TRIGGER IF EXISTS trg_delete_topic_search;
+DROP TABLE IF EXISTS post_search;
+DROP TABLE IF EXISTS topic_search;
 DROP TRIGGER IF EXISTS trg_update_topic;
+DROP TRIGGER IF EXISTS trg_insert_topic_category;
+DROP TRIGGER IF EXISTS trg_update_topic_category;
+DROP TABLE IF EXISTS post_page;
 DROP TABLE IF EXISTS post;
 DROP TABLE IF EXISTS topic;
 DROP TABLE IF EXISTS category;
@@ -15,21 +32,20 @@ CREATE TABLE "user" (
 	password TEXT,
 	role TEST(15) DEFAULT "author" NOT NULL,
 	signature TEXT(150),
-	avatar TEXT(150)
+	avatar TEXT(150),
+	version INTEGER DEFAULT 0 NOT NULL,
+	changed TIMESTAMP
 );
 
-CREATE UNIQUE INDEX user_id_IDX ON "user" (id);
-
 -- category definition
 
 CREATE TABLE category (
 	id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
 	category TEXT(35) NOT NULL,
-	description TEXT
+	description TEXT,
+	topic_count INTEGER DEFAULT 0 NOT NULL
 );
 
-CREATE UNIQUE INDEX category_id_IDX ON category (id);
-
 -- topic definition
 
 CREATE TABLE topic (
@@ -41,11 +57,20 @@ CREATE TABLE topic (
 	last_edited TIMESTAMP,
 	deleted TIMESTAMP,
 	disabled BOOLEAN DEFAULT FALSE NOT NULL,
+	post_count INTEGER DEFAULT 0 NOT NULL,
+	last_post_id INTEGER,
+	last_post_at TIMESTAMP,
+	version INTEGER DEFAULT 0 NOT NULL,
+	changed TIMESTAMP,
 	CONSTRAINT topic_user_FK FOREIGN KEY (created_by) REFERENCES "user"(id),
 	CONSTRAINT topic_category_FK FOREIGN KEY (category) REFERENCES "category"(id)
 );
 
-CREATE UNIQUE INDEX topic_id_IDX ON topic (id);
+CREATE INDEX topic_created_IDX ON topic (created) WHERE deleted IS NULL;
+CREATE INDEX topic_last_post_IDX ON topic (last_post_at) WHERE deleted IS NULL;
+CREATE INDEX topic_category_created_IDX ON topic (category, deleted, created);
+CREATE INDEX topic_created_by_created_IDX ON topic (created_by, deleted, created);
+CREATE INDEX topic_changed_IDX ON topic (changed);
 
 -- post definition
 
@@ -62,7 +87,28 @@ CREATE TABLE post (
 	CONSTRAINT post_topic_FK FOREIGN KEY (topic_id) REFERENCES "topic"(id)
 );
 
-CREATE UNIQUE INDEX post_id_IDX ON post (id);
+CREATE INDEX post_topic_created_IDX ON post (topic_id, created, id) WHERE deleted IS NULL;
+CREATE INDEX post_author_created_IDX ON post (author, deleted, created);
+
+-- post_page definition, first post of every page of 10 posts in a topic (kept by PostDAO)
+
+CREATE TABLE post_page (
+	topic_id INTEGER NOT NULL,
+	page INTEGER NOT NULL,
+	created TIMESTAMP NOT NULL,
+	post_id INTEGER NOT NULL,
+	PRIMARY KEY (topic_id, page)
+) WITHOUT ROWID;
+
+-- full-text search over posts and topics, the text is read from post and topic (see SearchDAO)
+
+CREATE VIRTUAL TABLE post_search USING fts5(
+	title, body, content = 'post', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE VIRTUAL TABLE topic_search USING fts5(
+	title, content = 'topic', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 2'
+);
 
 -- triggers
 
@@ -75,3 +121,112 @@ CREATE TRIGGER trg_update_post AFTER UPDATE OF body, title ON post
 	BEGIN
 		UPDATE post SET last_edited = CURRENT_TIMESTAMP WHERE id = new.id;
 	END;
+
+-- version and changed of a topic follow every change shown on its pages: the topic, its posts and their authors
+
+CREATE TRIGGER trg_version_topic AFTER UPDATE ON topic WHEN new.version = old.version
+	BEGIN
+		UPDATE topic SET version = old.version + 1, changed = CURRENT_TIMESTAMP WHERE id = new.id;
+	END;
+
+CREATE TRIGGER trg_version_post AFTER UPDATE OF title, body, deleted ON post
+	BEGIN
+		UPDATE topic SET version = version + 1, changed = CURRENT_TIMESTAMP WHERE id = new.topic_id;
+	END;
+
+CREATE TRIGGER trg_version_user AFTER UPDATE OF username, role, signature, avatar ON user
+	BEGIN
+		UPDATE user SET version = version + 1, changed = CURRENT_TIMESTAMP WHERE id = new.id;
+		UPDATE topic SET version = version + 1, changed = CURRENT_TIMESTAMP
+		WHERE created_by = new.id OR id IN (SELECT topic_id FROM post WHERE author = new.id AND deleted IS NULL);
+	END;
+
+-- topic_count of a category follows the topics in it that are not deleted
+
+CREATE TRIGGER trg_insert_topic_category AFTER INSERT ON topic WHEN new.deleted IS NULL
+	BEGIN
+		UPDATE category SET topic_count = topic_count + 1 WHERE id = new.category;
+	END;
+
+CREATE TRIGGER trg_update_topic_category AFTER UPDATE OF category, deleted ON topic
+	WHEN old.category IS NOT new.category OR (old.deleted IS NULL) IS NOT (new.deleted IS NULL)
+	BEGIN
+		UPDATE category SET topic_count = topic_count - 1 WHERE id = old.category AND old.deleted IS NULL;
+		UPDATE category SET topic_count = topic_count + 1 WHERE id = new.category AND new.deleted IS NULL;
+	END;
+
+-- post_count, last_post_id and last_post_at of a topic follow the posts that are not deleted
+
+CREATE TRIGGER trg_insert_post_activity AFTER INSERT ON post WHEN new.deleted IS NULL
+	BEGIN
+		UPDATE topic SET
+			post_count = post_count + 1,
+			last_post_id = CASE WHEN last_post_at IS NULL OR (new.created, new.id) > (last_post_at, last_post_id)
+				THEN new.id ELSE last_post_id END,
+			last_post_at = CASE WHEN last_post_at IS NULL OR (new.created, new.id) > (last_post_at, last_post_id)
+				THEN new.created ELSE last_post_at END
+		WHERE id = new.topic_id;
+	END;
+
+CREATE TRIGGER trg_delete_post_activity AFTER UPDATE OF deleted ON post
+	WHEN old.deleted IS NULL AND new.deleted IS NOT NULL
+	BEGIN
+		UPDATE topic SET post_count = post_count - 1 WHERE id = new.topic_id;
+		UPDATE topic SET (last_post_id, last_post_at) = (
+			SELECT id, created FROM post
+			WHERE topic_id = new.topic_id AND deleted IS NULL
+			ORDER BY created DESC, id DESC
+			LIMIT 1
+		)
+		WHERE id = new.topic_id AND last_post_id = new.id;
+	END;
+
+CREATE TRIGGER trg_restore_post_activity AFTER UPDATE OF deleted ON post
+	WHEN old.deleted IS NOT NULL AND new.deleted IS NULL
+	BEGIN
+		UPDATE topic SET
+			post_count = post_count + 1,
+			last_post_id = CASE WHEN last_post_at IS NULL OR (new.created, new.id) > (last_post_at, last_post_id)
+				THEN new.id ELSE last_post_id END,
+			last_post_at = CASE WHEN last_post_at IS NULL OR (new.created, new.id) > (last_post_at, last_post_id)
+				THEN new.created ELSE last_post_at END
+		WHERE id = new.topic_id;
+	END;
+
+-- post_search and topic_search follow the text of every post and topic, deleted ones are filtered when searching
+
+CREATE TRIGGER trg_insert_post_search AFTER INSERT ON post
+	BEGIN
+		INSERT INTO post_search (rowid, title, body) VALUES (new.id, new.title, new.body);
+	END;
+
+CREATE TRIGGER trg_update_post_search AFTER UPDATE OF title, body ON post
+	BEGIN
+		INSERT INTO post_search (post_search, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+		INSERT INTO post_search (rowid, title, body) VALUES (new.id, new.title, new.body);
+	END;
+
+CREATE TRIGGER trg_delete_post_search AFTER DELETE ON post
+	BEGIN
+		INSERT INTO post_search (post_search, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+	END;
+
+CREATE TRIGGER trg_insert_topic_search AFTER INSERT ON topic
+	BEGIN
+		INSERT INTO topic_search (rowid, title) VALUES (new.id, new.title);
+	END;
+
+CREATE TRIGGER trg_update_topic_search AFTER UPDATE OF title ON topic
+	BEGIN
+		INSERT INTO topic_search (topic_search, rowid, title) VALUES ('delete', old.id, old.title);
+		INSERT INTO topic_search (rowid, title) VALUES (new.id, new.title);
+	END;
+
+CREATE TRIGGER trg_delete_topic_search AFTER DELETE ON topic
+	BEGIN
+		INSERT INTO topic_search (topic_search, rowid, title) VALUES ('delete', old.id, old.title);
+	END;
+
+-- schema version, db/migrate.py applies migrations newer than this
+
+PRAGMA user_version = 7;
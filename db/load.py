@@ -0,0 +1,345 @@
+"""
+Bulk load CSV or NDJSON files into the database, replaces reset_db.py.
+
+Every file is loaded into the table with the same name as the file (post.csv and post.ndjson go into post),
+a directory loads all files in it, users, categories, topics and posts first. CSV files have the column
+names on the first line, empty values become NULL. NDJSON files have one object per line, the keys of the
+first object are the columns.
+
+Rows are streamed in chunks, every chunk is committed together with how far the load has come, so an
+interrupted load continues where it stopped when the command is run again without --reset, which deletes the
+progress with the database. During the load the indexes and triggers of the loaded tables are dropped,
+durability is relaxed (synchronous=OFF, WAL) and afterwards the indexes, triggers and the data derived from
+the posts and topics (see backfill) are built once.
+
+Usage: python db/load.py [--db PATH] [--chunk ROWS] [--reset] [SOURCE ...]
+       python db/load.py [--db PATH] --backfill
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Iterator
+
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DB_DIR))
+
+from src.utils.daos.postdao import PostDAO  # pylint: disable=wrong-import-position
+
+DDL_PATH = os.path.join(DB_DIR, "ddl.sql")
+CSV_DIR = os.path.join(DB_DIR, "csv")
+EXTENSIONS = (".csv", ".ndjson", ".jsonl")
+LOAD_ORDER = ("user", "category", "topic", "post")
+
+PROGRESS_DDL = """
+  CREATE TABLE IF NOT EXISTS _load_progress (
+    source TEXT NOT NULL PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    done BOOLEAN DEFAULT FALSE NOT NULL
+  );
+  CREATE TABLE IF NOT EXISTS _load_schema (
+    name TEXT NOT NULL PRIMARY KEY,
+    sql TEXT NOT NULL
+  );
+"""
+
+BACKFILL_TOPIC_ACTIVITY = """
+  UPDATE topic SET
+    post_count = (SELECT COUNT(*) FROM post WHERE topic_id = topic.id AND deleted IS NULL),
+    (last_post_id, last_post_at) = (
+      SELECT id, created FROM post
+      WHERE topic_id = topic.id AND deleted IS NULL
+      ORDER BY created DESC, id DESC
+      LIMIT 1
+    );
+"""
+
+BACKFILL_CATEGORY_COUNTS = """
+  UPDATE category SET topic_count = (SELECT COUNT(*) FROM topic WHERE category = category.id AND deleted IS NULL);
+"""
+
+REBUILD_SEARCH_INDEX = """
+  INSERT INTO post_search (post_search) VALUES ('rebuild');
+  INSERT INTO topic_search (topic_search) VALUES ('rebuild');
+"""
+
+
+def find_sources(paths: list[str]) -> list[str]:
+  """Get the files to load, directories are expanded to the files in them.
+
+  Args:
+    paths (list):   Files and directories.
+
+  Returns:
+    list:           The files, with the files of a directory in LOAD_ORDER
+  """
+  sources = []
+
+  for path in paths:
+    if not os.path.isdir(path):
+      sources.append(path)
+      continue
+
+    files = [name for name in os.listdir(path) if name.endswith(EXTENSIONS)]
+    files.sort(key=lambda name: (_load_rank(_table_name(name)), name))
+    sources.extend(os.path.join(path, name) for name in files)
+
+  return sources
+
+
+def _load_rank(table: str) -> int:
+  """Get the position of a table in LOAD_ORDER, tables not in it come last."""
+  return LOAD_ORDER.index(table) if table in LOAD_ORDER else len(LOAD_ORDER)
+
+
+def _table_name(path: str) -> str:
+  """Get the table a file is loaded into."""
+  return os.path.splitext(os.path.basename(path))[0]
+
+
+def read_source(path: str) -> tuple[list[str], Iterator[tuple]]:
+  """Open a file and stream its rows.
+
+  Args:
+    path (str): A CSV or NDJSON file.
+
+  Returns:
+    tuple:      The column names and an iterator over the rows, the file is closed when it is exhausted
+
+  Raises:
+    ValueError: If the file is empty or of an unknown type.
+  """
+  if not path.endswith(EXTENSIONS):
+    raise ValueError(f"Unknown file type {path}, expected one of {', '.join(EXTENSIONS)}")
+
+  f = open(path, "r", encoding="utf-8", newline="")
+
+  if path.endswith(".csv"):
+    reader = csv.reader(f)
+    columns = next(reader, None)
+    rows = (tuple(None if value == "" else value for value in row) for row in reader)
+  else:
+    objects = (json.loads(line) for line in f if line.strip())
+    first = next(objects, None)
+    columns = None if first is None else list(first)
+    rows = (tuple(item.get(column) for column in columns) for item in itertools.chain([first], objects))
+
+  if not columns:
+    f.close()
+    raise ValueError(f"{path} is empty")
+
+  def stream():
+    with f:
+      yield from rows
+
+  return columns, stream()
+
+
+def _quote(identifier: str) -> str:
+  """Quote a table or column name."""
+  return '"' + identifier.replace('"', '""') + '"'
+
+
+def prepare(conn: sqlite3.Connection, tables: set[str]) -> None:
+  """Set up the database for loading, unless an interrupted load is continued.
+
+  The schema is created if the database is empty. The indexes and triggers of the loaded tables are
+  saved in _load_schema and dropped, finish() creates them again.
+
+  Args:
+    conn (Connection):  Connection to the database.
+    tables (set):       Tables that are loaded.
+  """
+  if conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0] == 0:
+    with open(DDL_PATH, "r", encoding="utf-8") as f:
+      conn.executescript(f.read())
+
+  conn.executescript(PROGRESS_DDL)
+  placeholders = ", ".join(["?"] * len(tables))
+  objects = conn.execute(f"""
+    SELECT name, sql FROM sqlite_master
+    WHERE type IN ('index', 'trigger')
+    AND sql IS NOT NULL
+    AND tbl_name IN ({placeholders})
+  """, sorted(tables)).fetchall()
+
+  with conn:
+    conn.executemany("INSERT OR IGNORE INTO _load_schema (name, sql) VALUES (?, ?)", objects)
+
+    for name, sql in objects:
+      kind = "INDEX" if sql.upper().startswith(("CREATE INDEX", "CREATE UNIQUE INDEX")) else "TRIGGER"
+      conn.execute(f"DROP {kind} IF EXISTS {_quote(name)}")
+
+
+def load_source(conn: sqlite3.Connection, path: str, chunk_size: int) -> int:
+  """Load one file, continuing after the rows loaded before if it was interrupted.
+
+  Args:
+    conn (Connection):  Connection to the database, prepared with prepare().
+    path (str):         The file.
+    chunk_size (int):   Rows per executemany and commit.
+
+  Returns:
+    int:                Rows loaded now, not counting rows from an earlier run
+
+  Raises:
+    ValueError:         If the table or a column does not exist.
+  """
+  source = os.path.abspath(path)
+  progress = conn.execute("SELECT rows, done FROM _load_progress WHERE source = ?", (source, )).fetchone()
+  skip, done = progress if progress is not None else (0, False)
+
+  if done:
+    return 0
+
+  table = _table_name(path)
+  table_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+  columns, rows = read_source(path)
+
+  if not table_columns:
+    raise ValueError(f"No table {table} for {path}")
+
+  unknown = [column for column in columns if column not in table_columns]
+
+  if unknown:
+    raise ValueError(f"{path}: table {table} has no columns {', '.join(unknown)}")
+
+  insert = f"""
+    INSERT INTO {_quote(table)} ({', '.join(_quote(column) for column in columns)})
+    VALUES ({', '.join(['?'] * len(columns))})
+  """
+  rows = itertools.islice(rows, skip, None)
+  loaded = 0
+
+  while True:
+    chunk = list(itertools.islice(rows, chunk_size))
+
+    with conn:
+      conn.executemany(insert, chunk)
+      loaded += len(chunk)
+      conn.execute("""
+        INSERT INTO _load_progress (source, rows, done) VALUES (?, ?, ?)
+        ON CONFLICT (source) DO UPDATE SET rows = excluded.rows, done = excluded.done
+      """, (source, skip + loaded, len(chunk) < chunk_size))
+
+    if len(chunk) < chunk_size:
+      return loaded
+
+
+def backfill(conn: sqlite3.Connection) -> None:
+  """Rebuild the data kept by triggers and the DAOs: the page index of the posts, the activity of the topics,
+  the topic counts of the categories and the search index.
+
+  Args:
+    conn (Connection):  Connection to the database, in a transaction.
+  """
+  PostDAO.build_page_index(conn.cursor())
+  statements = BACKFILL_TOPIC_ACTIVITY + BACKFILL_CATEGORY_COUNTS + REBUILD_SEARCH_INDEX
+
+  for statement in statements.split(";"):
+    if statement.strip():
+      conn.execute(statement)
+
+
+def finish(conn: sqlite3.Connection) -> None:
+  """Create the dropped indexes and triggers, backfill the derived data and remove the progress.
+
+  Args:
+    conn (Connection):  Connection to the database.
+  """
+  with conn:
+    for (sql, ) in conn.execute("SELECT sql FROM _load_schema").fetchall():
+      conn.execute(sql)
+
+    backfill(conn)
+
+    conn.execute("DROP TABLE _load_progress")
+    conn.execute("DROP TABLE _load_schema")
+
+  conn.execute("PRAGMA optimize")
+
+
+def load(db_path: str, sources: list[str], chunk_size: int = 50_000) -> int:
+  """Load files into a database, creating it if needed.
+
+  Args:
+    db_path (str):      Path to the database.
+    sources (list):     Files to load, from find_sources.
+    chunk_size (int):   Rows per executemany and commit.
+
+  Returns:
+    int:                Rows loaded
+  """
+  conn = sqlite3.connect(db_path, isolation_level="DEFERRED")
+
+  try:
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -262144")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+    prepare(conn, {_table_name(source) for source in sources})
+    total = 0
+    start = time.perf_counter()
+
+    for source in sources:
+      source_start = time.perf_counter()
+      rows = load_source(conn, source, chunk_size)
+      seconds = time.perf_counter() - source_start
+      total += rows
+      print(f"{source}: {rows} rows in {seconds:.2f} s ({rows / max(seconds, 1e-9):,.0f} rows/s)")
+
+    finish(conn)
+    seconds = time.perf_counter() - start
+    print(f"Loaded {total} rows in {seconds:.2f} s ({total / max(seconds, 1e-9):,.0f} rows/s), indexes included")
+
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+
+    return total
+  finally:
+    conn.close()
+
+
+def main():
+  """Run the loader from the command line."""
+  parser = argparse.ArgumentParser(description="Bulk load CSV or NDJSON files into a sqlite database.")
+  parser.add_argument("sources", nargs="*", default=[CSV_DIR], help="files or directories, default db/csv")
+  parser.add_argument("--db", default=os.environ.get("SQLITE_PATH", os.path.join(DB_DIR, "db.sqlite")))
+  parser.add_argument("--chunk", type=int, default=50_000, help="rows per chunk and commit")
+  parser.add_argument("--reset", action="store_true", help="delete the database and start from db/ddl.sql")
+  parser.add_argument(
+    "--backfill",
+    action="store_true",
+    help="only rebuild the page index, topic activity, category topic counts and search index"
+  )
+  args = parser.parse_args()
+
+  if args.backfill:
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+      with conn:
+        backfill(conn)
+    finally:
+      conn.close()
+    return
+
+  if args.reset:
+    for suffix in ("", "-wal", "-shm"):
+      if os.path.exists(args.db + suffix):
+        os.remove(args.db + suffix)
+
+  sources = find_sources(args.sources)
+
+  if not sources:
+    sys.exit("Nothing to load.")
+
+  load(args.db, sources, args.chunk)
+
+
+if __name__ == "__main__":
+  main()
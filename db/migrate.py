@@ -0,0 +1,143 @@
+"""
+Apply schema migrations to a live database without resetting it.
+
+Migrations are the files db/migrations/NNNN_name.sql, applied in order. The version of a database is kept
+in PRAGMA user_version, ddl.sql sets it to the latest migration so a fresh database has nothing to apply.
+Every migration runs in its own transaction together with the version bump. Data that is built by the code of
+the app, like the page index, is built by a hook in the same transaction, see MIGRATION_HOOKS.
+
+Usage: python db/migrate.py [--db PATH] [--target VERSION] [--status]
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+from typing import Callable
+
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DB_DIR))
+
+from src.utils.daos.postdao import PostDAO  # pylint: disable=wrong-import-position
+
+MIGRATIONS_DIR = os.path.join(DB_DIR, "migrations")
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+# Run with a cursor after the SQL of the migration with the same (version, name), in its transaction
+MIGRATION_HOOKS: dict[tuple[int, str], Callable[[sqlite3.Cursor], None]] = {
+  (1, "post_page"): PostDAO.build_page_index,
+}
+
+
+def load_migrations(directory: str = MIGRATIONS_DIR) -> list[tuple[int, str, str]]:
+  """Read all migrations in a directory.
+
+  Args:
+    directory (str):  Directory with the migration files.
+
+  Returns:
+    list:             (version, name, sql) for every migration, sorted by version
+
+  Raises:
+    ValueError:       If two migrations have the same version.
+  """
+  migrations = []
+
+  for file_name in os.listdir(directory):
+    match = MIGRATION_FILE.match(file_name)
+
+    if match is None:
+      continue
+
+    with open(os.path.join(directory, file_name), "r", encoding="utf-8") as f:
+      migrations.append((int(match.group(1)), match.group(2), f.read()))
+
+  migrations.sort()
+  versions = [version for version, _, _ in migrations]
+
+  if len(versions) != len(set(versions)):
+    raise ValueError(f"Duplicate migration versions in {directory}")
+
+  return migrations
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+  """Get the schema version of a database."""
+  return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(
+  conn: sqlite3.Connection,
+  migrations: list[tuple[int, str, str]],
+  target: int | None = None,
+  hooks: dict[tuple[int, str], Callable[[sqlite3.Cursor], None]] | None = None
+) -> list[int]:
+  """Apply the migrations newer than the database, up to target.
+
+  Args:
+    conn (Connection):  Connection to the database.
+    migrations (list):  Migrations from load_migrations.
+    target (int):       Last version to apply, None for all.
+    hooks (dict):       Hooks by (version, name), None for MIGRATION_HOOKS.
+
+  Returns:
+    list:               The applied versions
+
+  Raises:
+    sqlite3.Error:      If a migration fails, that migration is rolled back and the rest are not applied.
+  """
+  applied = []
+  hooks = MIGRATION_HOOKS if hooks is None else hooks
+
+  for version, name, sql in migrations:
+    if version <= current_version(conn) or (target is not None and version > target):
+      continue
+
+    print(f"Applying {version:04}_{name}")
+
+    try:
+      conn.executescript(f"BEGIN IMMEDIATE;\n{sql}\n;")
+
+      if (version, name) in hooks:
+        hooks[(version, name)](conn.cursor())
+
+      conn.execute(f"PRAGMA user_version = {version}")
+      conn.commit()
+    except sqlite3.Error:
+      if conn.in_transaction:
+        conn.rollback()
+      raise
+
+    applied.append(version)
+
+  return applied
+
+
+def main():
+  """Run the migrations from the command line."""
+  parser = argparse.ArgumentParser(description="Apply schema migrations to a sqlite database.")
+  parser.add_argument("--db", default=os.environ.get("SQLITE_PATH", os.path.join(DB_DIR, "db.sqlite")))
+  parser.add_argument("--target", type=int, default=None, help="last version to apply")
+  parser.add_argument("--status", action="store_true", help="only show the version and pending migrations")
+  args = parser.parse_args()
+
+  if not os.path.exists(args.db):
+    sys.exit(f"No database at {args.db}, create it with setup.bash first.")
+
+  migrations = load_migrations()
+  conn = sqlite3.connect(args.db, timeout=30)
+
+  try:
+    version = current_version(conn)
+    pending = [f"{v:04}_{name}" for v, name, _ in migrations if v > version]
+    print(f"{args.db} is at version {version}, pending: {', '.join(pending) or 'none'}")
+
+    if not args.status:
+      migrate(conn, migrations, args.target)
+      print(f"{args.db} is at version {current_version(conn)}")
+  finally:
+    conn.close()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,10 @@
+-- page index for topics, see PostDAO.get_page
+-- the index is filled by PostDAO.build_page_index, see MIGRATION_HOOKS in db/migrate.py
+
+CREATE TABLE IF NOT EXISTS post_page (
+	topic_id INTEGER NOT NULL,
+	page INTEGER NOT NULL,
+	created TIMESTAMP NOT NULL,
+	post_id INTEGER NOT NULL,
+	PRIMARY KEY (topic_id, page)
+) WITHOUT ROWID;
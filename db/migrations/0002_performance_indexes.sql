@@ -0,0 +1,15 @@
+-- indexes for the queries in the DAOs, the unique indexes on id duplicated the primary keys
+
+DROP INDEX IF EXISTS user_id_IDX;
+DROP INDEX IF EXISTS category_id_IDX;
+DROP INDEX IF EXISTS topic_id_IDX;
+DROP INDEX IF EXISTS post_id_IDX;
+
+-- posts in a topic, ordered as pages: PostDAO.get_page, get_post_and_users_after and the page index
+CREATE INDEX IF NOT EXISTS post_topic_created_IDX ON post (topic_id, created, id) WHERE deleted IS NULL;
+
+-- posts by a user, also used when checking post_user_FK
+CREATE INDEX IF NOT EXISTS post_author_IDX ON post (author);
+
+-- latest topics: TopicDAO.get_latest_topics
+CREATE INDEX IF NOT EXISTS topic_created_IDX ON topic (created) WHERE deleted IS NULL;
\ No newline at end of file
@@ -0,0 +1,57 @@
+-- activity of topics kept on the topic rows, see TopicDAO.get_active_topics
+
+ALTER TABLE topic ADD COLUMN post_count INTEGER DEFAULT 0 NOT NULL;
+ALTER TABLE topic ADD COLUMN last_post_id INTEGER;
+ALTER TABLE topic ADD COLUMN last_post_at TIMESTAMP;
+
+-- recently active topics: TopicDAO.get_active_topics
+CREATE INDEX IF NOT EXISTS topic_last_post_IDX ON topic (last_post_at) WHERE deleted IS NULL;
+
+-- post_count, last_post_id and last_post_at of a topic follow the posts that are not deleted
+
+CREATE TRIGGER trg_insert_post_activity AFTER INSERT ON post WHEN new.deleted IS NULL
+	BEGIN
+		UPDATE topic SET
+			post_count = post_count + 1,
+			last_post_id = CASE WHEN last_post_at IS NULL OR (new.created, new.id) > (last_post_at, last_post_id)
+				THEN new.id ELSE last_post_id END,
+			last_post_at = CASE WHEN last_post_at IS NULL OR (new.created, new.id) > (last_post_at, last_post_id)
+				THEN new.created ELSE last_post_at END
+		WHERE id = new.topic_id;
+	END;
+
+CREATE TRIGGER trg_delete_post_activity AFTER UPDATE OF deleted ON post
+	WHEN old.deleted IS NULL AND new.deleted IS NOT NULL
+	BEGIN
+		UPDATE topic SET post_count = post_count - 1 WHERE id = new.topic_id;
+		UPDATE topic SET (last_post_id, last_post_at) = (
+			SELECT id, created FROM post
+			WHERE topic_id = new.topic_id AND deleted IS NULL
+			ORDER BY created DESC, id DESC
+			LIMIT 1
+		)
+		WHERE id = new.topic_id AND last_post_id = new.id;
+	END;
+
+CREATE TRIGGER trg_restore_post_activity AFTER UPDATE OF deleted ON post
+	WHEN old.deleted IS NOT NULL AND new.deleted IS NULL
+	BEGIN
+		UPDATE topic SET
+			post_count = post_count + 1,
+			last_post_id = CASE WHEN last_post_at IS NULL OR (new.created, new.id) > (last_post_at, last_post_id)
+				THEN new.id ELSE last_post_id END,
+			last_post_at = CASE WHEN last_post_at IS NULL OR (new.created, new.id) > (last_post_at, last_post_id)
+				THEN new.created ELSE last_post_at END
+		WHERE id = new.topic_id;
+	END;
+
+-- backfill, the same as python db/load.py --backfill
+
+UPDATE topic SET
+	post_count = (SELECT COUNT(*) FROM post WHERE topic_id = topic.id AND deleted IS NULL),
+	(last_post_id, last_post_at) = (
+		SELECT id, created FROM post
+		WHERE topic_id = topic.id AND deleted IS NULL
+		ORDER BY created DESC, id DESC
+		LIMIT 1
+	);
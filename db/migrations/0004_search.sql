@@ -0,0 +1,48 @@
+-- full-text search over posts and topics, see SearchDAO
+
+CREATE VIRTUAL TABLE post_search USING fts5(
+	title, body, content = 'post', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE VIRTUAL TABLE topic_search USING fts5(
+	title, content = 'topic', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 2'
+);
+
+-- post_search and topic_search follow the text of every post and topic, deleted ones are filtered when searching
+
+CREATE TRIGGER trg_insert_post_search AFTER INSERT ON post
+	BEGIN
+		INSERT INTO post_search (rowid, title, body) VALUES (new.id, new.title, new.body);
+	END;
+
+CREATE TRIGGER trg_update_post_search AFTER UPDATE OF title, body ON post
+	BEGIN
+		INSERT INTO post_search (post_search, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+		INSERT INTO post_search (rowid, title, body) VALUES (new.id, new.title, new.body);
+	END;
+
+CREATE TRIGGER trg_delete_post_search AFTER DELETE ON post
+	BEGIN
+		INSERT INTO post_search (post_search, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+	END;
+
+CREATE TRIGGER trg_insert_topic_search AFTER INSERT ON topic
+	BEGIN
+		INSERT INTO topic_search (rowid, title) VALUES (new.id, new.title);
+	END;
+
+CREATE TRIGGER trg_update_topic_search AFTER UPDATE OF title ON topic
+	BEGIN
+		INSERT INTO topic_search (topic_search, rowid, title) VALUES ('delete', old.id, old.title);
+		INSERT INTO topic_search (rowid, title) VALUES (new.id, new.title);
+	END;
+
+CREATE TRIGGER trg_delete_topic_search AFTER DELETE ON topic
+	BEGIN
+		INSERT INTO topic_search (topic_search, rowid, title) VALUES ('delete', old.id, old.title);
+	END;
+
+-- index the existing posts and topics, the same as python db/load.py --backfill
+
+INSERT INTO post_search (post_search) VALUES ('rebuild');
+INSERT INTO topic_search (topic_search) VALUES ('rebuild');
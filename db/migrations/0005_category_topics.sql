@@ -0,0 +1,23 @@
+-- topics by category: TopicDAO.get_category_topics and CategoryDAO.get_topic_counts
+
+ALTER TABLE category ADD COLUMN topic_count INTEGER DEFAULT 0 NOT NULL;
+
+CREATE INDEX IF NOT EXISTS topic_category_created_IDX ON topic (category, deleted, created);
+
+-- topic_count of a category follows the topics in it that are not deleted
+
+CREATE TRIGGER trg_insert_topic_category AFTER INSERT ON topic WHEN new.deleted IS NULL
+	BEGIN
+		UPDATE category SET topic_count = topic_count + 1 WHERE id = new.category;
+	END;
+
+CREATE TRIGGER trg_update_topic_category AFTER UPDATE OF category, deleted ON topic
+	WHEN old.category IS NOT new.category OR (old.deleted IS NULL) IS NOT (new.deleted IS NULL)
+	BEGIN
+		UPDATE category SET topic_count = topic_count - 1 WHERE id = old.category AND old.deleted IS NULL;
+		UPDATE category SET topic_count = topic_count + 1 WHERE id = new.category AND new.deleted IS NULL;
+	END;
+
+-- backfill, the same as python db/load.py --backfill
+
+UPDATE category SET topic_count = (SELECT COUNT(*) FROM topic WHERE category = category.id AND deleted IS NULL);
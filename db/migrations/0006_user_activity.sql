@@ -0,0 +1,8 @@
+-- posts and topics by a user, newest first: PostDAO.get_user_posts and TopicDAO.get_user_topics
+
+-- replaces post_author_IDX, still used when checking post_user_FK
+DROP INDEX IF EXISTS post_author_IDX;
+CREATE INDEX IF NOT EXISTS post_author_created_IDX ON post (author, deleted, created);
+
+-- also used when checking topic_user_FK
+CREATE INDEX IF NOT EXISTS topic_created_by_created_IDX ON topic (created_by, deleted, created);
@@ -0,0 +1,28 @@
+-- validators for conditional GET: version and changed of topics and users, see Controller._not_modified
+
+ALTER TABLE user ADD COLUMN version INTEGER DEFAULT 0 NOT NULL;
+ALTER TABLE user ADD COLUMN changed TIMESTAMP;
+ALTER TABLE topic ADD COLUMN version INTEGER DEFAULT 0 NOT NULL;
+ALTER TABLE topic ADD COLUMN changed TIMESTAMP;
+
+-- Last-Modified of the latest topics
+CREATE INDEX IF NOT EXISTS topic_changed_IDX ON topic (changed);
+
+-- version and changed of a topic follow every change shown on its pages: the topic, its posts and their authors
+
+CREATE TRIGGER trg_version_topic AFTER UPDATE ON topic WHEN new.version = old.version
+	BEGIN
+		UPDATE topic SET version = old.version + 1, changed = CURRENT_TIMESTAMP WHERE id = new.id;
+	END;
+
+CREATE TRIGGER trg_version_post AFTER UPDATE OF title, body, deleted ON post
+	BEGIN
+		UPDATE topic SET version = version + 1, changed = CURRENT_TIMESTAMP WHERE id = new.topic_id;
+	END;
+
+CREATE TRIGGER trg_version_user AFTER UPDATE OF username, role, signature, avatar ON user
+	BEGIN
+		UPDATE user SET version = version + 1, changed = CURRENT_TIMESTAMP WHERE id = new.id;
+		UPDATE topic SET version = version + 1, changed = CURRENT_TIMESTAMP
+		WHERE created_by = new.id OR id IN (SELECT topic_id FROM post WHERE author = new.id AND deleted IS NULL);
+	END;
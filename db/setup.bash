@@ -2,11 +2,28 @@
 #
 # Script for setting up db
 #
+# Loads db/csv into a new db.sqlite. If a load was interrupted, running the script again continues it
+# where it stopped instead of starting over, --reset would delete the progress of the load with the database.
+#
+
+function interrupted()
+{
+  [ -f db.sqlite ] && python -c "
+import sqlite3, sys
+conn = sqlite3.connect('db.sqlite')
+sys.exit(conn.execute(\"SELECT 1 FROM sqlite_master WHERE name = '_load_progress'\").fetchone() is None)
+"
+}
 
 function setup()
 {
-  sqlite3 db.sqlite < ddl.sql
-  python reset_db.py
+  if interrupted; then
+    python load.py --db db.sqlite csv
+  else
+    python load.py --reset --db db.sqlite csv
+  fi
+
+  python migrate.py --db db.sqlite
 }
 
 setup
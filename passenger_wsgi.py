@@ -8,12 +8,14 @@ from flask import Flask
 from dotenv import load_dotenv
 from src.blueprints.api.apiblueprint import api_blueprint
 from src.blueprints.index import index_blueprint
+from src.utils.json_provider import FastJSONProvider
 
 from flask_jwt_extended import JWTManager
 
 load_dotenv()
 
 application = Flask(__name__)
+application.json = FastJSONProvider(application)
 application.secret_key = os.environ.get("SECRET_KEY", re.sub(r"[^a-z\d]", "", os.path.realpath(__file__)))
 application.config["JWT_SECRET_KEY"] = os.environ.get("JWT_SECRET", "this-is-just-a-not-secret-backup-key")
 jwt = JWTManager(application)
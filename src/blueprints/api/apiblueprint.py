@@ -1,12 +1,17 @@
 """
 API-blueprint, just a file for collecting all API-routes.
 
-This is also the place for handling errors.
+This is also the place for handling errors, the unit of work shared by all DAO calls in a request and the
+cache of responses to anonymous GET requests.
 """
-from flask import Blueprint
+from flask import Blueprint, Response, request
 from src.blueprints.api.userblueprint import user_blueprint
 from src.blueprints.api.postblueprint import post_blueprint
 from src.blueprints.api.topicblueprint import topic_blueprint
+from src.blueprints.api.searchblueprint import search_blueprint
+from src.blueprints.api.categoryblueprint import category_blueprint
+from src.controllers.controller_repository import ControllerRepository
+from src.utils.daos.unit_of_work import begin_unit_of_work, end_unit_of_work
 from src.utils.response_helper import ResponseHelper
 from src.errors.customerrors import NoDataException, InputInvalidException, UnauthorizedException
 
@@ -16,6 +21,51 @@ api_blueprint = Blueprint('api_blueprint', __name__, url_prefix="/api")
 api_blueprint.register_blueprint(user_blueprint)
 api_blueprint.register_blueprint(post_blueprint)
 api_blueprint.register_blueprint(topic_blueprint)
+api_blueprint.register_blueprint(search_blueprint)
+api_blueprint.register_blueprint(category_blueprint)
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+response_cache = ControllerRepository().get_response_cache()
+
+
+# Response cache, anonymous GET requests to the routes with a cache policy are answered from the cache
+# before a connection is taken. Registered first, so a hit skips the unit of work.
+@api_blueprint.before_request
+def _serve_cached_response():
+  return response_cache.serve(request)
+
+
+# Unit of work, one connection and one transaction per request. Reading requests get a read-only
+# connection, to the read replica if there is one. With the single writer, requests that write commit
+# through the writer and read without a snapshot, that the writer would have to wait for.
+@api_blueprint.before_request
+def _begin_unit_of_work():
+  repository = ControllerRepository()
+
+  if request.method in READ_METHODS:
+    begin_unit_of_work(repository.get_read_pool())
+  elif repository.get_writer() is None:
+    begin_unit_of_work(repository.get_connection_pool(), write=True)
+  else:
+    begin_unit_of_work(repository.get_read_pool(replica=False), snapshot=False)
+
+
+@api_blueprint.after_request
+def _commit_unit_of_work(response: Response) -> Response:
+  end_unit_of_work(commit=response.status_code < 400)
+  return response
+
+
+@api_blueprint.after_request
+def _store_response(response: Response) -> Response:
+  return response_cache.store(request, response)
+
+
+@api_blueprint.teardown_request
+def _close_unit_of_work(_error):
+  end_unit_of_work(commit=False)
+
 
 # Error handling
 @api_blueprint.errorhandler(Exception)
@@ -0,0 +1,25 @@
+"""
+Blueprint for api route /categories
+"""
+from flask import Blueprint
+from src.controllers.controller_repository import ControllerRepository
+from src.utils.response_cache import CachePolicy
+
+category_blueprint = Blueprint("category_blueprint", __name__, url_prefix="/categories")
+category_controller = ControllerRepository().get_category_controller()
+response_cache = ControllerRepository().get_response_cache()
+
+# All categories, with the number of topics in them
+category_blueprint.route("", methods=["GET"])(category_controller.view("categories"))
+category_blueprint.route("/", methods=["GET"])(category_controller.view("categories"))
+
+# For single category
+category_blueprint.route("/<id_num>", methods=["GET"])(category_controller.view("get_one"))
+
+# Latest topics in a category, /api/categories/1/topics?after=token
+category_blueprint.route("/<id_num>/topics", methods=["GET"])(category_controller.view("category_topics"))
+
+# Cached for anonymous readers, the categories change rarely
+for rule in ("", "/", "/<id_num>"):
+  response_cache.route(category_blueprint, rule, CachePolicy(max_age=60, stale_while_revalidate=300))
+response_cache.route(category_blueprint, "/<id_num>/topics", CachePolicy(max_age=5, stale_while_revalidate=30))
@@ -8,9 +8,14 @@ post_blueprint = Blueprint('post_blueprint', __name__, url_prefix="/posts")
 post_controller = ControllerRepository().get_post_controller()
 
 # Create new post
-post_blueprint.route("/", methods=["POST"])(post_controller.create)
+post_blueprint.route("/", methods=["POST"])(post_controller.view("create"))
+post_blueprint.route("/batch", methods=["POST"])(post_controller.view("create_many"))
+
+# Many posts by id, /api/posts?ids=1,2,3
+post_blueprint.route("", methods=["GET"])(post_controller.view("get_many"))
+post_blueprint.route("/", methods=["GET"])(post_controller.view("get_many"))
 
 # For single post
-post_blueprint.route("/<id_num>", methods=["GET"])(post_controller.get_one)
-post_blueprint.route("/<id_num>", methods=["PUT"])(post_controller.update)
-post_blueprint.route("/<id_num>", methods=["DELETE"])(post_controller.delete)
+post_blueprint.route("/<id_num>", methods=["GET"])(post_controller.view("get_one"))
+post_blueprint.route("/<id_num>", methods=["PUT"])(post_controller.view("update"))
+post_blueprint.route("/<id_num>", methods=["DELETE"])(post_controller.view("delete"))
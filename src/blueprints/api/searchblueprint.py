@@ -0,0 +1,11 @@
+"""
+Blueprint for api route /search
+"""
+from flask import Blueprint
+from src.controllers.controller_repository import ControllerRepository
+
+search_blueprint = Blueprint("search_blueprint", __name__, url_prefix="/search")
+search_controller = ControllerRepository().get_search_controller()
+
+# Search posts and topics, /api/search?q=words&after=token
+search_blueprint.route("", methods=["GET"])(search_controller.view("search"))
@@ -3,19 +3,36 @@ Blueprint for api route /topic
 """
 from flask import Blueprint
 from src.controllers.controller_repository import ControllerRepository
+from src.utils.response_cache import CachePolicy
 
 topic_blueprint = Blueprint("topic_blueprint", __name__, url_prefix="/topics")
 topic_controller = ControllerRepository().get_topic_controller()
+response_cache = ControllerRepository().get_response_cache()
 
 # Create new topic
-topic_blueprint.route("/", methods=["POST"])(topic_controller.create)
+topic_blueprint.route("/", methods=["POST"])(topic_controller.view("create"))
+topic_blueprint.route("/batch", methods=["POST"])(topic_controller.view("create_many"))
+
+# Many topics by id, /api/topics?ids=1,2,3
+topic_blueprint.route("", methods=["GET"])(topic_controller.view("get_many"))
+topic_blueprint.route("/", methods=["GET"])(topic_controller.view("get_many"))
 
 # For single topic
-topic_blueprint.route("/<id_num>", methods=["GET"])(topic_controller.get_one)
-topic_blueprint.route("/<id_num>", methods=["PUT"])(topic_controller.update)
-topic_blueprint.route("/<id_num>", methods=["DELETE"])(topic_controller.delete)
-topic_blueprint.route("/<id_num>/page/", methods=["GET"])(topic_controller.topic_with_posts)
-topic_blueprint.route("/<id_num>/page/<page_num>", methods=["GET"])(topic_controller.topic_with_posts)
+topic_blueprint.route("/<id_num>", methods=["GET"])(topic_controller.view("get_one"))
+topic_blueprint.route("/<id_num>", methods=["PUT"])(topic_controller.view("update"))
+topic_blueprint.route("/<id_num>", methods=["DELETE"])(topic_controller.view("delete"))
+topic_blueprint.route("/<id_num>/page", methods=["GET"])(topic_controller.view("topic_with_posts"))
+topic_blueprint.route("/<id_num>/page/", methods=["GET"])(topic_controller.view("topic_with_posts"))
+topic_blueprint.route("/<id_num>/page/<page_num>", methods=["GET"])(topic_controller.view("topic_with_posts"))
 
 # Get latest topics
-topic_blueprint.route("/latest", methods=["GET"])(topic_controller.latest_topics)
+topic_blueprint.route("/latest", methods=["GET"])(topic_controller.view("latest_topics"))
+
+# Get recently active topics, with the latest post first
+topic_blueprint.route("/active", methods=["GET"])(topic_controller.view("active_topics"))
+
+# Cached for anonymous readers, a topic and its pages are purged when its posts change
+for rule in ("/<id_num>", "/<id_num>/page", "/<id_num>/page/", "/<id_num>/page/<page_num>"):
+  response_cache.route(topic_blueprint, rule, CachePolicy(max_age=10, stale_while_revalidate=60))
+for rule in ("/latest", "/active"):
+  response_cache.route(topic_blueprint, rule, CachePolicy(max_age=5, stale_while_revalidate=30))
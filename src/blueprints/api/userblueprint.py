@@ -8,12 +8,21 @@ user_blueprint = Blueprint('user_blueprint', __name__, url_prefix="/users")
 user_controller = ControllerRepository().get_user_controller()
 
 # Create new user
-user_blueprint.route("/", methods=["POST"])(user_controller.create)
+user_blueprint.route("/", methods=["POST"])(user_controller.view("create"))
+user_blueprint.route("/batch", methods=["POST"])(user_controller.view("create_many"))
 
 # Log in
-user_blueprint.route("/login", methods=["POST"])(user_controller.login)
+user_blueprint.route("/login", methods=["POST"])(user_controller.view("login"))
+
+# Many users by id, /api/users?ids=1,2,3
+user_blueprint.route("", methods=["GET"])(user_controller.view("get_many"))
+user_blueprint.route("/", methods=["GET"])(user_controller.view("get_many"))
 
 # For single user
-user_blueprint.route("/<id_num>", methods=["GET"])(user_controller.get_one)
-user_blueprint.route("/<id_num>", methods=["PUT"])(user_controller.update)
-user_blueprint.route("/<id_num>", methods=["DELETE"])(user_controller.delete)
+user_blueprint.route("/<id_num>", methods=["GET"])(user_controller.view("get_one"))
+user_blueprint.route("/<id_num>", methods=["PUT"])(user_controller.view("update"))
+user_blueprint.route("/<id_num>", methods=["DELETE"])(user_controller.view("delete"))
+
+# Latest posts and topics of a user, /api/users/1/posts?after=token
+user_blueprint.route("/<id_num>/posts", methods=["GET"])(user_controller.view("user_posts"))
+user_blueprint.route("/<id_num>/topics", methods=["GET"])(user_controller.view("user_topics"))
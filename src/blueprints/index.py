@@ -59,11 +59,44 @@ def new_topics():
   return render_template("new-topics.jinja", topics=topics)
 
 
+@index_blueprint.route("/categories", methods=["get"])
+def categories():
+  """Categories route."""
+  try:
+    response = requests.get(API_URL + "/categories", timeout=5)
+    categories_data = response.json()["data"]
+  except Exception:
+    categories_data = []
+
+  return render_template("categories.jinja", categories=categories_data)
+
+
+@index_blueprint.route("/categories/<id_num>", methods=["get"])
+def category(id_num: int):
+  """Latest topics in a category route."""
+  category_data = {}
+
+  try:
+    response = requests.get(
+      f"{API_URL}/categories/{id_num}/topics", params={"after": request.args.get("after", None)}, timeout=5
+    )
+    category_data = response.json()["data"]
+  except Exception:
+    pass
+
+  return render_template(
+    "category.jinja",
+    category=category_data.get("category", None),
+    topics=category_data.get("topics", []),
+    next=category_data.get("next", None)
+  )
+
+
 @index_blueprint.route("/topic/<id_num>", methods=["get"])
 def single_topic(id_num: int):
   """Latest topics route."""
   topic_data = {}
-  page = request.args.get("page", 0)
+  page = request.args.get("page", 0, type=int)
 
   try:
     response = requests.get(f"{API_URL}/topics/{id_num}/page/{page}", timeout=5)
@@ -71,4 +104,32 @@ def single_topic(id_num: int):
   except Exception:
     pass
 
-  return render_template("topic.jinja", topic=topic_data.get("topic", None), posts=topic_data.get("posts", None))
+  return render_template(
+    "topic.jinja",
+    topic=topic_data.get("topic", None),
+    posts=topic_data.get("posts", None),
+    page=page,
+    pages=topic_data.get("pages", 0)
+  )
+
+
+@index_blueprint.route("/search", methods=["get"])
+def search():
+  """Search results route."""
+  query = request.args.get("q", "")
+  search_data = {}
+
+  try:
+    response = requests.get(
+      f"{API_URL}/search", params={"q": query, "after": request.args.get("after", None)}, timeout=5
+    )
+    search_data = response.json()["data"]
+  except Exception:
+    pass
+
+  return render_template(
+    "search.jinja",
+    query=query,
+    results=search_data.get("results", []),
+    next=search_data.get("next", None)
+  )
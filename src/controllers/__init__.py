@@ -1,5 +1,7 @@
 from .topiccontroller import TopicController
 from .usercontroller import UserController
 from .postcontroller import PostController
+from .searchcontroller import SearchController
+from .categorycontroller import CategoryController
 
-__all__ = ['TopicController', 'UserController', 'PostController']
+__all__ = ['TopicController', 'UserController', 'PostController', 'SearchController', 'CategoryController']
@@ -2,17 +2,44 @@
 Baseclass for all controllers.
 
 They should all have create, get_one, update and delete methods which can be overrun in the inheriting classes.
+With API_ASYNC=1 the blueprints register async views made from the route methods, they run the whole method on
+the database executor. Served by WSGI every request still holds its worker, the async view only adds a hop to
+the executor.
+Reads of single items send ETag and Last-Modified from the validator of the service, and answer conditional
+requests for unchanged items with 304 before the item is read.
 All errors raised here or in the inheriting classes or in any of the classes used in the controllers will be handled at a higher level (the apiblueprint).
 """
+import functools
+import os
+from typing import Any, Callable
 from flask_jwt_extended import get_jwt_identity
 from flask_jwt_extended import jwt_required
 from flask import Response, request, jsonify
 from src.services.base_service import BaseService
+from src.utils.daos.async_dao import run_async
 from src.utils.response_helper import ResponseHelper
+from src.utils.validators import Validator, is_not_modified
 from src.errors.customerrors import InputInvalidException
 
 r_helper = ResponseHelper()
 
+# Most items accepted by one batch request.
+MAX_BATCH_SIZE = 5000
+# Most ids accepted by one ?ids= request.
+MAX_IDS = 100
+# Register the async route methods, needs flask[async].
+ASYNC_VIEWS = os.environ.get("API_ASYNC", "0") == "1"
+
+
+def _async_view(method: Callable[..., Any]) -> Callable[..., Any]:
+  """Make an async view running a route method on the executor, in a copy of the request context."""
+
+  @functools.wraps(method)
+  async def view(*args: Any, **kwargs: Any) -> Any:
+    return await run_async(method, *args, **kwargs)
+
+  return view
+
 
 class Controller:
   """Base class for controllers."""
@@ -27,6 +54,59 @@ class Controller:
     self._service = service
     self._controller = controller_name
 
+  def view(self, name: str) -> Callable:
+    """Get a route method to register in a blueprint, as an async view if ASYNC_VIEWS is set. The async view
+    of a method is made once, so routes sharing a method share the endpoint.
+
+    Args:
+      name (str): Name of the route method.
+
+    Returns:
+      Callable:   The bound route method or its async view
+    """
+    method = getattr(self, name)
+
+    if not ASYNC_VIEWS:
+      return method
+
+    views = vars(self).setdefault("_async_views", {})
+
+    if name not in views:
+      views[name] = _async_view(method)
+
+    return views[name]
+
+  def _not_modified(self, validator: Validator | None) -> bool:
+    """Check if the client of a conditional GET already has the data of a validator.
+
+    Args:
+      validator (Validator):  The validator of the current data, None if not validated.
+
+    Returns:
+      bool:                   True if a 304 response without body is to be sent
+    """
+    return validator is not None and is_not_modified(validator, request)
+
+  def _validated(self, response: Response, validator: Validator | None) -> Response:
+    """Set the ETag and Last-Modified of a validator on a response. Clients are asked to revalidate every time,
+    so they never use the data without asking.
+
+    Args:
+      response (Response):    The response.
+      validator (Validator):  The validator of the data in the response, None if not validated.
+
+    Returns:
+      Response:               The same response
+    """
+    if validator is not None:
+      response.set_etag(validator.etag, weak=True)
+      response.cache_control.no_cache = True
+
+      if validator.last_modified is not None:
+        response.last_modified = validator.last_modified
+
+    return response
+
   def create(self) -> tuple[Response, int]:
     """Controller for root route, creating a new entry.
   
@@ -46,6 +126,59 @@ class Controller:
 
     return jsonify(response), status
 
+  def _batch_input(self) -> list:
+    """Get the items of a batch request, a JSON list of objects.
+
+    Returns:
+      list:                   The items
+
+    Raises:
+      InputInvalidException:  If the body is not a list or has too many items.
+    """
+    input_data = request.json
+
+    if not isinstance(input_data, list) or not input_data:
+      raise InputInvalidException("Input data must be a list with at least one item.")
+
+    if len(input_data) > MAX_BATCH_SIZE:
+      raise InputInvalidException(f"At most {MAX_BATCH_SIZE} items per batch.")
+
+    return input_data
+
+  def _ids_input(self) -> list[int]:
+    """Get the ids of a request for many entries, the query parameter ids as comma separated integers.
+
+    Returns:
+      list:                   The ids in the order given
+
+    Raises:
+      InputInvalidException:  If ids is missing, has something else than integers or too many ids.
+    """
+    ids = [id_str.strip() for id_str in request.args.get("ids", "").split(",") if id_str.strip()]
+
+    if not ids or not all(id_str.isdigit() for id_str in ids):
+      raise InputInvalidException("Query parameter ids must be a comma separated list of ids.")
+
+    if len(ids) > MAX_IDS:
+      raise InputInvalidException(f"At most {MAX_IDS} ids per request.")
+
+    return [int(id_str) for id_str in ids]
+
+  def create_many(self) -> tuple[Response, int]:
+    """Controller for batch route, creating many entries in one transaction.
+
+    Returns:
+      tuple[Response, int]:   The response with the result for every item and status code
+
+    Raises:
+      InputInvalidException:  If input data is missing.
+    """
+    results = self._service.create_many(self._batch_input())
+    created = sum(1 for result in results if result["status"] == 201)
+    response, status = r_helper.batch_response(results, message=f"{created} new {self._controller}s added.")
+
+    return jsonify(response), status
+
   def get_one(self, id_num: int) -> tuple[Response, int]:
     """Controller getting one entry from database.
 
@@ -53,11 +186,31 @@ class Controller:
       id_num (int):         unique id for entry 
 
     Returns:
-      tuple[Response, int]: The response and status code
+      tuple[Response, int]: The response and status code, 304 if the client has the current entry
     """
+    validator = self._service.get_validator(id_num)
+
+    if self._not_modified(validator):
+      return self._validated(Response(status=304), validator), 304
+
     result = self._service.get_by_id(id_num)
     response, status = r_helper.success_response(result)
 
+    return self._validated(jsonify(response), validator), status
+
+  def get_many(self) -> tuple[Response, int]:
+    """Controller getting many entries from database with one query, /?ids=1,2,3.
+
+    Returns:
+      tuple[Response, int]:   The response with the entries found in the order of ids and the ids not found in
+                              "missing", and status code
+
+    Raises:
+      InputInvalidException:  If the ids are missing or invalid.
+    """
+    result = self._service.get_many(self._ids_input())
+    response, status = r_helper.success_response(result)
+
     return jsonify(response), status
 
   @jwt_required()
@@ -0,0 +1,49 @@
+"""
+CategoryController is for handling all calls to database regarding categories.
+"""
+from flask import jsonify, request, Response
+from src.controllers.basecontroller import Controller
+from src.services.category_service import CategoryService
+from src.utils.response_helper import ResponseHelper
+
+r_helper = ResponseHelper()
+
+
+class CategoryController(Controller):
+  """CategoryController handles browsing categories and the topics in them."""
+
+  def __init__(self, service: CategoryService, controller_name: str):
+    """Initializes the CategoryController class.
+
+    Args:
+      service (CategoryService):  An instance of the CategoryService class.
+      controller_name (str):      The name of the controller.
+    """
+    self._service = service
+    self._controller = controller_name
+
+  def categories(self) -> tuple[Response, int]:
+    """Get all categories, with the number of topics in every category.
+
+    Returns:
+      tuple[Response, int]: The response and status code
+    """
+    data = self._service.get_all()
+    response, status = r_helper.success_response(data)
+
+    return jsonify(response), status
+
+  def category_topics(self, id_num: int) -> tuple[Response, int]:
+    """Get the latest topics in a category. The query parameter "after" takes the "next" token
+    of a previous response and returns the topics after it.
+
+    Args:
+      id_num (int):         id for category
+
+    Returns:
+      tuple[Response, int]: The response and status code
+    """
+    data = self._service.get_category_topics(id_num, request.args.get("after", None))
+    response, status = r_helper.success_response(data)
+
+    return jsonify(response), status
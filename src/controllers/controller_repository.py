@@ -1,21 +1,122 @@
 """
 Repository to handle controllers, using singleton princible.
 """
-from src.utils.daos import PostDAO, TopicDAO, UserDAO
-from src.controllers import UserController, TopicController, PostController
-from src.services import UserService, TopicService, PostService
+import os
+from src.utils.cache import LRUCache, TopicPageCache
+from src.utils.daos import PostDAO, TopicDAO, UserDAO, SearchDAO, CategoryDAO
+from src.utils.feed import LatestTopicsFeed
+from src.utils.response_cache import ResponseCache
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.userdao import USER_CACHE_SIZE, USER_CACHE_TTL
+from src.utils.daos.replica import Replica, REPLICA_PATH
+from src.utils.daos.writer import Writer, WRITER_ENABLED
+from src.controllers import UserController, TopicController, PostController, SearchController, CategoryController
+from src.services import UserService, TopicService, PostService, SearchService, CategoryService
 
 
 class ControllerRepository:
   """ A class for handling all controllers, having them easily accessed in rest of system. """
   _instance = None
   _controllers = {}
+  _pool = None
+  _read_pool = None
+  _replica_pool = None
+  _replica = None
+  _writer = None
+  _user_cache = None
+  _page_cache = None
+  _response_cache = None
+  _latest_feed = None
 
   def __new__(cls):
     if cls._instance is None:
       cls._instance = super(ControllerRepository, cls).__new__(cls)
     return cls._instance
 
+  def get_connection_pool(self) -> ConnectionPool:
+    """ Get the ConnectionPool shared by all DAOs. Creates it if not already created.
+
+    Returns:
+      ConnectionPool: The pool with connections to the database
+    """
+    if self._pool is None:
+      self._pool = ConnectionPool(os.environ.get("SQLITE_PATH", "./db/db.sqlite"))
+    return self._pool
+
+  def get_read_pool(self, replica: bool = True) -> ConnectionPool:
+    """ Get a read-only ConnectionPool shared by all DAOs. Creates it if not already created.
+
+    Args:
+      replica (bool): True for the pool of the read replica if SQLITE_REPLICA_PATH is set.
+
+    Returns:
+      ConnectionPool: The pool with read-only connections to the replica or to the database
+    """
+    if self._read_pool is None:
+      self._read_pool = ConnectionPool(self.get_connection_pool().db_path, read_only=True)
+
+    if not replica or not REPLICA_PATH:
+      return self._read_pool
+
+    if self._replica_pool is None:
+      self._replica = Replica(self._read_pool, REPLICA_PATH)
+      self._replica.start()
+      self._replica_pool = ConnectionPool(REPLICA_PATH, read_only=True)
+    return self._replica_pool
+
+  def get_writer(self) -> Writer | None:
+    """ Get the Writer shared by all DAOs. Creates it if not already created.
+
+    Returns:
+      Writer: The writer running all writes, None unless enabled with SQLITE_WRITER=1
+    """
+    if self._writer is None and WRITER_ENABLED:
+      self._writer = Writer(self.get_connection_pool())
+    return self._writer
+
+  def get_user_cache(self) -> LRUCache:
+    """ Get the cache of users shared by all UserDAOs. Creates it if not already created.
+
+    Returns:
+      LRUCache: The cache, with USER_CACHE_SIZE entries kept for USER_CACHE_TTL seconds
+    """
+    if self._user_cache is None:
+      self._user_cache = LRUCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+    return self._user_cache
+
+  def get_page_cache(self) -> TopicPageCache:
+    """ Get the cache of topic pages shared by the services. Creates it if not already created.
+    Invalidating a topic purges its responses from the response cache too.
+
+    Returns:
+      TopicPageCache: The cache, disabled with TOPIC_PAGE_CACHE_SIZE=0
+    """
+    if self._page_cache is None:
+      self._page_cache = TopicPageCache(on_change=self.get_response_cache().purge_topic)
+    return self._page_cache
+
+  def get_response_cache(self) -> ResponseCache:
+    """ Get the cache of responses to anonymous GET requests, shared by the blueprints. Creates it if not
+    already created.
+
+    Returns:
+      ResponseCache: The cache, disabled with RESPONSE_CACHE_SIZE=0
+    """
+    if self._response_cache is None:
+      self._response_cache = ResponseCache()
+    return self._response_cache
+
+  def get_latest_feed(self) -> LatestTopicsFeed:
+    """ Get the feed of latest topics shared by the services. Creates it if not already created.
+
+    Returns:
+      LatestTopicsFeed: The feed, disabled with LATEST_TOPICS_FEED_SIZE=0
+    """
+    if self._latest_feed is None:
+      topic_dao = TopicDAO("topic", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False))
+      self._latest_feed = LatestTopicsFeed(topic_dao.get_latest_topics)
+    return self._latest_feed
+
   def get_user_controller(self) -> UserController:
     """ Get UserController. Creates an instance if not already in self._controllers.
 
@@ -23,8 +124,12 @@ class ControllerRepository:
       UserController: The UserController for data handling
     """
     if "user_controller" not in self._controllers:
-      user_dao = UserDAO("user")
-      user_service = UserService(user_dao)
+      user_dao = UserDAO(
+        "user", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False), self.get_user_cache()
+      )
+      post_dao = PostDAO("post", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False))
+      topic_dao = TopicDAO("topic", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False))
+      user_service = UserService(user_dao, post_dao, topic_dao, self.get_page_cache())
       self._controllers["user_controller"] = UserController(user_service, "user")
     return self._controllers["user_controller"]
 
@@ -35,10 +140,12 @@ class ControllerRepository:
       TopicController: The TopicController for data handling
     """
     if "topic_controller" not in self._controllers:
-      topic_dao = TopicDAO("topic")
-      user_dao = UserDAO("user")
-      post_dao = PostDAO("post")
-      topic_service = TopicService(topic_dao, user_dao, post_dao)
+      topic_dao = TopicDAO("topic", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False))
+      user_dao = UserDAO(
+        "user", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False), self.get_user_cache()
+      )
+      post_dao = PostDAO("post", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False))
+      topic_service = TopicService(topic_dao, user_dao, post_dao, self.get_page_cache(), self.get_latest_feed())
       self._controllers["topic_controller"] = TopicController(topic_service, "topic")
     return self._controllers["topic_controller"]
 
@@ -49,8 +156,37 @@ class ControllerRepository:
       PostController: The PostController for data handling
     """
     if "post_controller" not in self._controllers:
-      post_dao = PostDAO("post")
-      user_dao = UserDAO("user")
-      post_service = PostService(post_dao, user_dao)
+      post_dao = PostDAO("post", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False))
+      user_dao = UserDAO(
+        "user", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False), self.get_user_cache()
+      )
+      post_service = PostService(post_dao, user_dao, self.get_page_cache(), self.get_latest_feed())
       self._controllers["post_controller"] = PostController(post_service, "post")
     return self._controllers["post_controller"]
+
+  def get_search_controller(self) -> SearchController:
+    """ Get SearchController. Creates an instance if not already in self._controllers.
+
+    Returns:
+      SearchController: The SearchController for searching posts and topics
+    """
+    if "search_controller" not in self._controllers:
+      search_dao = SearchDAO("search", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False))
+      search_service = SearchService(search_dao)
+      self._controllers["search_controller"] = SearchController(search_service, "search")
+    return self._controllers["search_controller"]
+
+  def get_category_controller(self) -> CategoryController:
+    """ Get CategoryController. Creates an instance if not already in self._controllers, which loads the categories.
+
+    Returns:
+      CategoryController: The CategoryController for browsing categories
+    """
+    if "category_controller" not in self._controllers:
+      category_dao = CategoryDAO(
+        "category", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False)
+      )
+      topic_dao = TopicDAO("topic", self.get_connection_pool(), self.get_writer(), self.get_read_pool(replica=False))
+      category_service = CategoryService(category_dao, topic_dao)
+      self._controllers["category_controller"] = CategoryController(category_service, "category")
+    return self._controllers["category_controller"]
@@ -43,3 +43,21 @@ class PostController(Controller):
     response, status = r_helper.success_response(result, message=f"New {self._controller} added.", status=201)
 
     return jsonify(response), status
+
+  @jwt_required()
+  def create_many(self) -> tuple[Response, int]:
+    """Controller for batch route, creating many posts in one transaction.
+
+    Returns:
+      tuple[Response, int]:   The response with the result for every post and status code
+
+    Raises:
+      InputInvalidException:  If input data is missing.
+    """
+    input_data = self._batch_input()
+    current_user = get_jwt_identity()
+    results = self._service.create_many(input_data, current_user)
+    created = sum(1 for result in results if result["status"] == 201)
+    response, status = r_helper.batch_response(results, message=f"{created} new {self._controller}s added.")
+
+    return jsonify(response), status
@@ -0,0 +1,38 @@
+"""
+SearchController is for handling all calls to database regarding search.
+"""
+from flask import jsonify, request, Response
+from src.controllers.basecontroller import Controller
+from src.services.search_service import SearchService
+from src.utils.response_helper import ResponseHelper
+
+r_helper = ResponseHelper()
+
+
+class SearchController(Controller):
+  """SearchController handles full-text search in posts and topics."""
+
+  def __init__(self, service: SearchService, controller_name: str):
+    """Initializes the SearchController class.
+
+    Args:
+      service (SearchService):  An instance of the SearchService class.
+      controller_name (str):    The name of the controller.
+    """
+    self._service = service
+    self._controller = controller_name
+
+  def search(self) -> tuple[Response, int]:
+    """Search posts and topics for the words in the query parameter "q". The query parameter "after"
+    takes the "next" token of a previous response and returns the results after it.
+
+    Returns:
+      tuple[Response, int]:   The response and status code
+
+    Raises:
+      InputInvalidException:  If the query has no words or the token is not valid.
+    """
+    data = self._service.search(request.args.get("q", None), request.args.get("after", None))
+    response, status = r_helper.success_response(data)
+
+    return jsonify(response), status
@@ -46,28 +46,74 @@ class TopicController(Controller):
 
     return jsonify(response), status
 
+  @jwt_required()
+  def create_many(self) -> tuple[Response, int]:
+    """Controller for batch route, creating many topics in one transaction.
+
+    Returns:
+      tuple[Response, int]:   The response with the result for every topic and status code
+
+    Raises:
+      InputInvalidException:  If input data is missing.
+    """
+    input_data = self._batch_input()
+    current_user = get_jwt_identity()
+    results = self._service.create_many(input_data, current_user)
+    created = sum(1 for result in results if result["status"] == 201)
+    response, status = r_helper.batch_response(results, message=f"{created} new {self._controller}s added.")
+
+    return jsonify(response), status
+
   def latest_topics(self) -> tuple[Response, int]:
     """Get latest topics, based on what date the topic was created.
 
     Returns:
-      tuple[Response, int]: The response and status code
+      tuple[Response, int]: The response and status code, 304 if the client has the current topics
     """
+    validator = self._service.get_latest_validator()
+
+    if self._not_modified(validator):
+      return self._validated(Response(status=304), validator), 304
+
     data = self._service.get_latest_topics()
     response, status = r_helper.success_response(data)
 
+    return self._validated(jsonify(response), validator), status
+
+  def active_topics(self) -> tuple[Response, int]:
+    """Get recently active topics, based on what date the latest post in the topic was created.
+
+    Returns:
+      tuple[Response, int]: The response and status code
+    """
+    data = self._service.get_active_topics()
+    response, status = r_helper.success_response(data)
+
     return jsonify(response), status
 
   def topic_with_posts(self, id_num: int, page_num: int = 0) -> tuple[Response, int]:
-    """When using route for single topic
+    """When using route for single topic. The query parameter "after" takes the "next" token
+    of a previous response and returns the page after it, without counting pages from the start.
+    Pages by number are sent as the JSON document built by the database.
 
     Args:
       id_num(int):    id for topic
       page_num(int):  pagenumber, default is 0 which is first page. Each page has 10 posts.
 
     Returns:
-      tuple[Response, int]: The response and status code
+      tuple[Response, int]: The response and status code, 304 if the client has the current page
     """
-    data = self._service.get_topic_posts_users(id_num, int(page_num))
+    after = request.args.get("after", None)
+    validator = self._service.get_page_validator(id_num, int(page_num))
+
+    if self._not_modified(validator):
+      return self._validated(Response(status=304), validator), 304
+
+    if after is None:
+      body, status = r_helper.success_document_response(self._service.get_topic_page_json(id_num, int(page_num)))
+      return self._validated(Response(body, mimetype="application/json"), validator), status
+
+    data = self._service.get_topic_posts_users(id_num, int(page_num), after)
     response, status = r_helper.success_response(data)
 
-    return jsonify(response), status
+    return self._validated(jsonify(response), validator), status
@@ -5,8 +5,8 @@ from flask import jsonify, request, Response
 from src.controllers.basecontroller import Controller
 from src.utils.response_helper import ResponseHelper
 from src.services.user_service import UserService
-from src.errors.customerrors import NoDataException, InputInvalidException
-from flask_jwt_extended import create_access_token
+from src.errors.customerrors import NoDataException, InputInvalidException, UnauthorizedException
+from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
 
 r_helper = ResponseHelper()
 
@@ -38,3 +38,59 @@ class UserController(Controller):
     response, status = r_helper.success_response({"jwt": access_token}, message="User logged in.", status=200)
 
     return jsonify(response), status
+
+  @jwt_required()
+  def create_many(self) -> tuple[Response, int]:
+    """Controller for batch route, creating many users in one transaction. Only for admins, a batch can
+    hold MAX_BATCH_SIZE users.
+
+    Returns:
+      tuple[Response, int]:   The response with the result for every user and status code
+
+    Raises:
+      UnauthorizedException:  If the current user is not an admin.
+      InputInvalidException:  If input data is missing.
+    """
+    self._require_admin()
+    return super().create_many()
+
+  def _require_admin(self) -> None:
+    """Check that the current user is an admin.
+
+    Raises:
+      UnauthorizedException:  If the current user is not an admin.
+    """
+    current_user = get_jwt_identity()
+
+    if not isinstance(current_user, dict) or current_user.get("role") != "admin":
+      raise UnauthorizedException("Only admins can create users in batches.")
+
+  def user_posts(self, id_num: int) -> tuple[Response, int]:
+    """Get the latest posts of a user. The query parameter "after" takes the "next" token
+    of a previous response and returns the posts after it.
+
+    Args:
+      id_num (int):         id for user
+
+    Returns:
+      tuple[Response, int]: The response and status code
+    """
+    data = self._service.get_user_posts(id_num, request.args.get("after", None))
+    response, status = r_helper.success_response(data)
+
+    return jsonify(response), status
+
+  def user_topics(self, id_num: int) -> tuple[Response, int]:
+    """Get the latest topics created by a user. The query parameter "after" takes the "next" token
+    of a previous response and returns the topics after it.
+
+    Args:
+      id_num (int):         id for user
+
+    Returns:
+      tuple[Response, int]: The response and status code
+    """
+    data = self._service.get_user_topics(id_num, request.args.get("after", None))
+    response, status = r_helper.success_response(data)
+
+    return jsonify(response), status
@@ -58,6 +58,18 @@ class Post():
 
     return {"title": self._title, "body": self._body}
 
+  @staticmethod
+  def changes(post_data: dict[str, Any]) -> dict[str, Any]:
+    """Get the data to write for an update, the keys of post_data that update may change.
+
+    Args:
+      post_data (dict):   Dictionary with keys to update.
+
+    Returns:
+      new_data (dict):    Dict with only the data to update, for writing without reading the post first.
+    """
+    return {key: post_data[key] for key in ("title", "body") if key in post_data}
+
   def control_user(self, editor: User) -> None:
     """Control that the user (editor) can manage the post.
 
@@ -24,6 +24,10 @@ class Topic():
         - last_edited (str | None):     timestamp when topic was last edited
         - deleted (str | None):         timestamp when topic was deleted (softly)
         - disabled (bool):              boolean if topic is disabled
+        - post_count (int):             number of posts not deleted
+        - last_post_id (int | None):    id of the latest post
+        - last_post_at (str | None):    timestamp when the latest post was created
+        - version (int):                number of changes shown on the pages of the topic
 
     Raises:
       KeyError: In case of missing required keys
@@ -36,6 +40,10 @@ class Topic():
     self._last_edited = topic_data.get('last_edited', None)
     self._deleted = topic_data.get('deleted', None)
     self._disabled = topic_data.get('disabled', False)
+    self._post_count = topic_data.get('post_count', 0)
+    self._last_post_id = topic_data.get('last_post_id', None)
+    self._last_post_at = topic_data.get('last_post_at', None)
+    self._version = topic_data.get('version', 0)
 
   def update(self, topic_data: dict[str, Any], editor: User) -> dict[str, Any]:
     """Update the topic with provided data.
@@ -56,6 +64,18 @@ class Topic():
 
     return {"title": self._title}
 
+  @staticmethod
+  def changes(topic_data: dict[str, Any]) -> dict[str, Any]:
+    """Get the data to write for an update, the keys of topic_data that update may change.
+
+    Args:
+      topic_data (dict):      Dictionary with keys to update.
+
+    Returns:
+      new_data (dict):        Dict with only the data to update, for writing without reading the topic first.
+    """
+    return {key: topic_data[key] for key in ("title", ) if key in topic_data}
+
   def control_access(self, editor: User) -> None:
     """Control that another user (editor) can manage the topic.
 
@@ -56,6 +56,18 @@ class User():
       "avatar": self._avatar
     }
 
+  @staticmethod
+  def changes(user_data: dict[str, Any]) -> dict[str, Any]:
+    """Get the data to write for an update, the keys of user_data that update may change.
+
+    Args:
+      user_data (dict): Dictionary with keys to update.
+
+    Returns:
+      new_data (dict):  Dict with only the data to update, for writing without reading the user first.
+    """
+    return {key: user_data[key] for key in ("signature", "avatar") if key in user_data}
+
   def control_access(self, editor: User) -> None:
     """Control that another user (editor) can manage the user.
 
@@ -1,5 +1,7 @@
 from .topic_service import TopicService
 from .user_service import UserService
 from .post_service import PostService
+from .search_service import SearchService
+from .category_service import CategoryService
 
-__all__ = ["TopicService", "UserService", "PostService"]
\ No newline at end of file
+__all__ = ["TopicService", "UserService", "PostService", "SearchService", "CategoryService"]
\ No newline at end of file
@@ -3,7 +3,10 @@ Base service, should be inherited by all services that is used in base_controlle
 """
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable
+from src.errors.customerrors import InputInvalidException, NoDataException, UnauthorizedException
+from src.utils.daos.basedao import Ownership
+from src.utils.validators import Validator
 
 class BaseService(ABC):
   """
@@ -26,6 +29,10 @@ class BaseService(ABC):
       NoDataException: If no user is found with the given username.
     """
 
+  def get_validator(self, *args, **kwargs) -> Validator | None:
+    """Gets the validator of one item for conditional GET, None if the item is not validated or not found."""
+    return None
+
   @abstractmethod
   def update(self, *args, **kwargs) -> bool:
     """Updates an item in the database."""
@@ -33,3 +40,100 @@ class BaseService(ABC):
   @abstractmethod
   def delete(self, *args, **kwargs) -> bool:
     """Deletes an item in the database."""
+
+  def _create_batch(self, data: list[Any], required: tuple[str, ...], create_many: Callable[[list[dict]], list[Any]],
+                    conflict: str | None = None) -> list[dict[str, Any]]:
+    """Create the valid items of a batch with one call to create_many and give a result for every item.
+
+    Args:
+      data (list):            The items from the request.
+      required (tuple):       Keys every item must have.
+      create_many (Callable): DAO method creating the valid items, returning one entry per item (None on conflict).
+      conflict (str):         Error for the items create_many returned None for.
+
+    Returns:
+      list:                   {"index", "status", "data"} or {"index", "status", "error"} for every item, in order
+    """
+    results: list[dict[str, Any]] = []
+    valid_items = []
+    valid_results = []
+
+    for index, item in enumerate(data):
+      if not isinstance(item, dict):
+        results.append({"index": index, "status": 400, "error": "Item is not an object."})
+        continue
+
+      missing = [key for key in required if item.get(key) is None]
+
+      if missing:
+        results.append({"index": index, "status": 400, "error": f"Missing {', '.join(missing)}."})
+        continue
+
+      result = {"index": index, "status": 201}
+      results.append(result)
+      valid_items.append(item)
+      valid_results.append(result)
+
+    created = create_many(valid_items) if valid_items else []
+
+    for result, new_data in zip(valid_results, created):
+      if new_data is None:
+        result["status"] = 409
+        result["error"] = conflict
+      else:
+        result["data"] = new_data
+
+    return results
+
+  def _get_many(self, ids: list[int], name: str, get_many: Callable[[list[int]], list[Any]]) -> dict[str, list]:
+    """Get many items with one call to get_many and report the ids not found.
+
+    Args:
+      ids (list):             The ids from the request, in the order to return the items.
+      name (str):             Key of the items in the result, like "posts".
+      get_many (Callable):    DAO method returning one entry per id, None for the ids not found.
+
+    Returns:
+      dict:                   The items found in the order of ids in name and the ids not found in "missing"
+    """
+    found = get_many(ids)
+
+    return {
+      name: [item for item in found if item is not None],
+      "missing": [id_num for id_num, item in zip(ids, found) if item is None]
+    }
+
+  def _changes(self, changes: dict[str, Any]) -> dict[str, Any]:
+    """Check that an update changes anything, see the changes method of the models.
+
+    Args:
+      changes (dict):         The data to write.
+
+    Returns:
+      dict:                   The same data
+
+    Raises:
+      InputInvalidException:  If there is nothing to write.
+    """
+    if not changes:
+      raise InputInvalidException("Missing data to update.")
+
+    return changes
+
+  def _check_ownership(self, outcome: Ownership, name: str, id_num: int) -> None:
+    """Raise the error for a write to a row the editor does not own, or that does not exist.
+
+    Args:
+      outcome (Ownership):    The outcome of the write, from an update_owned or delete_owned method of a DAO.
+      name (str):             Name of the item in the errors, like "post".
+      id_num (int):           The id of the item.
+
+    Raises:
+      NoDataException:        If no item is found with the given id.
+      UnauthorizedException:  If the editor is not authorized to manage the item.
+    """
+    if outcome is Ownership.NOT_FOUND:
+      raise NoDataException(f"No {name} found with id: {id_num}")
+
+    if outcome is Ownership.NOT_OWNER:
+      raise UnauthorizedException(f"User not authorized to manage {name}.")
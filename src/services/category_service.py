@@ -0,0 +1,118 @@
+"""
+Module for category service, main purpose to handle browsing topics by category in the application.
+
+This will be used by controllers to keep the logic here and not in controller.
+"""
+from types import MappingProxyType
+from typing import Any, Mapping
+from src.errors.customerrors import NoDataException
+from src.static.types import CategoryData, TopicData
+from src.utils.daos import CategoryDAO, TopicDAO
+from src.utils.pagination import encode_cursor, decode_cursor
+from src.utils.validators import Validator
+
+
+class CategoryService:
+  """
+  CategoryService is used for listing categories and the topics in them.
+
+  The categories are read once into an immutable snapshot on first use, they are only changed by db/load.py.
+  Requests share the snapshot without locking, reload() swaps in a new one.
+  """
+  TOPICS_PAGE_SIZE = 20
+
+  def __init__(self, category_dao: CategoryDAO, topic_dao: TopicDAO):
+    """Initializes the CategoryService class, the categories are read when first needed.
+
+    Args:
+      category_dao (CategoryDAO): An instance of the CategoryDAO class.
+      topic_dao (TopicDAO):       An instance of the TopicDAO class.
+    """
+    self._category_dao = category_dao
+    self._topic_dao = topic_dao
+    self._categories: Mapping[int, Mapping[str, Any]] | None = None
+
+  def reload(self) -> Mapping[int, Mapping[str, Any]]:
+    """Read the categories from the database into a new snapshot.
+
+    Returns:
+      Mapping:  The new snapshot, categories by id
+    """
+    self._categories = MappingProxyType({
+      category["category_id"]: MappingProxyType(category) for category in self._category_dao.get_all()
+    })
+
+    return self._categories
+
+  def _snapshot(self) -> Mapping[int, Mapping[str, Any]]:
+    """Get the snapshot of the categories, read on first use so the service is created without the database."""
+    categories = self._categories
+
+    return categories if categories is not None else self.reload()
+
+  def get_all(self) -> list[dict[str, Any]]:
+    """Get all categories with the number of topics in them.
+
+    Returns:
+      list:   The categories in the order of their ids, with topic_count
+    """
+    counts = self._category_dao.get_topic_counts()
+
+    return [
+      {**category, "topic_count": counts.get(category_id, 0)} for category_id, category in self._snapshot().items()
+    ]
+
+  def get_by_id(self, category_id: int) -> dict[str, Any]:
+    """Get one category with the number of topics in it.
+
+    Args:
+      category_id (int):  The id of the category.
+
+    Returns:
+      dict:               The category, with topic_count
+
+    Raises:
+      NoDataException:    If no category is found with the given id.
+    """
+    category = self._get_category(category_id)
+
+    return {**category, "topic_count": self._category_dao.get_topic_counts().get(category["category_id"], 0)}
+
+  def get_validator(self, category_id: int) -> Validator | None:
+    """Categories are not validated for conditional GET, their topic counts change with every topic."""
+    return None
+
+  def get_category_topics(self, category_id: int, after: str | None = None) -> dict[str, Any]:
+    """Get the latest topics in a category, TOPICS_PAGE_SIZE per page.
+
+    Args:
+      category_id (int):  The id of the category.
+      after (str):        Token from "next" of the previous page, None for the first page.
+
+    Returns:
+      dict:               The category in "category", the topics newest first in "topics" and the token
+                          for the next page in "next".
+
+    Raises:
+      NoDataException:        If no category is found with the given id.
+      InputInvalidException:  If the token is not valid.
+    """
+    category = self._get_category(category_id)
+    topics: list[TopicData] = self._topic_dao.get_category_topics(
+      category["category_id"], self.TOPICS_PAGE_SIZE, None if after is None else decode_cursor(after, str, int)
+    )
+    next_page = None
+
+    if len(topics) == self.TOPICS_PAGE_SIZE:
+      next_page = encode_cursor(topics[-1]["created"], topics[-1]["topic_id"])
+
+    return {"category": dict(category), "topics": topics, "next": next_page}
+
+  def _get_category(self, category_id: int) -> CategoryData:
+    """Get a category from the snapshot, route ids are strings."""
+    category = self._snapshot().get(int(category_id)) if str(category_id).isdigit() else None
+
+    if category is None:
+      raise NoDataException(f"No category found with category_id: {category_id}")
+
+    return category
@@ -3,11 +3,16 @@ Module for post service, main purpose to handle posts in the application.
 
 This will be used by controllers to keep the logic here and not in controller.
 """
+import functools
 from typing import Any
 from src.services.base_service import BaseService
 from src.models import Post, User
+from src.utils.cache import TopicPageCache
 from src.utils.daos import PostDAO, UserDAO
+from src.utils.daos.unit_of_work import run_after_commit
+from src.utils.feed import LatestTopicsFeed
 from src.static.types import PostData, UserData
+from src.utils.validators import Validator, make_validator
 from src.errors.customerrors import NoDataException
 
 
@@ -15,14 +20,49 @@ class PostService(BaseService):
   """
   PostService is used for post handling.
   """
-  def __init__(self, dao: PostDAO, user_dao: UserDAO):
+  def __init__(
+    self,
+    dao: PostDAO,
+    user_dao: UserDAO,
+    page_cache: TopicPageCache | None = None,
+    latest_feed: LatestTopicsFeed | None = None
+  ):
     """Initializes the PostService class.
 
     Args:
-      dao (PostDAO): An instance of the PostDAO class.
+      dao (PostDAO):                  An instance of the PostDAO class.
+      user_dao (UserDAO):             An instance of the UserDAO class.
+      page_cache (TopicPageCache):    Cache of topic pages to invalidate on writes, None if not cached.
+      latest_feed (LatestTopicsFeed): Feed of the latest topics showing their activity, None if not used.
     """
     self._dao = dao
     self._user_dao = user_dao
+    self._page_cache = page_cache
+    self._latest_feed = latest_feed
+
+  def _invalidate_pages(self, posts: list[PostData]) -> None:
+    """Remove the cached topic pages changed by created or deleted posts, from the first post in every topic,
+    and show the new activity of the topics in the cached pages and the feed of latest topics.
+    The activity is read with the writes, the caches are changed once the writes are committed."""
+    if self._page_cache is None and self._latest_feed is None:
+      return
+
+    first_posts = {}
+
+    for post in posts:
+      first_posts.setdefault(post["topic_id"], post)
+
+    for topic_id, post in first_posts.items():
+      activity = self._dao.get_topic_activity(topic_id)
+
+      if self._page_cache is not None:
+        pages = self._dao.get_page_count(topic_id)
+        run_after_commit(functools.partial(
+          self._page_cache.invalidate_from, topic_id, post["created"], post["post_id"], pages, activity
+        ))
+
+      if self._latest_feed is not None and activity is not None:
+        run_after_commit(functools.partial(self._latest_feed.update, topic_id, activity))
 
   def create(self, data: dict[str, Any], creator: UserData) -> PostData:
     """Creates a new post in the database.
@@ -39,7 +79,33 @@ class PostService(BaseService):
     # and maybe raise exception if not allowed, might be the cleanest solution.
     # if not user.can_create_post():
     #     raise Exception("User is not allowed to create topic")
-    return self._dao.create(data)
+    post = self._dao.create(data)
+    self._invalidate_pages([post])
+
+    return post
+
+  def create_many(self, data: list[dict[str, Any]], creator: UserData) -> list[dict[str, Any]]:
+    """Creates many posts in one transaction, like when importing a forum.
+
+    Args:
+      data (list):        The data for every new post.
+      creator (UserData): The data of the creator, the author of every post.
+
+    Returns:
+      list:               The result for every post, see BaseService._create_batch.
+    """
+    user = User(creator)
+
+    for item in data:
+      if isinstance(item, dict):
+        item["author"] = user.id
+
+    def create_posts(items: list[dict[str, Any]]) -> list[PostData]:
+      posts = self._dao.create_many(items)
+      self._invalidate_pages(posts)
+      return posts
+
+    return self._create_batch(data, ("topic_id", "body"), create_posts)
 
   def update(self, post_id: int, new_data: dict[str, Any], editor_data: UserData) -> bool:
     """Update a topic in the database.
@@ -50,15 +116,22 @@ class PostService(BaseService):
       editor_data (UserData): The data of the editor trying to update topic.
 
     Returns:
-      Boolean:                True if topic changed, False otherwise
+      Boolean:                True if topic changed
+
+    Raises:
+      NoDataException:        If no post is found with the given id.
+      UnauthorizedException:  If the editor is not the author of the post.
+      InputInvalidException:  If there is no data to update.
     """
     editor = User(editor_data)
-    post = Post.from_db_by_id(post_id, post_dao=self._dao)
+    # The author is checked in the UPDATE, the post is not read first.
+    outcome, topic_id = self._dao.update_owned(post_id, editor.id, self._changes(Post.changes(new_data)))
+    self._check_ownership(outcome, "post", post_id)
 
-    data_to_db = post.update(new_data, editor)
-    result = self._dao.update(post_id, data_to_db)  # TODO returns true if nothing has changed but user is found
+    if self._page_cache is not None:
+      run_after_commit(functools.partial(self._page_cache.invalidate_post, topic_id, int(post_id)))
 
-    return result
+    return True
 
   def delete(self, id_num: int, editor_data: UserData) -> bool:
     """Delete a user in the database.
@@ -68,14 +141,42 @@ class PostService(BaseService):
       editor_data (UserData): The data of the editor trying to delete topic.
 
     Returns:
-      Boolean:                True if item deleted, False otherwise
+      Boolean:                True if item deleted
+
+    Raises:
+      NoDataException:        If no post is found with the given id.
+      UnauthorizedException:  If the editor is not the author of the post.
     """
     editor = User(editor_data)
-    post = Post.from_db_by_id(id_num, post_dao=self._dao)
+    outcome, post = self._dao.delete_owned(id_num, editor.id)
+    self._check_ownership(outcome, "post", id_num)
+    self._invalidate_pages([post])
+
+    return True
+
+  def get_validator(self, post_id: int) -> Validator | None:
+    """Get the validator of a post for conditional GET, from the version of its topic.
 
-    post.control_user(editor)
-    success = self._dao.delete(id_num)
-    return success
+    Args:
+      post_id (int):  The id of the post.
+
+    Returns:
+      Validator:      ETag and Last-Modified of the post, None if no post is found.
+    """
+    version = self._dao.get_version(post_id)
+
+    return None if version is None else make_validator((int(post_id), version[0]), version[1])
+
+  def get_many(self, ids: list[int]) -> dict[str, list]:
+    """Get many posts from the database in one query.
+
+    Args:
+      ids (list):     The ids of the posts.
+
+    Returns:
+      dict:           The posts in the order of ids in "posts" and the ids not found in "missing".
+    """
+    return self._get_many(ids, "posts", self._dao.get_many)
 
   def get_by_id(self, post_id: int) -> PostData:
     """Get a post from the database.
@@ -0,0 +1,72 @@
+"""
+Module for search service, main purpose to handle full-text search in the application.
+
+This will be used by controllers to keep the logic here and not in controller.
+"""
+import html
+import re
+from typing import Any
+from src.errors.customerrors import InputInvalidException
+from src.utils.daos.searchdao import SearchDAO, MATCH_START, MATCH_END
+from src.utils.pagination import encode_cursor, decode_cursor
+
+# Words in a search, a word ending with * matches every word starting with it.
+SEARCH_TERM = re.compile(r"\w+\*?")
+
+
+class SearchService:
+  """
+  SearchService is used for searching posts and topics.
+  """
+  MAX_TERMS = 10
+
+  def __init__(self, dao: SearchDAO):
+    """Initializes the SearchService class.
+
+    Args:
+      dao (SearchDAO): An instance of the SearchDAO class.
+    """
+    self._dao = dao
+
+  def search(self, query: str | None, after: str | None = None) -> dict[str, Any]:
+    """Search posts and topics, best match first.
+
+    Every word of the query must match, in any order. Quotes and other FTS5 syntax are ignored,
+    so any query is valid.
+
+    Args:
+      query (str):  The words to search for.
+      after (str):  Token from "next" of the previous page, None for the first page.
+
+    Returns:
+      dict:         The results in "results", with the snippet as HTML with the matches in <mark>,
+                    and the token for the next page in "next".
+
+    Raises:
+      InputInvalidException:  If the query has no words or the token is not valid.
+    """
+    match = self._to_match(query or "")
+    results = self._dao.search(match, None if after is None else decode_cursor(after, float, str, int))
+
+    for result in results:
+      result["snippet"] = self._highlight(result["snippet"])
+
+    next_page = None
+
+    if len(results) == self._dao.PAGE_SIZE:
+      next_page = encode_cursor(results[-1]["score"], results[-1]["kind"], results[-1]["id"])
+
+    return {"results": results, "next": next_page}
+
+  def _to_match(self, query: str) -> str:
+    """Make an FTS5 query from the words of a search, every word quoted."""
+    terms = SEARCH_TERM.findall(query)[:self.MAX_TERMS]
+
+    if not terms:
+      raise InputInvalidException("Search must have at least one word.")
+
+    return " ".join(f'"{term.rstrip("*")}"' + ("*" if term.endswith("*") else "") for term in terms)
+
+  def _highlight(self, snippet: str) -> str:
+    """Escape a snippet for HTML and mark the matches with <mark>."""
+    return html.escape(snippet).replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
@@ -3,13 +3,20 @@ Module for topic service, main purpose to handle topics in the application.
 
 This will be used by controllers to keep the logic here and not in controller.
 """
+import functools
+import json
 from typing import Any
 from src.services.base_service import BaseService
 from src.errors.customerrors import NoDataException
 from src.models.user import User
 from src.models.topic import Topic, TopicData
+from src.utils.cache import TopicPageCache
 from src.utils.daos import TopicDAO, PostDAO, UserDAO
+from src.utils.feed import LatestTopicsFeed
 from src.static.types import TopicData, UserData
+from src.utils.daos.unit_of_work import run_after_commit
+from src.utils.pagination import encode_cursor, decode_cursor
+from src.utils.validators import Validator, make_validator
 
 
 class TopicService(BaseService):
@@ -17,18 +24,29 @@ class TopicService(BaseService):
   TopicService is for handling all calls to models and database regarding topics.
   """
 
-  def __init__(self, topic_dao: TopicDAO, user_dao: UserDAO, post_dao: PostDAO) -> None:
+  def __init__(
+    self,
+    topic_dao: TopicDAO,
+    user_dao: UserDAO,
+    post_dao: PostDAO,
+    page_cache: TopicPageCache | None = None,
+    latest_feed: LatestTopicsFeed | None = None
+  ) -> None:
     """
     Initializes the TopicService class.
 
     Args:
-      topic_dao (TopicDAO): An instance of the TopicDAO class.
-      user_dao (UserDAO):   An instance of the UserDAO class.
-      post_dao (PostDAO):   An instance of the PostDAO class.
+      topic_dao (TopicDAO):           An instance of the TopicDAO class.
+      user_dao (UserDAO):             An instance of the UserDAO class.
+      post_dao (PostDAO):             An instance of the PostDAO class.
+      page_cache (TopicPageCache):    Cache of topic pages, None to not cache.
+      latest_feed (LatestTopicsFeed): Feed of the latest topics, None to read them from the database.
     """
     self._topic_dao = topic_dao
     self._user_dao = user_dao
     self._post_dao = post_dao
+    self._page_cache = page_cache
+    self._latest_feed = latest_feed
 
   def create(self, topic_data: dict[str, Any], creator: UserData) -> TopicData:
     """Creates a new topic.
@@ -52,8 +70,34 @@ class TopicService(BaseService):
     new_topic_data = self._topic_dao.create(topic_data)
     topic = Topic(user, new_topic_data)
 
+    if self._latest_feed is not None:
+      run_after_commit(functools.partial(self._latest_feed.add, new_topic_data))
+
     return topic.to_dict()
 
+  def create_many(self, data: list[dict[str, Any]], creator: UserData) -> list[dict[str, Any]]:
+    """Creates many topics in one transaction, like when importing a forum.
+
+    Args:
+      data (list):        The data for every new topic.
+      creator (UserData): The data of the creator of every topic.
+
+    Returns:
+      list:               The result for every topic, see BaseService._create_batch.
+    """
+    user = User(creator)
+
+    for item in data:
+      if isinstance(item, dict):
+        item["created_by"] = user.id
+
+    results = self._create_batch(data, ("title", "category"), self._topic_dao.create_many)
+
+    if self._latest_feed is not None:
+      run_after_commit(self._latest_feed.invalidate)
+
+    return results
+
   def get_by_id(self, topic_id: int) -> TopicData:
     """Get one topic in the database.
 
@@ -73,6 +117,69 @@ class TopicService(BaseService):
 
     return topic_data
 
+  def get_validator(self, topic_id: int) -> Validator | None:
+    """Get the validator of a topic for conditional GET.
+
+    Args:
+      topic_id (int):   The id of the topic.
+
+    Returns:
+      Validator:        ETag and Last-Modified of the topic, None if no topic is found.
+    """
+    version = self._topic_dao.get_version(topic_id)
+
+    return None if version is None else make_validator((int(topic_id), version[0]), version[1])
+
+  def get_page_validator(self, topic_id: int, pagnation: int = 0) -> Validator | None:
+    """Get the validator of a page of a topic for conditional GET. The cached pages of the topic are removed
+    if they show another version of it, so the page sent is the one the validator is for.
+
+    Args:
+      topic_id (int):   The id of the topic.
+      pagnation (int):  The page number.
+
+    Returns:
+      Validator:        ETag and Last-Modified of the page, None if no topic is found.
+    """
+    version = self._topic_dao.get_version(topic_id)
+
+    if version is None:
+      return None
+
+    if self._page_cache is not None and self._page_cache.enabled and str(topic_id).isdigit():
+      self._page_cache.invalidate_stale(int(topic_id), pagnation, version[0])
+
+    return make_validator((int(topic_id), pagnation, version[0]), version[1])
+
+  def get_latest_validator(self, limit: int = 10) -> Validator:
+    """Get the validator of the latest topics for conditional GET. The feed of latest topics is reloaded if it
+    shows other versions of the topics, so the topics sent are the ones the validator is for.
+
+    Args:
+      limit (int):      Number of topics.
+
+    Returns:
+      Validator:        ETag and Last-Modified of the latest topics.
+    """
+    versions, modified = self._topic_dao.get_latest_versions(limit)
+
+    if self._latest_feed is not None and self._latest_feed.enabled:
+      if [(topic["topic_id"], topic["version"]) for topic in self._latest_feed.get(limit)] != versions:
+        self._latest_feed.invalidate()
+
+    return make_validator(versions, modified)
+
+  def get_many(self, ids: list[int]) -> dict[str, list]:
+    """Get many topics in the database in one query.
+
+    Args:
+      ids (list):       The ids of the topics.
+
+    Returns:
+      dict:             The topics in the order of ids in "topics" and the ids not found in "missing".
+    """
+    return self._get_many(ids, "topics", self._topic_dao.get_many)
+
   def update(self, topic_id: int, new_data: dict[str, Any], editor_data: UserData) -> bool:
     """Update a topic in the database.
 
@@ -82,35 +189,121 @@ class TopicService(BaseService):
       editor_data (UserData): The data of the editor trying to update topic.
 
     Returns:
-      Boolean:                True if topic changed, False otherwise
+      Boolean:                True if topic changed
+
+    Raises:
+      NoDataException:        If no topic is found with the given id.
+      UnauthorizedException:  If the editor is not the creator of the topic.
+      InputInvalidException:  If there is no data to update.
     """
     editor = User(editor_data)
-    topic = Topic.from_db_by_id(topic_id, topic_dao=self._topic_dao)
+    # The creator is checked in the UPDATE, the topic is not read first.
+    outcome = self._topic_dao.update_owned(topic_id, editor.id, self._changes(Topic.changes(new_data)))
+    self._check_ownership(outcome, "topic", topic_id)
+
+    if self._page_cache is not None:
+      run_after_commit(functools.partial(self._page_cache.invalidate_topic, int(topic_id)))
 
-    data_to_db = topic.update(new_data, editor)
-    result = self._topic_dao.update(topic_id, data_to_db)  # TODO returns true if nothing has changed but user is found
+    if self._latest_feed is not None and int(topic_id) in self._latest_feed:
+      run_after_commit(functools.partial(self._latest_feed.replace, self.get_by_id(topic_id)))
 
-    return result
+    return True
 
-  def get_topic_posts_users(self, topic_id: int, pagnation: int = 0) -> dict[str, Any]:
+  def get_topic_posts_users(self, topic_id: int, pagnation: int = 0, after: str | None = None) -> dict[str, Any]:
     """Get topic and posts for topic.
     
     Args:
       topic_id (int):     The id of the topic.
       pagnation (int):    The number of pages to get.
+      after (str):        Token from "next" of the previous page, used instead of pagnation if given.
 
     Returns:
-      topic_data (dict):  The topic and posts as a dictionary.
+      topic_data (dict):  The topic and posts as a dictionary, the token for the next page in "next"
+                          and the number of pages in "pages". Pages by number are cached.
 
     Raises:
-      NoDataException:    If no topic is found with the given username.
+      NoDataException:        If no topic is found with the given username.
+      InputInvalidException:  If the token is not valid.
     """
+    if after is None and self._page_cache is not None and self._page_cache.enabled and str(topic_id).isdigit():
+      topic_id = int(topic_id)
+      cached = self._page_cache.get(topic_id, pagnation)
+
+      if cached is not None:
+        return cached
+
+      version = self._page_cache.version(topic_id)
+      page_data = self._get_topic_posts_users(topic_id, pagnation, after)
+      self._page_cache.set(topic_id, pagnation, page_data, version)
+
+      return page_data
+
+    return self._get_topic_posts_users(topic_id, pagnation, after)
+
+  def get_topic_page_json(self, topic_id: int, pagnation: int = 0) -> str:
+    """Get a page of a topic as JSON, equivalent to get_topic_posts_users encoded with sorted keys.
+
+    The document is built by SQLite and cached as it is, with the summary of the page read with it for the
+    invalidations. No dictionaries are built, encoded or decoded to send it.
+
+    Args:
+      topic_id (int):     The id of the topic.
+      pagnation (int):    The page number.
+
+    Returns:
+      str:                The page as a JSON object with topic, posts, next and pages.
+
+    Raises:
+      NoDataException:    If no topic is found with the given id.
+    """
+    cache = self._page_cache if self._page_cache is not None and self._page_cache.enabled else None
+
+    if cache is not None and str(topic_id).isdigit():
+      topic_id = int(topic_id)
+      document = cache.get_document(topic_id, pagnation)
+
+      if document is not None:
+        return document
+
+      version = cache.version(topic_id)
+    else:
+      cache = None
+
+    page = self._post_dao.get_page_json(topic_id, pagnation)
+
+    if page is None:
+      raise NoDataException(f"No topic found with topic_id: {topic_id}")
+
+    page_document, summary = page
+    next_page = None if summary.next_after is None else encode_cursor(*summary.next_after)
+    # The keys are sorted and "next" comes first, before "pages".
+    document = '{"next":' + json.dumps(next_page) + "," + page_document[1:]
+
+    if cache is not None:
+      cache.set_document(topic_id, pagnation, document, summary, version)
+
+    return document
+
+  def _get_topic_posts_users(self, topic_id: int, pagnation: int, after: str | None) -> dict[str, Any]:
+    """Get topic and posts for topic from the database, see get_topic_posts_users."""
     topic_data = self.get_by_id(topic_id)
-    posts_data = self._post_dao.get_post_and_users_with_pagination(topic_id, pagnation)
+
+    if after is None:
+      posts_data, pages = self._post_dao.get_page(topic_id, pagnation)
+    else:
+      posts_data = self._post_dao.get_post_and_users_after(topic_id, decode_cursor(after, str, int))
+      pages = self._post_dao.get_page_count(topic_id)
+
+    next_page = None
+
+    if len(posts_data) == self._post_dao.PAGE_SIZE:
+      next_page = encode_cursor(posts_data[-1]["created"], posts_data[-1]["post_id"])
 
     return {
       "topic": topic_data,
-      "posts": posts_data
+      "posts": posts_data,
+      "next": next_page,
+      "pages": pages
     }
 
   def delete(self, topic_id: int, editor_data: UserData) -> bool:
@@ -122,22 +315,41 @@ class TopicService(BaseService):
       editor_data (UserData): The data of the editor trying to delete topic.
 
     Returns:
-      Boolean:                True if item deleted, False otherwise
+      Boolean:                True if item deleted
+
+    Raises:
+      NoDataException:        If no topic is found with the given id.
+      UnauthorizedException:  If the editor is not the creator of the topic.
     """
     editor = User(editor_data)
-    topic = Topic.from_db_by_id(topic_id, topic_dao=self._topic_dao)
+    outcome = self._topic_dao.delete_owned(topic_id, editor.id)
+    self._check_ownership(outcome, "topic", topic_id)
+
+    if self._page_cache is not None:
+      run_after_commit(functools.partial(self._page_cache.invalidate_topic, int(topic_id)))
 
-    topic.control_access(editor)
-    success = self._topic_dao.delete(topic_id)
+    if self._latest_feed is not None:
+      run_after_commit(functools.partial(self._latest_feed.remove, int(topic_id)))
 
-    return success
+    return True
 
   def get_latest_topics(self, limit: int = 10) -> list[TopicData]:
     """Get the latest topics in the database, based on creation date.
 
     Returns:
-      list[TopicData]: The list of topics.
+      list[TopicData]: The list of topics, from the feed of latest topics if there is one.
     """
+    if self._latest_feed is not None:
+      return self._latest_feed.get(limit)
+
     topics = self._topic_dao.get_latest_topics(limit)
 
     return topics
+
+  def get_active_topics(self, limit: int = 10) -> list[TopicData]:
+    """Get the recently active topics, based on the date of their latest post.
+
+    Returns:
+      list[TopicData]: The list of topics.
+    """
+    return self._topic_dao.get_active_topics(limit)
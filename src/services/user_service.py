@@ -3,11 +3,18 @@ Module for user service, main purpose to handle users in the application.
 
 This will be used by controllers to keep the logic here and not in controller.
 """
+import functools
 from typing import Any
 from src.services.base_service import BaseService
+from src.utils.cache import TopicPageCache
+from src.utils.daos.postdao import PostDAO
+from src.utils.daos.topicdao import TopicDAO
 from src.utils.daos.userdao import UserDAO
+from src.utils.daos.unit_of_work import run_after_commit
+from src.utils.pagination import encode_cursor, decode_cursor
 from src.models import User
-from src.static.types import UserData
+from src.static.types import TopicData, UserData
+from src.utils.validators import Validator, make_validator
 from src.errors.customerrors import NoDataException
 
 
@@ -15,13 +22,28 @@ class UserService(BaseService):
   """
   UserService is used for user handling.
   """
-  def __init__(self, dao: UserDAO):
+  POSTS_PAGE_SIZE = 20
+  TOPICS_PAGE_SIZE = 20
+
+  def __init__(
+    self,
+    dao: UserDAO,
+    post_dao: PostDAO,
+    topic_dao: TopicDAO,
+    page_cache: TopicPageCache | None = None
+  ):
     """Initializes the UserService class.
 
     Parameters:
-      dao (UserDAO): An instance of the UserDAO class.
+      dao (UserDAO):                An instance of the UserDAO class.
+      post_dao (PostDAO):           An instance of the PostDAO class, for the posts of a user.
+      topic_dao (TopicDAO):         An instance of the TopicDAO class, for the topics of a user.
+      page_cache (TopicPageCache):  Cache of topic pages showing users, None if not cached.
     """
     self._dao = dao
+    self._post_dao = post_dao
+    self._topic_dao = topic_dao
+    self._page_cache = page_cache
 
   def create(self, data: dict[str, str]) -> UserData:
     """Creates a new user in the database.
@@ -34,6 +56,17 @@ class UserService(BaseService):
     """
     return self._dao.create(data)
 
+  def create_many(self, data: list[dict[str, str]]) -> list[dict[str, Any]]:
+    """Creates many users in one transaction, like when importing a forum.
+
+    Parameters:
+      data (list):  The data for every new user.
+
+    Returns:
+      list:         The result for every user, see BaseService._create_batch.
+    """
+    return self._create_batch(data, ("username", ), self._dao.create_many, conflict="Username already taken.")
+
   def update(self, user_id: int, new_data: dict[str, Any], editor_data: UserData) -> bool:
     """Update a user in the database.
 
@@ -43,15 +76,22 @@ class UserService(BaseService):
       editor_data (UserData): The data of the editor trying to update user.
 
     Returns:
-      Boolean:                True if topic changed, False otherwise
+      Boolean:                True if user changed
+
+    Raises:
+      NoDataException:        If no user is found with the given id.
+      UnauthorizedException:  If the editor is not the user.
+      InputInvalidException:  If there is no data to update.
     """
     editor = User(editor_data)
-    user = User.from_db_by_id(user_id, self._dao)
+    # The editor is checked in the UPDATE, the user is not read first.
+    outcome = self._dao.update_owned(user_id, editor.id, self._changes(User.changes(new_data)))
+    self._check_ownership(outcome, "user", user_id)
 
-    data_to_db = user.update(new_data, editor)
-    result = self._dao.update(user_id, data_to_db)  # TODO returns true if nothing has changed but user is found
+    if self._page_cache is not None:
+      run_after_commit(functools.partial(self._page_cache.invalidate_user, int(user_id)))
 
-    return result
+    return True
 
   def delete(self, id_num: int, editor_data: UserData) -> bool:
     """Delete a user in the database.
@@ -110,3 +150,79 @@ class UserService(BaseService):
       raise NoDataException(f"No user found with user_id: {user_id}")
     
     return user
+
+  def get_validator(self, user_id: int) -> Validator | None:
+    """Get the validator of a user for conditional GET.
+
+    Parameters:
+      user_id (int):  The id of the user.
+
+    Returns:
+      Validator:      ETag and Last-Modified of the user, None if no user is found.
+    """
+    version = self._dao.get_version(user_id)
+
+    return None if version is None else make_validator((int(user_id), version[0]), version[1])
+
+  def get_many(self, ids: list[int]) -> dict[str, list]:
+    """Get many users in the database, the ones not cached in one query.
+
+    Parameters:
+      ids (list):     The ids of the users.
+
+    Returns:
+      dict:           The users in the order of ids in "users" and the ids not found in "missing".
+    """
+    return self._get_many(ids, "users", self._dao.get_many)
+
+  def get_user_posts(self, user_id: int, after: str | None = None) -> dict[str, Any]:
+    """Get the latest posts of a user, POSTS_PAGE_SIZE per page.
+
+    Parameters:
+      user_id (int):  The id of the user.
+      after (str):    Token from "next" of the previous page, None for the first page.
+
+    Returns:
+      dict:           The user in "user", the posts newest first in "posts" and the token for the next page
+                      in "next".
+
+    Raises:
+      NoDataException:        If no user is found with the given id.
+      InputInvalidException:  If the token is not valid.
+    """
+    user = self.get_by_id(user_id)
+    posts = self._post_dao.get_user_posts(
+      user["user_id"], self.POSTS_PAGE_SIZE, None if after is None else decode_cursor(after, str, int)
+    )
+    next_page = None
+
+    if len(posts) == self.POSTS_PAGE_SIZE:
+      next_page = encode_cursor(posts[-1]["created"], posts[-1]["post_id"])
+
+    return {"user": user, "posts": posts, "next": next_page}
+
+  def get_user_topics(self, user_id: int, after: str | None = None) -> dict[str, Any]:
+    """Get the latest topics created by a user, TOPICS_PAGE_SIZE per page.
+
+    Parameters:
+      user_id (int):  The id of the user.
+      after (str):    Token from "next" of the previous page, None for the first page.
+
+    Returns:
+      dict:           The user in "user", the topics newest first in "topics" and the token for the next page
+                      in "next".
+
+    Raises:
+      NoDataException:        If no user is found with the given id.
+      InputInvalidException:  If the token is not valid.
+    """
+    user = self.get_by_id(user_id)
+    topics: list[TopicData] = self._topic_dao.get_user_topics(
+      user["user_id"], self.TOPICS_PAGE_SIZE, None if after is None else decode_cursor(after, str, int)
+    )
+    next_page = None
+
+    if len(topics) == self.TOPICS_PAGE_SIZE:
+      next_page = encode_cursor(topics[-1]["created"], topics[-1]["topic_id"])
+
+    return {"user": user, "topics": topics, "next": next_page}
@@ -1,3 +1,3 @@
-from .types import TopicType, TopicData, UserData, UserInput, PostData
+from .types import CategoryData, TopicType, TopicData, UserData, UserInput, PostData
 
-__all__ = ["TopicType", "TopicData", "UserData", "UserInput", "PostData"]
+__all__ = ["CategoryData", "TopicType", "TopicData", "UserData", "UserInput", "PostData"]
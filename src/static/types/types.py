@@ -17,6 +17,13 @@ class UserData(UserInput):
   user_id: int
 
 
+class CategoryData(TypedDict):
+  """Category data."""
+  category_id: int
+  category: str
+  description: str | None
+
+
 class TopicType(TypedDict):
   """Topic type."""
   topic_id: int
@@ -26,6 +33,10 @@ class TopicType(TypedDict):
   last_edited: str | None
   deleted: str | None
   disabled: bool
+  post_count: int
+  last_post_id: int | None
+  last_post_at: str | None
+  version: int
 
 class TopicData(TopicType, total=False):
   """Topic data."""
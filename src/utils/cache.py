@@ -0,0 +1,442 @@
+"""
+In-process LRU cache with a time to live, safe to share between threads.
+
+Entries are evicted least recently used first when the cache is full, and count as missing once they are
+older than the time to live. Hits, misses and evictions are counted for stats().
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, NamedTuple, TypeVar
+
+V = TypeVar("V")
+
+TOPIC_PAGE_CACHE_SIZE = int(os.environ.get("TOPIC_PAGE_CACHE_SIZE", "512"))
+TOPIC_PAGE_CACHE_TTL = float(os.environ.get("TOPIC_PAGE_CACHE_TTL", "300"))
+
+
+class LRUCache(Generic[V]):
+  """
+  A bounded mapping from keys to values, evicting the least recently used entry first.
+  """
+
+  def __init__(self, max_size: int, ttl: float):
+    """Initializes the LRUCache.
+
+    Args:
+      max_size (int): Maximum number of entries, 0 disables the cache.
+      ttl (float):    Seconds an entry is valid after it was set.
+    """
+    self._max_size = max_size
+    self._ttl = ttl
+    self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+    self._expirations = 0
+
+  @property
+  def enabled(self) -> bool:
+    """True if the cache keeps any entries."""
+    return self._max_size > 0
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def get(self, key: Hashable) -> V | None:
+    """Get a value and mark it as recently used.
+
+    Args:
+      key (Hashable): The key of the value.
+
+    Returns:
+      Any:            The value, None if missing or expired
+    """
+    with self._lock:
+      entry = self._entries.get(key)
+
+      if entry is None:
+        self._misses += 1
+        return None
+
+      expires, value = entry
+
+      if expires < time.monotonic():
+        del self._entries[key]
+        self._expirations += 1
+        self._misses += 1
+        return None
+
+      self._entries.move_to_end(key)
+      self._hits += 1
+      return value
+
+  def peek(self, key: Hashable) -> V | None:
+    """Get a value without marking it as used or counting a hit or miss.
+
+    Args:
+      key (Hashable): The key of the value.
+
+    Returns:
+      Any:            The value, None if missing or expired
+    """
+    with self._lock:
+      entry = self._entries.get(key)
+
+      return None if entry is None or entry[0] < time.monotonic() else entry[1]
+
+  def set(self, key: Hashable, value: V) -> None:
+    """Set a value, evicting the least recently used entry if the cache is full.
+
+    Args:
+      key (Hashable): The key of the value.
+      value (Any):    The value, not None.
+    """
+    if not self.enabled:
+      return
+
+    with self._lock:
+      self._entries[key] = (time.monotonic() + self._ttl, value)
+      self._entries.move_to_end(key)
+
+      while len(self._entries) > self._max_size:
+        self._entries.popitem(last=False)
+        self._evictions += 1
+
+  def delete(self, key: Hashable) -> None:
+    """Remove a value if present.
+
+    Args:
+      key (Hashable): The key of the value.
+    """
+    with self._lock:
+      self._entries.pop(key, None)
+
+  def delete_where(self, predicate: Callable[[Hashable, V], bool]) -> int:
+    """Remove every value the predicate is true for.
+
+    Args:
+      predicate (Callable): Called with the key and value of every entry.
+
+    Returns:
+      int:                  Number of removed values
+    """
+    with self._lock:
+      keys = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+
+      for key in keys:
+        del self._entries[key]
+
+      return len(keys)
+
+  def items(self) -> list[tuple[Hashable, V]]:
+    """Get all keys and values, expired ones included.
+
+    Returns:
+      list: (key, value) for every entry
+    """
+    with self._lock:
+      return [(key, value) for key, (_, value) in self._entries.items()]
+
+  def clear(self) -> None:
+    """Remove all values, the counters are kept."""
+    with self._lock:
+      self._entries.clear()
+
+  def stats(self) -> dict[str, Any]:
+    """Get the counters of the cache.
+
+    Returns:
+      dict: size, max_size, hits, misses, evictions and expirations
+    """
+    with self._lock:
+      return {
+        "size": len(self._entries),
+        "max_size": self._max_size,
+        "hits": self._hits,
+        "misses": self._misses,
+        "evictions": self._evictions,
+        "expirations": self._expirations,
+      }
+
+
+class PageSummary(NamedTuple):
+  """The fields of a topic page the invalidations look at."""
+  pages: int
+  # (created, post_id) of the last post if the page is full, else None
+  next_after: tuple[str, int] | None
+  post_ids: frozenset[int]
+  # The creator of the topic and the authors of the posts
+  user_ids: frozenset[int]
+  # Version of the topic on the page
+  version: int | None
+
+  @classmethod
+  def of(cls, data: dict[str, Any]) -> PageSummary:
+    """Summarize a page.
+
+    Args:
+      data (dict):  The page, with topic, posts, next and pages.
+
+    Returns:
+      PageSummary:  The summary
+    """
+    posts = data["posts"]
+
+    return cls(
+      pages=data["pages"],
+      next_after=None if data["next"] is None else (posts[-1]["created"], posts[-1]["post_id"]),
+      post_ids=frozenset(post["post_id"] for post in posts),
+      user_ids=frozenset([data["topic"]["created_by"]["user_id"], *(post["author"]["user_id"] for post in posts)]),
+      version=data["topic"].get("version")
+    )
+
+
+class TopicPageCache:
+  """
+  Cache of the assembled {topic, posts} page of a topic, keyed by (topic_id, page).
+
+  Writes invalidate the pages they change only. Every invalidation bumps a version of the topic, a page read
+  before the invalidation is not stored after it. Set TOPIC_PAGE_CACHE_SIZE=0 to turn the cache off.
+  Versions are kept for the max_size most recently invalidated topics. The others share a floor version, raised
+  to the latest version when a topic is dropped, so a page read before the drop is not stored either.
+
+  A page can be stored as dict, as JSON document or both, the document is then sent as response body without
+  encoding the page. Invalidations look at the PageSummary kept with every page, so documents are never decoded.
+  """
+
+  def __init__(
+    self,
+    max_size: int = TOPIC_PAGE_CACHE_SIZE,
+    ttl: float = TOPIC_PAGE_CACHE_TTL,
+    on_change: Callable[[int], Any] | None = None
+  ):
+    """Initializes the TopicPageCache.
+
+    Args:
+      max_size (int):       Maximum number of pages, 0 disables the cache.
+      ttl (float):          Seconds a page is kept, for changes made outside of the services.
+      on_change (Callable): Called with the id of every invalidated topic, like ResponseCache.purge_topic.
+    """
+    # {"data": page or None, "document": JSON of the page or None, "summary": PageSummary of the page}
+    self._pages: LRUCache[dict[str, Any]] = LRUCache(max_size, ttl)
+    self._versions: OrderedDict[int, int] = OrderedDict()
+    self._max_versions = max_size
+    # Last version given to a topic, and the version of every topic without an entry in _versions.
+    self._clock = 0
+    self._floor = 0
+    self._on_change = on_change
+    self._lock = threading.RLock()
+
+  @property
+  def enabled(self) -> bool:
+    """True if the cache keeps any pages."""
+    return self._pages.enabled
+
+  def version(self, topic_id: int) -> int:
+    """Get the version of a topic, to pass to set() for a page read after this call.
+
+    Args:
+      topic_id (int): The id of the topic.
+
+    Returns:
+      int:            The version
+    """
+    with self._lock:
+      return self._versions.get(topic_id, self._floor)
+
+  def get(self, topic_id: int, page: int) -> dict[str, Any] | None:
+    """Get a page.
+
+    Args:
+      topic_id (int): The id of the topic.
+      page (int):     The page number.
+
+    Returns:
+      dict:           A copy of the page, None if not cached
+    """
+    entry = self._pages.get((topic_id, page))
+    return None if entry is None or entry["data"] is None else dict(entry["data"])
+
+  def get_document(self, topic_id: int, page: int) -> str | None:
+    """Get the JSON document of a page.
+
+    Args:
+      topic_id (int): The id of the topic.
+      page (int):     The page number.
+
+    Returns:
+      str:            The document, None if not cached or stored without one
+    """
+    entry = self._pages.get((topic_id, page))
+    return None if entry is None else entry["document"]
+
+  def set(self, topic_id: int, page: int, data: dict[str, Any], version: int, document: str | None = None) -> None:
+    """Store a page, unless the topic was invalidated since version was read. A document stored before for
+    the page is kept.
+
+    Args:
+      topic_id (int):   The id of the topic.
+      page (int):       The page number.
+      data (dict):      The page, with topic, posts, next and pages.
+      version (int):    Version of the topic from before the page was read.
+      document (str):   The page as JSON, None if not encoded.
+    """
+    self._store(topic_id, page, version, PageSummary.of(data), data=dict(data), document=document)
+
+  def set_document(self, topic_id: int, page: int, document: str, summary: PageSummary, version: int) -> None:
+    """Store the JSON document of a page, unless the topic was invalidated since version was read. A page
+    stored before as dict is kept.
+
+    Args:
+      topic_id (int):         The id of the topic.
+      page (int):             The page number.
+      document (str):         The page as JSON.
+      summary (PageSummary):  The summary of the page, read with the document.
+      version (int):          Version of the topic from before the page was read.
+    """
+    self._store(topic_id, page, version, summary, document=document)
+
+  def invalidate_topic(self, topic_id: int) -> int:
+    """Remove every page of a topic, when the topic itself changed.
+
+    Args:
+      topic_id (int): The id of the topic.
+
+    Returns:
+      int:            Number of removed pages
+    """
+    return self._invalidate(topic_id, lambda data: True)
+
+  def invalidate_stale(self, topic_id: int, page: int, topic_version: int) -> int:
+    """Remove every page of a topic if a page shows another version of the topic than the database,
+    when the topic was changed outside of the services of this process.
+
+    Args:
+      topic_id (int):       The id of the topic.
+      page (int):           The page number to check.
+      topic_version (int):  The version of the topic in the database.
+
+    Returns:
+      int:                  Number of removed pages
+    """
+    entry = self._pages.get((topic_id, page))
+
+    if entry is None or entry["summary"].version == topic_version:
+      return 0
+
+    return self.invalidate_topic(topic_id)
+
+  def invalidate_from(
+    self,
+    topic_id: int,
+    created: str,
+    post_id: int,
+    pages: int,
+    activity: dict[str, Any] | None = None
+  ) -> int:
+    """Remove the pages changed by creating or deleting a post.
+
+    The pages before the post keep their posts, they are removed only if the number of pages changed.
+    The activity of the topic shown on the kept pages is replaced, their JSON documents are dropped and
+    pages kept as document only are removed.
+
+    Args:
+      topic_id (int):   The id of the topic.
+      created (str):    Created timestamp of the post.
+      post_id (int):    The id of the post.
+      pages (int):      Number of pages in the topic after the change.
+      activity (dict):  post_count, last_post_id, last_post_at and version of the topic after the change.
+
+    Returns:
+      int:              Number of removed pages
+    """
+    def changed(summary: PageSummary) -> bool:
+      return summary.pages != pages or summary.next_after is None or summary.next_after >= (created, post_id)
+
+    with self._lock:
+      removed = self._invalidate(topic_id, changed)
+
+      if activity is not None:
+        for key, entry in self._pages.items():
+          if key[0] == topic_id and entry["data"] is not None:
+            entry["data"]["topic"] = {**entry["data"]["topic"], **activity}
+            entry["document"] = None
+            entry["summary"] = entry["summary"]._replace(version=activity.get("version", entry["summary"].version))
+
+        removed += self._pages.delete_where(lambda key, entry: key[0] == topic_id and entry["data"] is None)
+
+      return removed
+
+  def invalidate_post(self, topic_id: int, post_id: int) -> int:
+    """Remove the page holding a post, when the post was edited.
+
+    Args:
+      topic_id (int): The id of the topic.
+      post_id (int):  The id of the post.
+
+    Returns:
+      int:            Number of removed pages
+    """
+    return self._invalidate(topic_id, lambda summary: post_id in summary.post_ids)
+
+  def invalidate_user(self, user_id: int) -> int:
+    """Remove the pages showing a user, as creator of the topic or as author of a post.
+
+    Args:
+      user_id (int):  The id of the user.
+
+    Returns:
+      int:            Number of removed pages
+    """
+    def shows_user(entry: dict[str, Any]) -> bool:
+      return user_id in entry["summary"].user_ids
+
+    with self._lock:
+      topics = {key[0] for key, entry in self._pages.items() if shows_user(entry)}
+      for topic_id in topics:
+        self._bump(topic_id)
+
+      return self._pages.delete_where(lambda key, entry: key[0] in topics and shows_user(entry))
+
+  def stats(self) -> dict[str, Any]:
+    """Get the counters of the cache.
+
+    Returns:
+      dict: See LRUCache.stats
+    """
+    return self._pages.stats()
+
+  def _store(self, topic_id: int, page: int, version: int, summary: PageSummary, **parts: Any) -> None:
+    """Store the data or document of a page with its summary, keeping the other one if stored before."""
+    with self._lock:
+      if self.version(topic_id) != version:
+        return
+
+      entry = self._pages.peek((topic_id, page)) or {"data": None, "document": None}
+      parts = {name: part for name, part in parts.items() if part is not None}
+      self._pages.set((topic_id, page), {**entry, **parts, "summary": summary})
+
+  def _bump(self, topic_id: int) -> None:
+    """Give a topic a new version, dropping the versions of the least recently invalidated topics if too many."""
+    with self._lock:
+      self._clock += 1
+      self._versions[topic_id] = self._clock
+      self._versions.move_to_end(topic_id)
+
+      while len(self._versions) > self._max_versions:
+        self._versions.popitem(last=False)
+        self._floor = self._clock
+
+      if self._on_change is not None:
+        self._on_change(topic_id)
+
+  def _invalidate(self, topic_id: int, changed: Callable[[PageSummary], bool]) -> int:
+    """Bump the version of a topic and remove its changed pages."""
+    with self._lock:
+      self._bump(topic_id)
+
+      return self._pages.delete_where(lambda key, entry: key[0] == topic_id and changed(entry["summary"]))
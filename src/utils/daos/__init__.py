@@ -1,5 +1,7 @@
 from .topicdao import TopicDAO
 from .postdao import PostDAO
 from .userdao import UserDAO
+from .searchdao import SearchDAO
+from .categorydao import CategoryDAO
 
-__all__ = ['TopicDAO', 'PostDAO', 'UserDAO']
+__all__ = ['TopicDAO', 'PostDAO', 'UserDAO', 'SearchDAO', 'CategoryDAO']
@@ -0,0 +1,55 @@
+"""
+Executor for the blocking sqlite calls of the async views, see Controller.view.
+
+sqlite3 has no async API, so the calls are run on at most SQLITE_ASYNC_WORKERS threads. The context of the
+caller is copied to the executor thread, so the DAOs still find the unit of work of the current request.
+"""
+from __future__ import annotations
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+ASYNC_WORKERS = int(os.environ.get("SQLITE_ASYNC_WORKERS", "8"))
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+  """Get the executor for blocking database calls, created on first use and again in a forked process.
+
+  Returns:
+    ThreadPoolExecutor: The executor, with ASYNC_WORKERS threads
+  """
+  global _executor, _executor_pid  # pylint: disable=global-statement
+
+  with _executor_lock:
+    if _executor is None or _executor_pid != os.getpid():
+      _executor = ThreadPoolExecutor(ASYNC_WORKERS, thread_name_prefix="sqlite-async")
+      _executor_pid = os.getpid()
+
+    return _executor
+
+
+async def run_async(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+  """Run a blocking function on the executor, in a copy of the current context.
+
+  Args:
+    func (Callable):  The blocking function.
+    args, kwargs:     Arguments for func.
+
+  Returns:
+    Any:              The return value of func
+  """
+  context = contextvars.copy_context()
+  call = functools.partial(context.run, func, *args, **kwargs)
+
+  return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
+
@@ -1,56 +1,234 @@
 """
 DAO is used for simplyfying handling with data from database.
+
+ConnectionDAO has the connection handling only, for DAOs reading data that is not created by the application,
+like the search index and the categories. DAO adds the methods for CRUD.
 """
+from __future__ import annotations
 import os
 import sqlite3
+import threading
 from abc import ABC, abstractmethod
-from typing import Any
+from enum import Enum
+from typing import Any, Callable, TypeVar
+from src.utils.daos.connection_pool import ConnectionPool, PooledConnection
+from src.utils.daos.unit_of_work import SharedConnection, current_unit_of_work
+from src.utils.daos.writer import Writer
 from src.utils.print_colors import ColorPrinter
 
 printer = ColorPrinter()
 
+T = TypeVar("T")
+
+
+class Ownership(Enum):
+  """Outcome of a write to a row only its owner may change, see DAO._write_owned."""
+  WRITTEN = "written"
+  NOT_FOUND = "not found"
+  NOT_OWNER = "not owner"
 
-class DAO(ABC):
+
+class ConnectionDAO:
   """
-  DAO is a class with some db-connecting methods and abstrac methods for CRUD.
+  ConnectionDAO is a class with the db-connecting methods shared by all DAOs.
   """
 
-  def __init__(self, table_name: str):
-    """Constructor for DAO."""
+  def __init__(
+    self,
+    table_name: str,
+    pool: ConnectionPool | None = None,
+    writer: Writer | None = None,
+    read_pool: ConnectionPool | None = None
+  ):
+    """Constructor for ConnectionDAO.
+
+    Args:
+      table_name (str):           Name of the table for the DAO.
+      pool (ConnectionPool):      Pool to share with other DAOs, a new pool is created if not given.
+      writer (Writer):            Writer to run the writes on, writes use a connection from the pool if not given.
+      read_pool (ConnectionPool): Read-only pool for reads, reads use pool if not given.
+    """
     self._db_path = os.environ.get(
       "SQLITE_PATH",
       "./db/db.sqlite"
     )
     self._table = table_name
-    self._connection = None
+    self._pool = pool if pool is not None else ConnectionPool(self._db_path)
+    self._writer = writer
+    self._read_pool = read_pool if read_pool is not None else self._pool
+    self._local = threading.local()
+
+  @property
+  def _connection(self) -> PooledConnection | SharedConnection | None:
+    """Connection checked out by _connect_get_cursor, kept per thread since DAOs are shared."""
+    return getattr(self._local, "connection", None)
+
+  @_connection.setter
+  def _connection(self, connection: PooledConnection | SharedConnection | None):
+    self._local.connection = connection
+
+  def _acquire(self, read_only: bool = False) -> PooledConnection | SharedConnection:
+    """ Get the connection of the unit of work for the current request, or check out one from the pool.
 
-  def _get_connection_and_cursor(self) -> tuple[sqlite3.Connection, sqlite3.Cursor]:
-    """ Connect to the sqlite database and get connection and cursor.
+    Reads use any unit of work that only reads, like the one on the read replica for GET requests.
+
+    Args:
+      read_only (bool): True if the connection is only used for reading, then the read pool is used.
 
     Returns:
-      connection, cursor: To use for executing queries
+      connection: Connection to use, close it when done
     """
-    connection = sqlite3.connect(self._db_path)
+    unit_of_work = current_unit_of_work()
+
+    if unit_of_work is not None and (unit_of_work.pool is self._pool or (read_only and not unit_of_work.write)):
+      return unit_of_work.connection()
+
+    return self._read_pool.acquire() if read_only else self._pool.acquire()
+
+  def _get_connection_and_cursor(
+    self,
+    read_only: bool = False
+  ) -> tuple[PooledConnection | SharedConnection, sqlite3.Cursor]:
+    """ Check out a connection and get connection and cursor.
+
+    Args:
+      read_only (bool):   True if the connection is only used for reading.
+
+    Returns:
+      connection, cursor: To use for executing queries, close connection to give it back
+    """
+    connection = self._acquire(read_only)
     cursor = connection.cursor()
 
     return connection, cursor
 
-  def _connect_get_cursor(self) -> sqlite3.Cursor:
-    """ Connect to the sqlite database.
+  def _connect_get_cursor(self, read_only: bool = False) -> sqlite3.Cursor:
+    """ Check out a connection, given back with _disconnect.
+
+    Args:
+      read_only (bool):   True if the connection is only used for reading.
 
     Returns:
       sqlite3 cursor:
     """
-    self._connection = sqlite3.connect(self._db_path)
+    self._connection = self._acquire(read_only)
     return self._connection.cursor()
 
   def _disconnect(self):
-    """ Disconnects the connection. """
+    """ Gives the connection back to the pool. """
     if self._connection is not None:
       self._connection.close()
 
     self._connection = None
 
+  def _write(self, work: Callable[[sqlite3.Cursor], T]) -> T:
+    """ Run a write with a cursor and commit it.
+
+    In a unit of work for a request that writes, the write is committed with the request. Otherwise it goes
+    to the writer, or without a writer it runs on a connection from the pool.
+
+    Args:
+      work (Callable):  Function doing the write with the given cursor, it must not commit.
+
+    Returns:
+      Any:              The return value of work, when the write is committed
+    """
+    unit_of_work = current_unit_of_work()
+    in_write_unit = unit_of_work is not None and unit_of_work.pool is self._pool and unit_of_work.write
+
+    if self._writer is not None and not in_write_unit:
+      return self._writer.run(work)
+
+    conn = None
+    try:
+      conn, cur = self._get_connection_and_cursor()
+      result = work(cur)
+      conn.commit()
+
+      return result
+    finally:
+      if conn is not None:
+        conn.close()
+
+
+class DAO(ConnectionDAO, ABC):
+  """
+  DAO is a ConnectionDAO with abstract methods for CRUD.
+  """
+  # Rows per INSERT in create_many, keeps the bound parameters below the limit of older sqlite versions.
+  INSERT_BATCH_ROWS = 200
+
+  def _insert_many(self, cur: sqlite3.Cursor, insert: str, rows: list[tuple], returning: str) -> list[tuple]:
+    """ Insert rows with multi-row INSERT statements of at most INSERT_BATCH_ROWS rows each.
+
+    Args:
+      cur (Cursor):     cursor to execute on, the caller commits
+      insert (str):     INSERT INTO table (columns), without VALUES
+      rows (list):      values for every row, in the order of the columns
+      returning (str):  what follows VALUES, a RETURNING clause with the id first
+
+    Returns:
+      list:             the returned rows, in id order within every statement
+    """
+    if not rows:
+      return []
+
+    row_placeholders = f"({', '.join(['?'] * len(rows[0]))})"
+    returned = []
+
+    for start in range(0, len(rows), self.INSERT_BATCH_ROWS):
+      chunk = rows[start:start + self.INSERT_BATCH_ROWS]
+      cur.execute(
+        f"{insert} VALUES {', '.join([row_placeholders] * len(chunk))} {returning}",
+        [value for row in chunk for value in row]
+      )
+      returned.extend(sorted(cur.fetchall()))
+
+    return returned
+
+  def _write_owned(
+    self,
+    cur: sqlite3.Cursor,
+    assignments: str,
+    params: tuple,
+    id_num: int,
+    owner_column: str,
+    owner_id: int,
+    returning: str = "id",
+    soft_deleted: bool = True
+  ) -> tuple[Ownership, tuple | None]:
+    """ Update a row if it is owned by the given user, with the owner in the WHERE clause of the UPDATE.
+
+    Only when no row is updated the row is looked up again, in the same transaction, to tell a missing row
+    from one owned by someone else.
+
+    Args:
+      cur (Cursor):         cursor to execute on, the caller commits
+      assignments (str):    SET clause of the update, with ? for params
+      params (tuple):       parameters for assignments
+      id_num (int):         unique id for the entry to update
+      owner_column (str):   column with the id of the owner
+      owner_id (int):       id of the user writing
+      returning (str):      columns to return from the updated row
+      soft_deleted (bool):  True if rows with deleted set count as missing
+
+    Returns:
+      Ownership, tuple:     the outcome and the returned columns if written, else None
+    """
+    deleted_filter = "AND deleted IS NULL" if soft_deleted else ""
+    row = cur.execute(f"""
+      UPDATE {self._table} SET {assignments}
+      WHERE id = ? {deleted_filter} AND {owner_column} = ?
+      RETURNING {returning}
+    """, (*params, id_num, owner_id)).fetchone()
+
+    if row is not None:
+      return Ownership.WRITTEN, row
+
+    exists = cur.execute(f"SELECT 1 FROM {self._table} WHERE id = ? {deleted_filter}", (id_num, )).fetchone()
+
+    return (Ownership.NOT_FOUND if exists is None else Ownership.NOT_OWNER), None
+
   @abstractmethod
   def create(self, data: dict) -> Any:
     pass
@@ -59,6 +237,10 @@ class DAO(ABC):
   def get_one(self, id_num: int) -> Any:
     pass
 
+  @abstractmethod
+  def get_many(self, ids: list[int]) -> list[Any]:
+    pass
+
   def update(self, id_num: int, data: dict) -> bool:
     """Update entry.
 
@@ -72,22 +254,18 @@ class DAO(ABC):
     Raises:
       Exception:    In case of any error
     """
-    conn = None
-    try:
-      conn, cur = self._get_connection_and_cursor()
-
+    def update(cur: sqlite3.Cursor) -> bool:
       columns = ', '.join([f'{k} = ?' for k in data.keys()])
 
       cur.execute(f"UPDATE {self._table} SET {columns} WHERE id = ?", (*data.values(), id_num, ))
-      conn.commit()
 
       return cur.rowcount > 0
+
+    try:
+      return self._write(update)
     except Exception as err:
       printer.print_fail(err)
       raise err
-    finally:
-      if conn is not None:
-        conn.close()
 
   def delete(self, id_num: int) -> bool:
     """Delete entry from database (soft delete).
@@ -101,16 +279,13 @@ class DAO(ABC):
     Raises:
       Exception:    In case of any error
     """
-    conn = None
-    try:
-      conn, cur = self._get_connection_and_cursor()
+    def delete(cur: sqlite3.Cursor) -> bool:
       cur.execute(f"UPDATE {self._table} SET deleted = CURRENT_TIMESTAMP WHERE id = ?", (id_num, ))
-      conn.commit()
 
       return cur.rowcount > 0
+
+    try:
+      return self._write(delete)
     except Exception as err:
       printer.print_fail(err)
       raise err
-    finally:
-      if conn is not None:
-        conn.close()
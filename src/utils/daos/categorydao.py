@@ -0,0 +1,119 @@
+"""
+CategoryDAO is used for accessing categories.
+"""
+from __future__ import annotations
+import json
+from src.utils.daos.basedao import ConnectionDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.writer import Writer
+from src.utils.daos.row_mapper import RowMapper
+from src.utils.print_colors import ColorPrinter
+from src.static.types import CategoryData
+
+printer = ColorPrinter()
+
+
+class CategoryDAO(ConnectionDAO):
+  """
+  CategoryDAO for reading categories, they are loaded with db/load.py and not written by the application.
+  """
+  CATEGORY_MAPPER = RowMapper(("category_id", "category", "description"))
+
+  def __init__(
+    self,
+    table_name: str,
+    pool: ConnectionPool | None = None,
+    writer: Writer | None = None,
+    read_pool: ConnectionPool | None = None
+  ):
+    super().__init__(table_name, pool, writer, read_pool)
+
+  def get_one(self, id_num: int) -> CategoryData | None:
+    """Get one category from database.
+
+    Args:
+      id_num (int):         unique id for the category.
+
+    Returns:
+      CategoryData (dict):  with data from single category
+      None:                 if no entry found with given id
+
+    Raises:
+      Exception:            in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      cur.execute("SELECT id AS category_id, category, description FROM category WHERE id = ?", (id_num, ))
+
+      return self.CATEGORY_MAPPER.map_one(cur.fetchone())
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      self._disconnect()
+
+  def get_all(self) -> list[CategoryData]:
+    """Get all categories, in the order of their ids.
+
+    Returns:
+      list[CategoryData]: The list of categories.
+
+    Raises:
+      Exception:          in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      rows = cur.execute("SELECT id AS category_id, category, description FROM category ORDER BY id")
+
+      return self.CATEGORY_MAPPER.map_all(rows)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      self._disconnect()
+
+  def get_topic_counts(self) -> dict[int, int]:
+    """Get the number of topics that are not deleted in every category, kept on the category rows by triggers.
+
+    Returns:
+      dict:       The number of topics by category id
+
+    Raises:
+      Exception:  in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+
+      return dict(cur.execute("SELECT id, topic_count FROM category"))
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      self._disconnect()
+
+  def get_many(self, ids: list[int]) -> list[CategoryData | None]:
+    """Get many categories in one query, the ids are passed as one JSON array.
+
+    Args:
+      ids (list):         unique ids for the categories.
+
+    Returns:
+      list:               the category for every id in the same order, None for ids not found
+
+    Raises:
+      Exception:          in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      rows = cur.execute(
+        "SELECT id AS category_id, category, description FROM category WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(list(set(ids))), )
+      )
+      by_id = {category["category_id"]: category for category in self.CATEGORY_MAPPER.map_all(rows)}
+
+      return [by_id.get(id_num) for id_num in ids]
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      self._disconnect()
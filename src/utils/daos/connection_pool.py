@@ -0,0 +1,272 @@
+"""
+ConnectionPool keeps sqlite connections open between DAO calls.
+
+Opening a connection means opening the file, parsing the schema and starting with an empty page cache,
+so the DAOs check out an already open connection instead and give it back when they are done.
+
+Every new connection gets the pragmas of a tuning profile, chosen with SQLITE_PROFILE:
+  default       sqlite defaults, rollback journal and synchronous=FULL
+  read-heavy    WAL so readers never wait for the writer, a large page cache and memory mapped reads
+  write-heavy   WAL with synchronous=NORMAL and less frequent checkpoints, a long busy timeout for writers
+  durable       WAL with synchronous=FULL, every commit is on disk before it returns
+
+A read-only pool opens its connections with mode=ro and query_only, they never take a write lock.
+"""
+from __future__ import annotations
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+from urllib.parse import quote
+
+POOL_SIZE = int(os.environ.get("SQLITE_POOL_SIZE", "5"))
+POOL_TIMEOUT = float(os.environ.get("SQLITE_POOL_TIMEOUT", "10"))
+HEALTH_CHECK_INTERVAL = float(os.environ.get("SQLITE_POOL_HEALTH_CHECK", "30"))
+PROFILE = os.environ.get("SQLITE_PROFILE", "default")
+
+# Pragmas set on every new connection, in order. journal_mode goes first, it needs no open transaction.
+PROFILES: dict[str, dict[str, str | int]] = {
+  "default": {},
+  "read-heavy": {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -65536,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+  },
+  "write-heavy": {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 15000,
+    "cache_size": -32768,
+    "wal_autocheckpoint": 4000,
+    "temp_store": "MEMORY",
+  },
+  "durable": {
+    "journal_mode": "WAL",
+    "synchronous": "FULL",
+    "busy_timeout": 10000,
+    "cache_size": -16384,
+  },
+}
+
+
+class PooledConnection:
+  """
+  Wrapper around a checked out sqlite connection.
+
+  Works as a normal sqlite3.Connection, except that close() gives the connection back to the pool.
+  """
+
+  def __init__(self, pool: ConnectionPool, connection: sqlite3.Connection):
+    """Initializes the PooledConnection.
+
+    Args:
+      pool (ConnectionPool):          The pool the connection belongs to.
+      connection (sqlite3.Connection): The checked out connection.
+    """
+    self._pool = pool
+    self._connection = connection
+    self._pid = os.getpid()
+
+  def __getattr__(self, name: str) -> Any:
+    return getattr(self._connection, name)
+
+  def cursor(self) -> sqlite3.Cursor:
+    """Get a cursor for the checked out connection."""
+    return self._connection.cursor()
+
+  def commit(self) -> None:
+    """Commit the current transaction."""
+    self._connection.commit()
+
+  def rollback(self) -> None:
+    """Roll back the current transaction."""
+    self._connection.rollback()
+
+  def close(self) -> None:
+    """Give the connection back to the pool, safe to call more than once."""
+    if self._connection is not None:
+      self._pool.release(self._connection, self._pid)
+
+    self._connection = None
+
+
+class ConnectionPool:
+  """
+  A pool of sqlite connections to one database file.
+
+  Each checkout is owned by the calling thread until it is closed, connections are opened
+  with check_same_thread=False so they can be handed to another thread on the next checkout.
+  """
+
+  def __init__(
+    self,
+    db_path: str,
+    size: int = POOL_SIZE,
+    timeout: float = POOL_TIMEOUT,
+    health_check_interval: float = HEALTH_CHECK_INTERVAL,
+    profile: str = PROFILE,
+    read_only: bool = False
+  ):
+    """Initializes the ConnectionPool.
+
+    Args:
+      db_path (str):                  Path to the sqlite database.
+      size (int):                     Max number of open connections, 0 disables pooling.
+      timeout (float):                Seconds to wait for a free connection.
+      health_check_interval (float):  Idle seconds before a connection is checked with SELECT 1.
+      profile (str):                  Name of the tuning profile in PROFILES for new connections.
+      read_only (bool):               True to open read-only connections.
+
+    Raises:
+      ValueError:                     If there is no profile with that name.
+    """
+    if profile not in PROFILES:
+      raise ValueError(f"Unknown sqlite profile {profile!r}, use one of {', '.join(PROFILES)}.")
+
+    self._db_path = db_path
+    self._read_only = read_only
+    self._pragmas = dict(PROFILES[profile])
+
+    if read_only:
+      # The journal mode is kept in the file, only a writer can change it.
+      self._pragmas.pop("journal_mode", None)
+      self._pragmas["query_only"] = "ON"
+    self._size = size
+    self._timeout = timeout
+    self._health_check_interval = health_check_interval
+    self._abandoned: list[sqlite3.Connection] = []
+    self._reset()
+
+  @property
+  def db_path(self) -> str:
+    """Path to the database of the pool."""
+    return self._db_path
+
+  @property
+  def read_only(self) -> bool:
+    """True if the connections of the pool are read-only."""
+    return self._read_only
+
+  def _reset(self) -> None:
+    """Set up empty pool state for the current process."""
+    self._pid = os.getpid()
+    self._lock = threading.Lock()
+    self._idle: list[tuple[sqlite3.Connection, float]] = []
+    self._slots = threading.BoundedSemaphore(self._size) if self._size > 0 else None
+
+  def _check_fork(self) -> None:
+    """Drop connections inherited from a parent process.
+
+    They are kept referenced, not closed, so the child never finalizes handles the parent still uses.
+    """
+    if self._pid != os.getpid():
+      self._abandoned.extend(connection for connection, _ in self._idle)
+      self._reset()
+
+  def connect(self) -> sqlite3.Connection:
+    """Open a new connection to the database with the pragmas of the profile, not counted by the pool."""
+    if self._read_only:
+      connection = sqlite3.connect(f"file:{quote(self._db_path)}?mode=ro", uri=True, check_same_thread=False)
+    else:
+      connection = sqlite3.connect(self._db_path, check_same_thread=False)
+
+    try:
+      for name, value in self._pragmas.items():
+        connection.execute(f"PRAGMA {name} = {value}")
+    except sqlite3.Error:
+      connection.close()
+      raise
+
+    return connection
+
+  def _is_healthy(self, connection: sqlite3.Connection, idle_since: float) -> bool:
+    """Check that an idle connection still works, only done after health_check_interval."""
+    if time.monotonic() - idle_since < self._health_check_interval:
+      return True
+
+    try:
+      connection.execute("SELECT 1").fetchone()
+      return True
+    except sqlite3.Error:
+      return False
+
+  def acquire(self) -> PooledConnection:
+    """Check out a connection from the pool.
+
+    Returns:
+      PooledConnection:         Connection to use, close it to give it back.
+
+    Raises:
+      sqlite3.OperationalError: If no connection is free within the timeout.
+    """
+    self._check_fork()
+
+    if self._slots is None:
+      return PooledConnection(self, self.connect())
+
+    if not self._slots.acquire(timeout=self._timeout):
+      raise sqlite3.OperationalError(f"No free connection in pool within {self._timeout} seconds.")
+
+    try:
+      while True:
+        with self._lock:
+          if not self._idle:
+            break
+          connection, idle_since = self._idle.pop()
+
+        if self._is_healthy(connection, idle_since):
+          return PooledConnection(self, connection)
+
+        self._close_quietly(connection)
+
+      return PooledConnection(self, self.connect())
+    except Exception:
+      self._slots.release()
+      raise
+
+  def release(self, connection: sqlite3.Connection, checkout_pid: int) -> None:
+    """Give a connection back to the pool, any open transaction is rolled back.
+
+    Args:
+      connection (sqlite3.Connection): The connection to give back.
+      checkout_pid (int):              Id of the process that checked out the connection.
+    """
+    if checkout_pid != os.getpid() or checkout_pid != self._pid:
+      # Checked out before a fork, the slot belongs to the parent's pool state.
+      self._abandoned.append(connection)
+      return
+
+    if self._slots is None:
+      self._close_quietly(connection)
+      return
+
+    try:
+      if connection.in_transaction:
+        connection.rollback()
+
+      with self._lock:
+        self._idle.append((connection, time.monotonic()))
+    except sqlite3.Error:
+      self._close_quietly(connection)
+    finally:
+      self._slots.release()
+
+  def close(self) -> None:
+    """Close all idle connections."""
+    with self._lock:
+      idle, self._idle = self._idle, []
+
+    for connection, _ in idle:
+      self._close_quietly(connection)
+
+  @staticmethod
+  def _close_quietly(connection: sqlite3.Connection) -> None:
+    """Close a connection, ignoring errors from an already broken one."""
+    try:
+      connection.close()
+    except sqlite3.Error:
+      pass
@@ -1,9 +1,15 @@
 """
 PostDAO is used for access posts.
 """
-from src.utils.daos.basedao import DAO 
+import json
+import sqlite3
+from src.utils.daos.basedao import DAO, Ownership
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.writer import Writer
+from src.utils.daos.row_mapper import RowMapper, USER_COLUMNS
 from typing import Any
 from src.static.types import PostData
+from src.utils.cache import PageSummary
 from src.utils.print_colors import ColorPrinter
 
 printer = ColorPrinter()
@@ -11,6 +17,7 @@ printer = ColorPrinter()
 
 class PostDAO(DAO):
   """PostDAO for accessing posts."""
+  PAGE_SIZE = 10
   GET_ONE_QUERY = """
     SELECT 
       post.id AS post_id,
@@ -29,9 +36,17 @@ class PostDAO(DAO):
     WHERE post.id = ?
     AND post.deleted IS NULL
     """
-
-  def __init__(self, table_name: str):
-    super().__init__(table_name)
+  POST_MAPPER = RowMapper(("post_id", "topic_id", "created", "last_edited", "title", "body"), author=USER_COLUMNS)
+  NEW_POST_MAPPER = RowMapper(("post_id", "author", "topic_id", "created", "last_edited", "title", "body"))
+
+  def __init__(
+    self,
+    table_name: str,
+    pool: ConnectionPool | None = None,
+    writer: Writer | None = None,
+    read_pool: ConnectionPool | None = None
+  ):
+    super().__init__(table_name, pool, writer, read_pool)
 
   def get_post_and_users_with_pagination(self, topic_id: int, pagnation: int = 0) -> list[dict[str, Any]]:
     """Gets post for a certain topic, with pagination for the posts.
@@ -43,12 +58,80 @@ class PostDAO(DAO):
     Returns:
       list:             with posts as dictionaries
 
+    Raises:
+      Exception:    in case of any error
+    """
+    return self._get_posts_with_users("""
+      WHERE post.topic_id = ? AND post.deleted IS NULL
+      ORDER BY post.created ASC, post.id ASC
+      LIMIT ?
+      OFFSET ?
+    """, (topic_id, self.PAGE_SIZE, pagnation * self.PAGE_SIZE))
+
+  def get_post_and_users_after(self, topic_id: int, after: tuple[str, int] | None = None) -> list[dict[str, Any]]:
+    """Gets a page of posts for a certain topic, starting after a given post (keyset pagination).
+
+    Unlike OFFSET the earlier pages are never read, so every page costs the same.
+
+    Args:
+      topic_id(int):    the id for the topic
+      after(tuple):     (created, post_id) of the last post on the previous page, None for first page
+
+    Returns:
+      list:             with posts as dictionaries
+
+    Raises:
+      Exception:    in case of any error
+    """
+    if after is None:
+      return self.get_post_and_users_with_pagination(topic_id)
+
+    return self._get_posts_with_users("""
+      WHERE post.topic_id = ? AND post.deleted IS NULL
+      AND (post.created, post.id) > (?, ?)
+      ORDER BY post.created ASC, post.id ASC
+      LIMIT ?
+    """, (topic_id, *after, self.PAGE_SIZE))
+
+  def get_user_posts(self, user_id: int, limit: int, after: tuple[str, int] | None = None) -> list[dict[str, Any]]:
+    """Gets the latest posts of a user, from the index on (author, deleted, created) (keyset pagination).
+
+    Args:
+      user_id(int):     the id of the author
+      limit(int):       number of posts
+      after(tuple):     (created, post_id) of the last post on the previous page, None for first page
+
+    Returns:
+      list:             with posts as dictionaries, newest first
+
+    Raises:
+      Exception:    in case of any error
+    """
+    after_filter, after_params = ("", ()) if after is None else ("AND (post.created, post.id) < (?, ?)", after)
+
+    return self._get_posts_with_users(f"""
+      WHERE post.author = ? AND post.deleted IS NULL
+      {after_filter}
+      ORDER BY post.created DESC, post.id DESC
+      LIMIT ?
+    """, (user_id, *after_params, limit))
+
+  def _get_posts_with_users(self, where: str, params: tuple) -> list[dict[str, Any]]:
+    """Gets posts with their authors, filtered and ordered by the given clauses.
+
+    Args:
+      where(str):       WHERE, ORDER BY and LIMIT clauses for the query
+      params(tuple):    parameters for the clauses
+
+    Returns:
+      list:             with posts as dictionaries
+
     Raises:
       Exception:    in case of any error
     """
     try:
-      cur = self._connect_get_cursor()
-      rows = cur.execute("""
+      cur = self._connect_get_cursor(read_only=True)
+      rows = cur.execute(f"""
         SELECT 
           post.id AS post_id,
           post.topic_id,
@@ -63,26 +146,10 @@ class PostDAO(DAO):
           user.avatar
         FROM post
         JOIN user ON post.author = user.id
-        WHERE post.topic_id = ? AND post.deleted IS NULL
-        ORDER BY post.created ASC
-        LIMIT 10
-        OFFSET ?
-      """, (topic_id, pagnation * 10))
-      column_names = [description[0] for description in cur.description]
-
-      posts_data = [dict(zip(column_names, row)) for row in rows]
-
-      for post in posts_data:
-        author = {
-            "user_id": post.pop("user_id"),
-            "username": post.pop("username"),
-            "role": post.pop("role"),
-            "signature": post.pop("signature"),
-            "avatar": post.pop("avatar")
-        }
-        post["author"] = author
-
-      return posts_data
+        {where}
+      """, params)
+
+      return self.POST_MAPPER.map_all(rows)
     except Exception as err:
       printer.print_fail(err)
       raise err
@@ -105,32 +172,65 @@ class PostDAO(DAO):
     conn = None
 
     try:
-      conn, cur = self._get_connection_and_cursor()
+      conn, cur = self._get_connection_and_cursor(read_only=True)
       cur.execute(self.GET_ONE_QUERY, (id_num, ))
-      result = cur.fetchone()
 
-      if result is None:
-        return result
+      return self.POST_MAPPER.map_one(cur.fetchone())
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      if conn is not None:
+        conn.close()
 
-      column_names = [description[0] for description in cur.description]
-      post_data = dict(zip(column_names, result))
+  def get_version(self, id_num: int) -> tuple[int, str] | None:
+    """Get the version of a post for conditional GET, the version of its topic that changes with every post in it.
+
+    Args:
+      id_num (int):     unique id for the post.
+
+    Returns:
+      tuple:            version and time of the latest change of the topic, None if no post found with given id
 
-      author = {
-        "user_id": post_data.pop("user_id"),
-        "username": post_data.pop("username"),
-        "role": post_data.pop("role"),
-        "signature": post_data.pop("signature"),
-        "avatar": post_data.pop("avatar")
-      }
-      post_data["author"] = author
+    Raises:
+      Exception:        in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      cur.execute("""
+        SELECT topic.version, COALESCE(topic.changed, topic.created)
+        FROM post
+        JOIN topic ON post.topic_id = topic.id
+        WHERE post.id = ?
+        AND post.deleted IS NULL
+      """, (id_num, ))
 
-      return PostData(**post_data)
+      return cur.fetchone()
     except Exception as err:
       printer.print_fail(err)
       raise err
     finally:
-      if conn is not None:
-        conn.close()
+      self._disconnect()
+
+  def get_many(self, ids: list[int]) -> list[PostData | None]:
+    """Get many posts with their authors in one query, the ids are passed as one JSON array.
+
+    Args:
+      ids (list):       unique ids for the posts.
+
+    Returns:
+      list:             the post for every id in the same order, None for ids not found or deleted
+
+    Raises:
+      Exception:        in case of any error
+    """
+    posts = self._get_posts_with_users("""
+      JOIN json_each(?) AS ids ON ids.value = post.id
+      WHERE post.deleted IS NULL
+    """, (json.dumps(list(set(ids))), ))
+    by_id = {post["post_id"]: post for post in posts}
+
+    return [by_id.get(id_num) for id_num in ids]
 
   def create(self, data: dict[str, str | int]) -> PostData:
     """Create (insert) a new post into database.
@@ -144,76 +244,449 @@ class PostDAO(DAO):
     Raises:
       Exception:        in case of any error like unique entry already exist.
     """
-    conn = None
-
-    try:
-      conn, cur = self._get_connection_and_cursor()
+    def insert(cur: sqlite3.Cursor) -> PostData:
       cur.execute("""
         INSERT INTO post
           (author, topic_id, title, body)
         VALUES
           (?, ?, ?, ?)          
+        RETURNING id, created
       """,
       (data["author"], data["topic_id"],data.get("title", None), data["body"]))
-      conn.commit()
+      post_id, created = cur.fetchone()
+      self._update_page_index(cur, data["topic_id"], created, post_id)
+      cur.execute(self.GET_ONE_QUERY, (post_id, ))
+
+      return self.POST_MAPPER(cur.fetchone())
+
+    try:
+      return self._write(insert)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def create_many(self, data: list[dict[str, str | int]]) -> list[PostData]:
+    """Create (insert) many posts in one transaction, without reading them back.
+
+    Args:
+      data (list):      The data for every new post.
+
+    Returns:
+      list:             The new posts with the author id instead of userdata, in the same order as data.
 
-      cur.execute(self.GET_ONE_QUERY, (cur.lastrowid, ))
+    Raises:
+      Exception:        in case of any error, then no post is created.
+    """
+    def insert(cur: sqlite3.Cursor) -> list[PostData]:
+      rows = self._insert_many(
+        cur,
+        "INSERT INTO post (author, topic_id, title, body)",
+        [(item["author"], item["topic_id"], item.get("title", None), item["body"]) for item in data],
+        "RETURNING id AS post_id, author, topic_id, created, last_edited, title, body"
+      )
+
+      first_new_posts = {}
+
+      for post_id, _, topic_id, created, *_ in rows:
+        first_new_posts.setdefault(topic_id, (created, post_id))
+
+      for topic_id, (created, post_id) in first_new_posts.items():
+        self._update_page_index(cur, topic_id, created, post_id)
+
+      return self.NEW_POST_MAPPER.map_all(rows)
+
+    try:
+      return self._write(insert)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def delete(self, id_num: int) -> bool:
+    """Delete post from database (soft delete), the page index of the topic is updated.
+
+    Args:
+      id_num (int): unique id for the post to delete
+
+    Returns:
+      boolean:      True if item deleted, False otherwise
+
+    Raises:
+      Exception:    In case of any error
+    """
+    def delete(cur: sqlite3.Cursor) -> bool:
+      cur.execute("""
+        UPDATE post SET deleted = CURRENT_TIMESTAMP
+        WHERE id = ? AND deleted IS NULL
+        RETURNING topic_id, created
+      """, (id_num, ))
       result = cur.fetchone()
-      column_names = [description[0] for description in cur.description]
-
-      post_data = dict(zip(column_names, result))
-      author = {
-        "user_id": post_data.pop("user_id"),
-        "username": post_data.pop("username"),
-        "role": post_data.pop("role"),
-        "signature": post_data.pop("signature"),
-        "avatar": post_data.pop("avatar")
-      }
-      post_data["author"] = author
-
-      return PostData(**post_data)
+
+      if result is not None:
+        self._update_page_index(cur, result[0], result[1], id_num)
+
+      return result is not None
+
+    try:
+      return self._write(delete)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def update_owned(self, id_num: int, author: int, data: dict[str, Any]) -> tuple[Ownership, int | None]:
+    """Update a post in one statement, if it is not deleted and written by the given author.
+
+    Args:
+      id_num (int):     unique id for the post to update
+      author (int):     id of the user editing, the post is updated only if it is the author
+      data (dict):      columns and new values, not empty
+
+    Returns:
+      Ownership, int:   the outcome and the id of the topic of the post if written, else None
+
+    Raises:
+      Exception:        In case of any error
+    """
+    def update(cur: sqlite3.Cursor) -> tuple[Ownership, int | None]:
+      outcome, row = self._write_owned(
+        cur, ", ".join(f"{column} = ?" for column in data), tuple(data.values()), id_num, "author", author, "topic_id"
+      )
+
+      return outcome, None if row is None else row[0]
+
+    try:
+      return self._write(update)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def delete_owned(self, id_num: int, author: int) -> tuple[Ownership, dict[str, Any] | None]:
+    """Delete a post (soft delete) in one statement, if it is not deleted and written by the given author.
+    The page index of the topic is updated in the same transaction.
+
+    Args:
+      id_num (int):     unique id for the post to delete
+      author (int):     id of the user deleting, the post is deleted only if it is the author
+
+    Returns:
+      Ownership, dict:  the outcome and post_id, topic_id and created of the post if deleted, else None
+
+    Raises:
+      Exception:        In case of any error
+    """
+    def delete(cur: sqlite3.Cursor) -> tuple[Ownership, dict[str, Any] | None]:
+      outcome, row = self._write_owned(
+        cur, "deleted = CURRENT_TIMESTAMP", (), id_num, "author", author, "topic_id, created"
+      )
+
+      if row is None:
+        return outcome, None
+
+      self._update_page_index(cur, row[0], row[1], id_num)
+
+      return outcome, {"post_id": id_num, "topic_id": row[0], "created": row[1]}
+
+    try:
+      return self._write(delete)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def get_page(self, topic_id: int, page: int) -> tuple[list[dict[str, Any]], int]:
+    """Gets a page of posts for a certain topic with one seek in the page index, no matter how deep the page is.
+
+    Args:
+      topic_id(int):    the id for the topic
+      page(int):        page number, 0 = first 10
+
+    Returns:
+      list, int:        posts as dictionaries, total number of pages
+
+    Raises:
+      Exception:    in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      boundary = cur.execute(
+        "SELECT created, post_id FROM post_page WHERE topic_id = ? AND page = ?", (topic_id, page)
+      ).fetchone()
+      pages = self._page_count(cur, topic_id)
     except Exception as err:
       printer.print_fail(err)
       raise err
     finally:
-      if conn is not None:
-        conn.close()
-  
-  def get_posts_and_topic(self, topic_id: int, pagnation: int = 0) -> dict:
-    """ Gets topic and posts for that topic.
+      self._disconnect()
+
+    if boundary is not None:
+      posts_data = self._get_posts_with_users("""
+        WHERE post.topic_id = ? AND post.deleted IS NULL
+        AND (post.created, post.id) >= (?, ?)
+        ORDER BY post.created ASC, post.id ASC
+        LIMIT ?
+      """, (topic_id, *boundary, self.PAGE_SIZE))
+    elif page < pages:
+      # Page index not built for the topic yet.
+      posts_data = self.get_post_and_users_with_pagination(topic_id, page)
+    else:
+      posts_data = []
+
+    return posts_data, pages
+
+  def get_page_count(self, topic_id: int) -> int:
+    """Gets the number of pages of posts in a topic.
 
     Args:
       topic_id(int):    the id for the topic
-      pagnationn(int):  pages in, 0 = first 10
 
     Returns:
-      dict:             with data in keys topic and posts
+      int:              number of pages
+
+    Raises:
+      Exception:    in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      return self._page_count(cur, topic_id)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      self._disconnect()
+
+  def get_topic_activity(self, topic_id: int) -> dict[str, Any] | None:
+    """Gets the activity of a topic, kept on the topic by the triggers on post.
+
+    Args:
+      topic_id(int):    the id for the topic
+
+    Returns:
+      dict:             post_count, last_post_id, last_post_at and version, None if no topic found
 
     Raises:
       Exception:    in case of any error
     """
     try:
-      cur = self._connect_get_cursor()
+      cur = self._connect_get_cursor(read_only=True)
+      row = cur.execute(
+        "SELECT post_count, last_post_id, last_post_at, version FROM topic WHERE id = ?", (topic_id, )
+      ).fetchone()
 
-      rows = cur.execute("SELECT * FROM topic WHERE id = ?", (topic_id, ))
-      column_names = [description[0] for description in cur.description]
+      return None if row is None else dict(zip(("post_count", "last_post_id", "last_post_at", "version"), row))
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      self._disconnect()
 
-      topic = [dict(zip(column_names, row)) for row in rows]
+  def rebuild_page_index(self, topic_id: int | None = None) -> None:
+    """Rebuild the page index from scratch, for posts written without the PostDAO.
 
-      rows = cur.execute("""
-        SELECT * FROM post
-        WHERE topic_id = ? AND deleted IS NULL
-        ORDER BY created ASC
-        LIMIT 10
-        OFFSET ?
-      """, (topic_id, pagnation * 10))
-      column_names = [description[0] for description in cur.description]
+    Args:
+      topic_id(int):    the id for the topic, None for all topics
+
+    Raises:
+      Exception:    in case of any error
+    """
+    try:
+      self._write(lambda cur: self.build_page_index(cur, topic_id))
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
 
-      posts = [dict(zip(column_names, row)) for row in rows]
+  @classmethod
+  def build_page_index(cls, cur: sqlite3.Cursor, topic_id: int | None = None) -> None:
+    """Rebuild the page index on a cursor, in the transaction of the caller. Used by rebuild_page_index,
+    db/load.py and db/migrate.py.
 
-      return {"topic": topic, "posts": posts}
+    Args:
+      cur (Cursor):   cursor of a connection to the database
+      topic_id(int):  the id for the topic, None for all topics
+    """
+    topic_filter = "" if topic_id is None else "AND topic_id = :topic_id"
+
+    cur.execute(f"DELETE FROM post_page WHERE 1 {topic_filter}", {"topic_id": topic_id})
+    cur.execute(f"""
+      INSERT INTO post_page (topic_id, page, created, post_id)
+      SELECT topic_id, (row_num - 1) / :page_size, created, id FROM (
+        SELECT topic_id, created, id,
+          ROW_NUMBER() OVER (PARTITION BY topic_id ORDER BY created, id) AS row_num
+        FROM post
+        WHERE deleted IS NULL {topic_filter}
+      )
+      WHERE (row_num - 1) % :page_size = 0
+    """, {"topic_id": topic_id, "page_size": cls.PAGE_SIZE})
+
+  def _page_count(self, cur: sqlite3.Cursor, topic_id: int) -> int:
+    """Number of pages in a topic from the page index, counted from the posts if the index is not built."""
+    last_page = cur.execute("SELECT MAX(page) FROM post_page WHERE topic_id = ?", (topic_id, )).fetchone()[0]
+
+    if last_page is not None:
+      return last_page + 1
+
+    posts = cur.execute(
+      "SELECT COUNT(*) FROM post WHERE topic_id = ? AND deleted IS NULL", (topic_id, )
+    ).fetchone()[0]
+
+    return -(-posts // self.PAGE_SIZE)
+
+  def _update_page_index(self, cur: sqlite3.Cursor, topic_id: int, created: str, post_id: int) -> None:
+    """Update the page index after a post is created or deleted.
+
+    Only the page holding the post and the pages after it are rebuilt, a new post at the end of
+    a topic touches the last page only. A topic without index is indexed from the first page.
+
+    Args:
+      cur (Cursor):     cursor in the transaction that changed the post
+      topic_id (int):   the id for the topic of the post
+      created (str):    created timestamp of the post
+      post_id (int):    the id of the post
+    """
+    page, start_created, start_id = cur.execute("""
+      SELECT page, created, post_id FROM post_page
+      WHERE topic_id = ? AND (created, post_id) <= (?, ?)
+      ORDER BY page DESC
+      LIMIT 1
+    """, (topic_id, created, post_id)).fetchone() or (0, None, None)
+
+    start_filter = "" if start_created is None else "AND (created, id) >= (:created, :post_id)"
+
+    cur.execute("DELETE FROM post_page WHERE topic_id = ? AND page >= ?", (topic_id, page))
+    cur.execute(f"""
+      INSERT INTO post_page (topic_id, page, created, post_id)
+      SELECT topic_id, :page + (row_num - 1) / :page_size, created, id FROM (
+        SELECT topic_id, created, id, ROW_NUMBER() OVER (ORDER BY created, id) AS row_num
+        FROM post
+        WHERE topic_id = :topic_id AND deleted IS NULL {start_filter}
+      )
+      WHERE (row_num - 1) % :page_size = 0
+    """, {
+      "topic_id": topic_id,
+      "page": page,
+      "page_size": self.PAGE_SIZE,
+      "created": start_created,
+      "post_id": start_id
+    })
+
+  def get_page_json(self, topic_id: int, page: int) -> tuple[str, PageSummary] | None:
+    """Gets a page of a topic as one JSON document built by SQLite, with one seek in the page index.
+
+    The document is {"pages", "posts", "topic"}, JSON equivalent to the topic, posts and pages read by
+    TopicDAO.get_one and get_page, with the keys sorted like jsonify sorts them. Unlike jsonify, SQLite writes
+    other characters than ASCII as UTF-8 instead of escaping them. The fields needed to invalidate the page in a
+    cache are read with it, so the document is not decoded.
+
+    Args:
+      topic_id(int):    the id for the topic
+      page(int):        page number, 0 = first 10
+
+    Returns:
+      str, PageSummary: the document and the summary of the page
+      None:             if no topic found with given id
+
+    Raises:
+      Exception:    in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      row = cur.execute("""
+        WITH page_post AS MATERIALIZED (
+          SELECT
+            post.created,
+            post.id,
+            post.author,
+            json_object(
+              'author', json_object(
+                'avatar', user.avatar,
+                'role', user.role,
+                'signature', user.signature,
+                'user_id', user.id,
+                'username', user.username
+              ),
+              'body', post.body,
+              'created', post.created,
+              'last_edited', post.last_edited,
+              'post_id', post.id,
+              'title', post.title,
+              'topic_id', post.topic_id
+            ) AS document
+          FROM post
+          JOIN user ON post.author = user.id
+          WHERE post.topic_id = :topic_id AND post.deleted IS NULL
+          AND (post.created, post.id) >= (
+            SELECT created, post_id FROM (
+              SELECT 0 AS found, created, post_id FROM post_page WHERE topic_id = :topic_id AND page = :page
+              UNION ALL
+              SELECT 1, '', 0
+            )
+            ORDER BY found
+            LIMIT 1
+          )
+          ORDER BY post.created ASC, post.id ASC
+          LIMIT :page_size
+          -- page index not built for the topic yet
+          OFFSET CASE WHEN EXISTS (SELECT 1 FROM post_page WHERE topic_id = :topic_id AND page = :page)
+            THEN 0 ELSE :page * :page_size END
+        ),
+        page_count AS (
+          SELECT COALESCE(
+            (SELECT MAX(page) + 1 FROM post_page WHERE topic_id = :topic_id),
+            (SELECT (COUNT(*) + :page_size - 1) / :page_size FROM post WHERE topic_id = :topic_id AND deleted IS NULL)
+          ) AS pages
+        )
+        SELECT
+          json_object(
+            'pages', (SELECT pages FROM page_count),
+            'posts', (
+              SELECT json_group_array(json(document)) FROM (SELECT document FROM page_post ORDER BY created, id)
+            ),
+            'topic', json_object(
+              'category', topic.category,
+              'created', topic.created,
+              'created_by', json_object(
+                'avatar', user.avatar,
+                'role', user.role,
+                'signature', user.signature,
+                'user_id', user.id,
+                'username', user.username
+              ),
+              'deleted', topic.deleted,
+              'disabled', topic.disabled,
+              'last_edited', topic.last_edited,
+              'last_post_at', topic.last_post_at,
+              'last_post_id', topic.last_post_id,
+              'post_count', topic.post_count,
+              'title', topic.title,
+              'topic_id', topic.id,
+              'version', topic.version
+            )
+          ),
+          (SELECT pages FROM page_count),
+          (SELECT COUNT(*) FROM page_post),
+          (SELECT created FROM page_post ORDER BY created DESC, id DESC LIMIT 1),
+          (SELECT id FROM page_post ORDER BY created DESC, id DESC LIMIT 1),
+          (SELECT group_concat(id) FROM page_post),
+          (SELECT group_concat(author) FROM page_post),
+          topic.created_by,
+          topic.version
+        FROM topic
+        JOIN user ON topic.created_by = user.id
+        WHERE topic.id = :topic_id
+        AND topic.deleted IS NULL
+      """, {"topic_id": topic_id, "page": page, "page_size": self.PAGE_SIZE}).fetchone()
     except Exception as err:
       printer.print_fail(err)
       raise err
     finally:
       self._disconnect()
+
+    if row is None:
+      return None
+
+    document, pages, count, last_created, last_id, post_ids, author_ids, created_by, version = row
+
+    return document, PageSummary(
+      pages=pages,
+      next_after=(last_created, last_id) if count == self.PAGE_SIZE else None,
+      post_ids=frozenset(int(id_str) for id_str in (post_ids or "").split(",") if id_str),
+      user_ids=frozenset([created_by, *(int(id_str) for id_str in (author_ids or "").split(",") if id_str)]),
+      version=version
+    )
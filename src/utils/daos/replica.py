@@ -0,0 +1,79 @@
+"""
+Replica keeps a copy of the database for read-only workers, refreshed with the sqlite backup API.
+
+Reads on the replica never take a lock on the primary database, they see the data as of the last refresh,
+at most SQLITE_REPLICA_INTERVAL seconds old. Set SQLITE_REPLICA_PATH to use a replica for GET requests.
+"""
+from __future__ import annotations
+import os
+import sqlite3
+import threading
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.print_colors import ColorPrinter
+
+REPLICA_PATH = os.environ.get("SQLITE_REPLICA_PATH", "")
+REPLICA_INTERVAL = float(os.environ.get("SQLITE_REPLICA_INTERVAL", "5"))
+
+printer = ColorPrinter()
+
+
+class Replica:
+  """
+  A copy of the database, refreshed on a background thread.
+  """
+
+  def __init__(self, source: ConnectionPool, replica_path: str, interval: float = REPLICA_INTERVAL):
+    """Initializes the Replica.
+
+    Args:
+      source (ConnectionPool):  Pool for the database to copy, a read-only pool is enough.
+      replica_path (str):       Path to the copy.
+      interval (float):         Seconds between refreshes.
+    """
+    self._source = source
+    self._replica_path = replica_path
+    self._interval = interval
+    self._stop = threading.Event()
+    self._thread: threading.Thread | None = None
+
+  @property
+  def replica_path(self) -> str:
+    """Path to the copy."""
+    return self._replica_path
+
+  def refresh(self) -> None:
+    """Copy the database to the replica, readers of the replica wait while the copy is written."""
+    source = self._source.connect()
+    replica = sqlite3.connect(self._replica_path, timeout=30)
+
+    try:
+      source.backup(replica)
+    finally:
+      replica.close()
+      source.close()
+
+  def start(self) -> None:
+    """Refresh the replica now and then every interval on a background thread."""
+    self.refresh()
+
+    if self._thread is None:
+      self._stop.clear()
+      self._thread = threading.Thread(target=self._run, name="sqlite-replica", daemon=True)
+      self._thread.start()
+
+  def close(self) -> None:
+    """Stop refreshing."""
+    self._stop.set()
+
+    if self._thread is not None:
+      self._thread.join()
+
+    self._thread = None
+
+  def _run(self) -> None:
+    """Refresh until stopped, a failed refresh is retried on the next interval."""
+    while not self._stop.wait(self._interval):
+      try:
+        self.refresh()
+      except sqlite3.Error as err:
+        printer.print_fail(err)
@@ -0,0 +1,85 @@
+"""
+RowMapper turns rows from a query into dictionaries, with some columns nested in a dictionary of their own.
+
+The keys and the position of every nested dictionary in the row are worked out once per query, so mapping a
+row zips the tuple with the keys, with no column names from cur.description and no intermediate dicts.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Iterable, Sequence
+
+USER_COLUMNS = ("user_id", "username", "role", "signature", "avatar")
+
+
+class RowMapper:
+  """
+  Maps row tuples to dictionaries.
+
+  The row is expected to hold the columns first and then the columns of every nested dictionary,
+  in the order they are given.
+  """
+
+  def __init__(self, columns: Sequence[str], **nested: Sequence[str]):
+    """Initializes the RowMapper.
+
+    Args:
+      columns (Sequence[str]):  Keys for the first columns of the row.
+      nested (Sequence[str]):   Keys for the following columns, nested under the keyword name.
+    """
+    self._columns = tuple(columns)
+    self._nested = {key: tuple(keys) for key, keys in nested.items()}
+    self._map_row = self._build()
+
+  def _build(self) -> Callable[[Sequence[Any]], dict[str, Any]]:
+    """Build the function mapping a row, a closure over the keys and the start of every nested dictionary."""
+    columns = self._columns
+    nested = []
+    position = len(columns)
+
+    for nested_key, keys in self._nested.items():
+      nested.append((nested_key, keys, position))
+      position += len(keys)
+
+    if not nested:
+      return lambda row: dict(zip(columns, row))
+
+    def map_row(row: Sequence[Any]) -> dict[str, Any]:
+      mapped = dict(zip(columns, row))
+      for nested_key, keys, start in nested:
+        mapped[nested_key] = dict(zip(keys, row[start:]))
+      return mapped
+
+    return map_row
+
+  def __call__(self, row: Sequence[Any]) -> dict[str, Any]:
+    """Map one row.
+
+    Args:
+      row (Sequence):   The row from the cursor.
+
+    Returns:
+      dict:             The mapped row
+    """
+    return self._map_row(row)
+
+  def map_one(self, row: Sequence[Any] | None) -> dict[str, Any] | None:
+    """Map a row from fetchone, that can be None.
+
+    Args:
+      row (Sequence):   The row from the cursor, or None.
+
+    Returns:
+      dict:             The mapped row, None if row is None
+    """
+    return None if row is None else self._map_row(row)
+
+  def map_all(self, rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+    """Map all rows.
+
+    Args:
+      rows (Iterable):  The rows, like a cursor after execute.
+
+    Returns:
+      list:             The mapped rows
+    """
+    map_row = self._map_row
+    return [map_row(row) for row in rows]
@@ -0,0 +1,115 @@
+"""
+SearchDAO is used for full-text search in posts and topics.
+"""
+from __future__ import annotations
+from typing import Any
+from src.utils.daos.basedao import ConnectionDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.writer import Writer
+from src.utils.daos.row_mapper import RowMapper
+from src.utils.print_colors import ColorPrinter
+
+printer = ColorPrinter()
+
+# Marks around the matches in snippets, from the unicode private use area so they are never in the text.
+MATCH_START = "\ue000"
+MATCH_END = "\ue001"
+
+
+class SearchDAO(ConnectionDAO):
+  """
+  SearchDAO for searching the FTS5 tables post_search and topic_search, kept up to date by triggers.
+  """
+  PAGE_SIZE = 20
+  SNIPPET_TOKENS = 16
+  # bm25 weights of the columns, a match in a title counts twice as much as in a body.
+  TITLE_WEIGHT = 2.0
+  BODY_WEIGHT = 1.0
+  RESULT_MAPPER = RowMapper(("kind", "id", "score", "snippet", "topic_id", "post_id", "title", "created"))
+
+  def __init__(
+    self,
+    table_name: str,
+    pool: ConnectionPool | None = None,
+    writer: Writer | None = None,
+    read_pool: ConnectionPool | None = None
+  ):
+    super().__init__(table_name, pool, writer, read_pool)
+
+  def search(self, match: str, after: tuple[float, str, int] | None = None) -> list[dict[str, Any]]:
+    """Search posts and topics that are not deleted, best match first by bm25.
+
+    Args:
+      match (str):    FTS5 query.
+      after (tuple):  (score, kind, id) of the last result on the previous page, None for the first page.
+
+    Returns:
+      list:           PAGE_SIZE results as dictionaries, with kind "post" or "topic", the id of the post or topic,
+                      the bm25 score (lower is better), a snippet with the matches between MATCH_START
+                      and MATCH_END and the title of the topic
+
+    Raises:
+      Exception:      in case of any error, like a match with invalid FTS5 syntax
+    """
+    after_filter = "" if after is None else "AND (result.score, result.kind, result.id) > (:score, :kind, :id)"
+    score, kind, id_num = after or (None, None, None)
+
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      # Rank first, snippets are then made for the results on the page only instead of for every match.
+      results = self.RESULT_MAPPER.map_all(cur.execute(f"""
+        SELECT
+          result.kind,
+          result.id,
+          result.score,
+          NULL AS snippet,
+          topic.id AS topic_id,
+          post.id AS post_id,
+          topic.title,
+          COALESCE(post.created, topic.created) AS created
+        FROM (
+          SELECT 'post' AS kind, rowid AS id, bm25(post_search, :title_weight, :body_weight) AS score
+          FROM post_search
+          WHERE post_search MATCH :match
+          UNION ALL
+          SELECT 'topic', rowid, bm25(topic_search, :title_weight)
+          FROM topic_search
+          WHERE topic_search MATCH :match
+        ) AS result
+        LEFT JOIN post ON result.kind = 'post' AND post.id = result.id
+        JOIN topic ON topic.id = CASE result.kind WHEN 'post' THEN post.topic_id ELSE result.id END
+        WHERE topic.deleted IS NULL
+        AND (result.kind = 'topic' OR post.deleted IS NULL)
+        {after_filter}
+        ORDER BY result.score, result.kind, result.id
+        LIMIT :limit
+      """, {
+        "match": match,
+        "title_weight": self.TITLE_WEIGHT,
+        "body_weight": self.BODY_WEIGHT,
+        "score": score,
+        "kind": kind,
+        "id": id_num,
+        "limit": self.PAGE_SIZE
+      }))
+
+      snippets = {}
+      for kind, table, column in (("post", "post_search", -1), ("topic", "topic_search", 0)):
+        ids = [result["id"] for result in results if result["kind"] == kind]
+        if ids:
+          rows = cur.execute(f"""
+            SELECT rowid, snippet({table}, {column}, ?, ?, '…', ?)
+            FROM {table}
+            WHERE {table} MATCH ? AND rowid IN ({", ".join("?" * len(ids))})
+          """, (MATCH_START, MATCH_END, self.SNIPPET_TOKENS, match, *ids))
+          snippets.update({(kind, rowid): snippet for rowid, snippet in rows})
+
+      for result in results:
+        result["snippet"] = snippets.get((result["kind"], result["id"]))
+
+      return results
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      self._disconnect()
@@ -2,8 +2,13 @@
 TopicDAO is used for accessing users.
 """
 from __future__ import annotations
+import json
+import sqlite3
 from typing import Any
-from src.utils.daos.basedao import DAO
+from src.utils.daos.basedao import DAO, Ownership
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.writer import Writer
+from src.utils.daos.row_mapper import RowMapper, USER_COLUMNS
 from src.utils.print_colors import ColorPrinter
 from src.static.types import TopicData
 
@@ -21,6 +26,10 @@ class TopicDAO(DAO):
       topic.last_edited,
       topic.deleted,
       topic.disabled,
+      topic.post_count,
+      topic.last_post_id,
+      topic.last_post_at,
+      topic.version,
       user.id as user_id,
       user.username,
       user.role,
@@ -31,9 +40,21 @@ class TopicDAO(DAO):
     WHERE topic.id = ?
     AND topic.deleted IS NULL
   """
-
-  def __init__(self, table_name: str):
-    super().__init__(table_name)
+  TOPIC_COLUMNS = (
+    "topic_id", "title", "category", "created", "last_edited", "deleted", "disabled",
+    "post_count", "last_post_id", "last_post_at", "version"
+  )
+  TOPIC_MAPPER = RowMapper(TOPIC_COLUMNS, created_by=USER_COLUMNS)
+  NEW_TOPIC_MAPPER = RowMapper((*TOPIC_COLUMNS, "created_by"))
+
+  def __init__(
+    self,
+    table_name: str,
+    pool: ConnectionPool | None = None,
+    writer: Writer | None = None,
+    read_pool: ConnectionPool | None = None
+  ):
+    super().__init__(table_name, pool, writer, read_pool)
 
   def create(self, data: dict[str, str | int]) -> TopicData:
     """ Create (insert) a new entry into database.
@@ -47,10 +68,7 @@ class TopicDAO(DAO):
     Raises:
       Exception:        in case of any error like unique entry already exist.
     """
-    conn = None
-
-    try:
-      conn, cur = self._get_connection_and_cursor()
+    def insert(cur: sqlite3.Cursor) -> TopicData:
       cur.execute("""
         INSERT INTO topic
           (created_by, title, category)
@@ -58,21 +76,44 @@ class TopicDAO(DAO):
           (?, ?, ?)          
       """,
       (data["created_by"], data["title"], data["category"]))
-      conn.commit()
-
       cur.execute(self.GET_ONE_QUERY, (cur.lastrowid, ))
-      result = cur.fetchone()
-      column_names = [description[0] for description in cur.description]
 
-      topic_dict = dict(zip(column_names, result))
+      return self.TOPIC_MAPPER(cur.fetchone())
 
-      return TopicData(**topic_dict)
+    try:
+      return self._write(insert)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def create_many(self, data: list[dict[str, str | int]]) -> list[dict]:
+    """ Create (insert) many topics in one transaction, without reading them back.
+
+    Parameters:
+      data (list):      The data for every new topic.
+
+    Returns:
+      list:             The new topics with the creator id instead of userdata, in the same order as data.
+
+    Raises:
+      Exception:        in case of any error, then no topic is created.
+    """
+    def insert(cur: sqlite3.Cursor) -> list[dict]:
+      rows = self._insert_many(
+        cur,
+        "INSERT INTO topic (created_by, title, category)",
+        [(item["created_by"], item["title"], item["category"]) for item in data],
+        "RETURNING id AS topic_id, title, category, created, last_edited, deleted, disabled, "
+        "post_count, last_post_id, last_post_at, version, created_by"
+      )
+
+      return self.NEW_TOPIC_MAPPER.map_all(rows)
+
+    try:
+      return self._write(insert)
     except Exception as err:
       printer.print_fail(err)
       raise err
-    finally:
-      if conn is not None:
-        conn.close()
 
   def update(self, id_num: int, data: dict) -> bool:
     """Update topic.
@@ -87,22 +128,65 @@ class TopicDAO(DAO):
     Raises:
       Exception:    In case of any error
     """
-    conn = None
-    try:
-      conn, cur = self._get_connection_and_cursor()
-
+    def update(cur: sqlite3.Cursor) -> bool:
       columns = ', '.join([f'{k} = ?' for k in data.keys()])
 
       cur.execute(f"UPDATE topic SET {columns} WHERE id = ?", (*data.values(), id_num, ))
-      conn.commit()
 
       return cur.rowcount > 0
+
+    try:
+      return self._write(update)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def update_owned(self, id_num: int, creator: int, data: dict) -> Ownership:
+    """Update topic in one statement, if it is not deleted and created by the given user.
+
+    Parameters:
+      id_num (int):   unique id for the entry to update
+      creator (int):  id of the user editing, the topic is updated only if it is the creator
+      data (dict):    columns and new values, not empty
+
+    Returns:
+      Ownership:      the outcome of the update
+
+    Raises:
+      Exception:      In case of any error
+    """
+    def update(cur: sqlite3.Cursor) -> Ownership:
+      columns = ", ".join(f"{k} = ?" for k in data.keys())
+
+      return self._write_owned(cur, columns, tuple(data.values()), id_num, "created_by", creator)[0]
+
+    try:
+      return self._write(update)
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def delete_owned(self, id_num: int, creator: int) -> Ownership:
+    """Delete topic (soft delete) in one statement, if it is not deleted and created by the given user.
+
+    Args:
+      id_num (int):   unique id for the topic to delete
+      creator (int):  id of the user deleting, the topic is deleted only if it is the creator
+
+    Returns:
+      Ownership:      the outcome of the delete
+
+    Raises:
+      Exception:      In case of any error
+    """
+    def delete(cur: sqlite3.Cursor) -> Ownership:
+      return self._write_owned(cur, "deleted = CURRENT_TIMESTAMP", (), id_num, "created_by", creator)[0]
+
+    try:
+      return self._write(delete)
     except Exception as err:
       printer.print_fail(err)
       raise err
-    finally:
-      if conn is not None:
-        conn.close()
 
   def get_one(self, id_num: int) -> TopicData | None:
     """Get one topic from database.
@@ -120,26 +204,10 @@ class TopicDAO(DAO):
     conn = None
 
     try:
-      conn, cur = self._get_connection_and_cursor()
+      conn, cur = self._get_connection_and_cursor(read_only=True)
       cur.execute(self.GET_ONE_QUERY, (id_num, ))
-      result = cur.fetchone()
-
-      if result is None:
-        return result
 
-      column_names = [description[0] for description in cur.description]
-      topic_data = dict(zip(column_names, result))
-
-      created_by = {
-        "user_id": topic_data.pop("user_id"),
-        "username": topic_data.pop("username"),
-        "role": topic_data.pop("role"),
-        "signature": topic_data.pop("signature"),
-        "avatar": topic_data.pop("avatar"),
-      }
-      topic_data["created_by"] = created_by
-
-      return TopicData(**topic_data)
+      return self.TOPIC_MAPPER.map_one(cur.fetchone())
     except Exception as err:
       printer.print_fail(err)
       raise err
@@ -147,6 +215,26 @@ class TopicDAO(DAO):
       if conn is not None:
         conn.close()
 
+  def get_many(self, ids: list[int]) -> list[TopicData | None]:
+    """Get many topics with their creators in one query, the ids are passed as one JSON array.
+
+    Args:
+      ids (list):       unique ids for the topics.
+
+    Returns:
+      list:             the topic for every id in the same order, None for ids not found or deleted
+
+    Raises:
+      Exception:        in case of any error
+    """
+    unique_ids = list(set(ids))
+    topics = self._get_topics(
+      "topic.id", len(unique_ids), "topic.id IN (SELECT value FROM json_each(?))", (json.dumps(unique_ids), )
+    )
+    by_id = {topic["topic_id"]: topic for topic in topics}
+
+    return [by_id.get(id_num) for id_num in ids]
+
   def delete(self, id_num: int) -> bool:
     """Delete topic from database (soft delete) by setting deleted to current time.
 
@@ -159,20 +247,17 @@ class TopicDAO(DAO):
     Raises:
       Exception:    In case of any error
     """
-    conn = None
-    try:
-      conn, cur = self._get_connection_and_cursor()
+    def delete(cur: sqlite3.Cursor) -> bool:
       # TODO add soft delete for users topic and posts, with same timestamp?
       cur.execute(f"UPDATE topic SET deleted = CURRENT_TIMESTAMP WHERE id = ?", (id_num, ))
-      conn.commit()
 
       return cur.rowcount > 0
+
+    try:
+      return self._write(delete)
     except Exception as err:
       printer.print_fail(err)
       raise err
-    finally:
-      if conn is not None:
-        conn.close()
 
   def get_latest_topics(self, limit: int) -> list[TopicData]:
     """Get the latest topics in the database, based on creation date.
@@ -180,10 +265,145 @@ class TopicDAO(DAO):
     Returns:
       list[TopicData]: The list of topics.
     """
+    return self._get_topics("topic.created DESC, topic.id DESC", limit)
+
+  def get_version(self, id_num: int) -> tuple[int, str] | None:
+    """Get the version of a topic for conditional GET, it changes with the topic, its posts and their authors.
+
+    Args:
+      id_num (int):     unique id for the topic.
+
+    Returns:
+      tuple:            version and time of the latest change, None if no topic found with given id
+
+    Raises:
+      Exception:        in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      cur.execute(
+        "SELECT version, COALESCE(changed, created) FROM topic WHERE id = ? AND deleted IS NULL", (id_num, )
+      )
+
+      return cur.fetchone()
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      self._disconnect()
+
+  def get_latest_versions(self, limit: int) -> tuple[list[tuple[int, int]], str | None]:
+    """Get the versions of the latest topics for conditional GET, without their creators.
+
+    Args:
+      limit (int):      Number of topics.
+
+    Returns:
+      tuple:            (topic_id, version) of the topics newest first like get_latest_topics, and the time of
+                        the latest change of any topic, None if there are no topics.
+
+    Raises:
+      Exception:        in case of any error
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      versions = cur.execute("""
+        SELECT id, version FROM topic
+        WHERE deleted IS NULL
+        ORDER BY created DESC, id DESC
+        LIMIT ?
+      """, (limit, )).fetchall()
+      modified = cur.execute("""
+        SELECT MAX(
+          COALESCE((SELECT MAX(changed) FROM topic), ''),
+          COALESCE((SELECT MAX(created) FROM topic WHERE deleted IS NULL), '')
+        )
+      """).fetchone()[0]
+
+      return versions, modified or None
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+    finally:
+      self._disconnect()
+
+  def get_active_topics(self, limit: int) -> list[TopicData]:
+    """Get the recently active topics, with the latest post first, from the index on last_post_at.
+
+    Args:
+      limit (int):      Number of topics.
+
+    Returns:
+      list[TopicData]:  The list of topics, topics without posts last.
+    """
+    return self._get_topics("topic.last_post_at DESC, topic.id DESC", limit)
+
+  def get_category_topics(
+    self,
+    category_id: int,
+    limit: int,
+    after: tuple[str, int] | None = None
+  ) -> list[TopicData]:
+    """Get the latest topics in a category, from the index on (category, deleted, created).
+
+    Args:
+      category_id (int):  The id of the category.
+      limit (int):        Number of topics.
+      after (tuple):      (created, topic_id) of the last topic on the previous page, None for the first page.
+
+    Returns:
+      list[TopicData]:    The list of topics, newest first.
+    """
+    if after is None:
+      return self._get_topics("topic.created DESC, topic.id DESC", limit, "topic.category = ?", (category_id, ))
+
+    return self._get_topics(
+      "topic.created DESC, topic.id DESC",
+      limit,
+      "topic.category = ? AND (topic.created, topic.id) < (?, ?)",
+      (category_id, *after)
+    )
+
+  def get_user_topics(self, user_id: int, limit: int, after: tuple[str, int] | None = None) -> list[TopicData]:
+    """Get the latest topics created by a user, from the index on (created_by, deleted, created).
+
+    Args:
+      user_id (int):      The id of the user.
+      limit (int):        Number of topics.
+      after (tuple):      (created, topic_id) of the last topic on the previous page, None for the first page.
+
+    Returns:
+      list[TopicData]:    The list of topics, newest first.
+    """
+    if after is None:
+      return self._get_topics("topic.created DESC, topic.id DESC", limit, "topic.created_by = ?", (user_id, ))
+
+    return self._get_topics(
+      "topic.created DESC, topic.id DESC",
+      limit,
+      "topic.created_by = ? AND (topic.created, topic.id) < (?, ?)",
+      (user_id, *after)
+    )
+
+  def _get_topics(self, order_by: str, limit: int, where: str = "TRUE", params: tuple = ()) -> list[TopicData]:
+    """Get topics that are not deleted, with their creators.
+
+    Args:
+      order_by (str):   ORDER BY clause for the query
+      limit (int):      Number of topics.
+      where (str):      More conditions for the topics, with ? for params.
+      params (tuple):   Parameters for where.
+
+    Returns:
+      list[TopicData]:  The list of topics.
+
+    Raises:
+      Exception:        in case of any error
+    """
     conn = None
     try:
-      conn, cur = self._get_connection_and_cursor()
-      rows = cur.execute("""
+      conn, cur = self._get_connection_and_cursor(read_only=True)
+      rows = cur.execute(f"""
         SELECT 
           topic.id AS topic_id,
           topic.title,
@@ -192,6 +412,10 @@ class TopicDAO(DAO):
           topic.last_edited,
           topic.deleted,
           topic.disabled,
+          topic.post_count,
+          topic.last_post_id,
+          topic.last_post_at,
+          topic.version,
           user.id as user_id,
           user.username,
           user.role,
@@ -200,27 +424,12 @@ class TopicDAO(DAO):
         FROM topic
         JOIN user ON topic.created_by = user.id 
         WHERE topic.deleted IS NULL
-        ORDER BY created DESC
+        AND {where}
+        ORDER BY {order_by}
         LIMIT ?
-      """, (limit, ))
-
-      column_names = [description[0] for description in cur.description]
-
-      topics_data: list[TopicData] = []
-
-      for topic in rows:
-        topic_with_keys = dict(zip(column_names, topic))
-        created_by = {
-          "user_id": topic_with_keys.pop("user_id"),
-          "username": topic_with_keys.pop("username"),
-          "role": topic_with_keys.pop("role"),
-          "signature": topic_with_keys.pop("signature"),
-          "avatar": topic_with_keys.pop("avatar")
-        }
-        topic_with_keys["created_by"] = created_by
-        topics_data.append(TopicData(**topic_with_keys))
+      """, (*params, limit))
 
-      return topics_data
+      return self.TOPIC_MAPPER.map_all(rows)
     except Exception as err:
       printer.print_fail(err)
       raise err
@@ -0,0 +1,186 @@
+"""
+UnitOfWork lets every DAO call in one request share one connection and one transaction.
+
+The unit of work is bound to the Flask request through g. DAOs using the same pool pick it up
+in _get_connection_and_cursor, their commit() and close() calls are deferred to the end of the request.
+"""
+from __future__ import annotations
+import sqlite3
+from typing import Any, Callable
+from flask import g, has_app_context
+from src.utils.daos.connection_pool import ConnectionPool, PooledConnection
+
+
+class SharedConnection:
+  """
+  Connection handed to the DAOs while a unit of work is active.
+
+  Works as the pooled connection, except that commit() and close() are left to the unit of work.
+  """
+
+  def __init__(self, connection: PooledConnection):
+    """Initializes the SharedConnection.
+
+    Args:
+      connection (PooledConnection): The connection owned by the unit of work.
+    """
+    self._connection = connection
+
+  def __getattr__(self, name: str) -> Any:
+    return getattr(self._connection, name)
+
+  def cursor(self) -> sqlite3.Cursor:
+    """Get a cursor for the shared connection."""
+    return self._connection.cursor()
+
+  def commit(self) -> None:
+    """Does nothing, the unit of work commits at the end of the request."""
+
+  def close(self) -> None:
+    """Does nothing, the unit of work gives the connection back at the end of the request."""
+
+
+class UnitOfWork:
+  """
+  One connection and one transaction for everything done in a request.
+
+  The transaction is started on first use. Reads see one consistent snapshot of the database,
+  a unit of work for a mutating request takes the write lock up front (BEGIN IMMEDIATE) so it
+  never has to upgrade a read snapshot that another writer has already made stale.
+  Without snapshot the reads share the connection but run outside a transaction, holding no locks between them.
+  Callbacks registered with after_commit run once the transaction is committed, and are dropped on a rollback.
+  """
+
+  def __init__(self, pool: ConnectionPool, write: bool = False, snapshot: bool = True):
+    """Initializes the UnitOfWork.
+
+    Args:
+      pool (ConnectionPool):  Pool to check out the connection from.
+      write (bool):           True if the request is going to write.
+      snapshot (bool):        False to not begin a transaction for a unit of work that only reads.
+    """
+    self._pool = pool
+    self._write = write
+    self._snapshot = snapshot or write
+    self._connection: PooledConnection | None = None
+    self._after_commit: list[Callable[[], None]] = []
+
+  @property
+  def pool(self) -> ConnectionPool:
+    """The pool the unit of work checks out its connection from."""
+    return self._pool
+
+  @property
+  def write(self) -> bool:
+    """True if the unit of work is for a request that writes."""
+    return self._write
+
+  def connection(self) -> SharedConnection:
+    """Get the connection of the unit of work, checking it out and beginning the transaction if needed.
+
+    Returns:
+      SharedConnection: Connection for the DAOs to use
+    """
+    if self._connection is None:
+      connection = self._pool.acquire()
+
+      if self._snapshot:
+        try:
+          connection.execute("BEGIN IMMEDIATE" if self._write else "BEGIN")
+        except Exception:
+          connection.close()
+          raise
+
+      self._connection = connection
+
+    return SharedConnection(self._connection)
+
+  def after_commit(self, callback: Callable[[], None]) -> None:
+    """Run a callback when the transaction is committed, like invalidating a cache of what was written.
+
+    Args:
+      callback (Callable): Function to call after a successful commit.
+    """
+    self._after_commit.append(callback)
+
+  def commit(self) -> None:
+    """Commit the transaction and give the connection back, then run the callbacks waiting for the commit."""
+    callbacks = self._after_commit
+
+    try:
+      if self._connection is not None:
+        self._connection.commit()
+    finally:
+      self.close()
+
+    for callback in callbacks:
+      callback()
+
+  def close(self) -> None:
+    """Give the connection back, anything not committed is rolled back by the pool and the callbacks are dropped."""
+    if self._connection is not None:
+      self._connection.close()
+
+    self._connection = None
+    self._after_commit = []
+
+
+def begin_unit_of_work(pool: ConnectionPool, write: bool = False, snapshot: bool = True) -> UnitOfWork:
+  """Bind a new unit of work to the current request.
+
+  Args:
+    pool (ConnectionPool):  Pool to check out the connection from.
+    write (bool):           True if the request is going to write.
+    snapshot (bool):        False to not begin a transaction for a unit of work that only reads.
+
+  Returns:
+    UnitOfWork:             The new unit of work
+  """
+  g.unit_of_work = UnitOfWork(pool, write, snapshot)
+  return g.unit_of_work
+
+
+def end_unit_of_work(commit: bool) -> None:
+  """Commit or roll back the unit of work bound to the current request, if any.
+
+  Args:
+    commit (bool): True to commit, False to roll back.
+  """
+  unit_of_work = g.pop("unit_of_work", None)
+
+  if unit_of_work is None:
+    return
+
+  if commit:
+    unit_of_work.commit()
+  else:
+    unit_of_work.close()
+
+
+def run_after_commit(callback: Callable[[], None]) -> None:
+  """Run a callback once the writes made so far are committed.
+
+  In a unit of work for a request that writes, the callback waits for the request to commit and is dropped if it
+  rolls back. Other writes are committed when they are made, so the callback runs right away.
+
+  Args:
+    callback (Callable): Function to call after the commit, like invalidating a cache of what was written.
+  """
+  unit_of_work = current_unit_of_work()
+
+  if unit_of_work is not None and unit_of_work.write:
+    unit_of_work.after_commit(callback)
+  else:
+    callback()
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+  """Get the unit of work bound to the current request.
+
+  Returns:
+    UnitOfWork: The unit of work, None outside a request or if no unit of work is bound.
+  """
+  if not has_app_context():
+    return None
+
+  return g.get("unit_of_work", None)
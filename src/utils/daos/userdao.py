@@ -2,10 +2,21 @@
 UserDAO is used for accessing users.
 """
 from __future__ import annotations
+import json
+import os
+import sqlite3
 from src.static.types import UserData
-from src.utils.daos.basedao import DAO
+from src.utils.cache import LRUCache
+from src.utils.daos.basedao import DAO, Ownership
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.unit_of_work import run_after_commit
+from src.utils.daos.writer import Writer
+from src.utils.daos.row_mapper import USER_COLUMNS
 from src.utils.print_colors import ColorPrinter
 
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", "60"))
+
 printer = ColorPrinter()
 
 
@@ -13,9 +24,57 @@ class UserDAO(DAO):
   """ UserDAO for accessing posts. """
   GET_ONE_QUERY_USERNAME = "SELECT id AS user_id, username, role, signature, avatar FROM user WHERE username = ?"
   GET_ONE_QUERY_ID = "SELECT id as user_id, username, role, signature, avatar FROM user WHERE id = ?"
+  GET_MANY_QUERY_ID = (
+    "SELECT id AS user_id, username, role, signature, avatar FROM user WHERE id IN (SELECT value FROM json_each(?))"
+  )
+
+  def __init__(
+    self,
+    table_name: str,
+    pool: ConnectionPool | None = None,
+    writer: Writer | None = None,
+    read_pool: ConnectionPool | None = None,
+    cache: LRUCache[UserData] | None = None
+  ):
+    """Initializes the UserDAO.
+
+    Parameters:
+      table_name (str):           Name of the table.
+      pool (ConnectionPool):      Pool for the database.
+      writer (Writer):            Writer running the writes, None to write on a connection of the pool.
+      read_pool (ConnectionPool): Read-only pool for the reads, None to read from pool.
+      cache (LRUCache):           Cache for users by id and by username, shared by all UserDAOs, None to not cache.
+    """
+    super().__init__(table_name, pool, writer, read_pool)
+    self._cache = cache
+
+  def _cached(self, key: tuple[str, int | str]) -> UserData | None:
+    """Get a copy of a cached user."""
+    if self._cache is None:
+      return None
+
+    user = self._cache.get(key)
+    return None if user is None else UserData(**user)
 
-  def __init__(self, table_name: str):
-    super().__init__(table_name)
+  def _cache_user(self, user: UserData) -> None:
+    """Cache a user by id and by username."""
+    if self._cache is not None:
+      self._cache.set(("id", user["user_id"]), UserData(**user))
+      self._cache.set(("username", user["username"]), UserData(**user))
+
+  def _invalidate(self, user_id: int | None = None, usernames: set[str] | None = None) -> None:
+    """Remove users from the cache, by id and by username, once the write is committed. Ids from routes are strings."""
+    if self._cache is None:
+      return
+
+    cache = self._cache
+    user_id = int(user_id) if str(user_id).isdigit() else user_id
+    usernames = usernames or set()
+
+    def invalidate() -> None:
+      cache.delete_where(lambda key, user: user["user_id"] == user_id or user["username"] in usernames)
+
+    run_after_commit(invalidate)
 
   def create(self, data: dict[str, str]) -> UserData:
     """Create (insert) a new entry into database.
@@ -29,13 +88,8 @@ class UserDAO(DAO):
     Raises:
       Exception:    in case of any error like unique entry already exist.
     """
-    conn = None
-
-    try:
-      conn, cur = self._get_connection_and_cursor()
+    def insert(cur: sqlite3.Cursor) -> UserData:
       cur.execute(f"INSERT INTO user (username) VALUES (?)", (data["username"], ))
-      conn.commit()
-
       cur.execute(self.GET_ONE_QUERY_ID, (cur.lastrowid, ))
       column_names = [description[0] for description in cur.description]
       result = cur.fetchone()
@@ -43,12 +97,109 @@ class UserDAO(DAO):
       user_data = dict(zip(column_names, result))
 
       return UserData(**user_data)
+
+    try:
+      user = self._write(insert)
+      self._invalidate(usernames={user["username"]})
+      return user
     except Exception as err:
       printer.print_fail(err)
       raise err
-    finally:
-      if conn is not None:
-        conn.close()
+
+  def create_many(self, data: list[dict[str, str]]) -> list[UserData | None]:
+    """Create (insert) many users in one transaction, skipping taken usernames.
+
+    Parameters:
+      data (list):  The data for every new user.
+
+    Returns:
+      list:         The new users in the same order as data, None where the username was already taken.
+
+    Raises:
+      Exception:    in case of any error, then no user is created.
+    """
+    def insert(cur: sqlite3.Cursor) -> list[UserData | None]:
+      rows = self._insert_many(
+        cur,
+        "INSERT INTO user (username)",
+        [(item["username"], ) for item in data],
+        "ON CONFLICT (username) DO NOTHING RETURNING id AS user_id, username, role, signature, avatar"
+      )
+      created = {row[1]: UserData(**dict(zip(USER_COLUMNS, row))) for row in rows}
+
+      return [created.pop(item["username"], None) for item in data]
+
+    try:
+      users = self._write(insert)
+      usernames = {user["username"] for user in users if user is not None}
+      if usernames:
+        self._invalidate(usernames=usernames)
+      return users
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def update(self, id_num: int, data: dict) -> bool:
+    """Update a user and remove it from the cache.
+
+    Parameters:
+      id_num (int): The id of the user to update.
+      data (dict):  The new data.
+
+    Returns:
+      boolean:      True if the user was found, False otherwise
+
+    Raises:
+      Exception:    In case of any error
+    """
+    updated = super().update(id_num, data)
+    self._invalidate(id_num)
+
+    return updated
+
+  def update_owned(self, id_num: int, editor: int, data: dict) -> Ownership:
+    """Update a user in one statement if the editor is the user, and remove it from the cache.
+
+    Parameters:
+      id_num (int): The id of the user to update.
+      editor (int): The id of the user editing.
+      data (dict):  The new data, not empty.
+
+    Returns:
+      Ownership:    The outcome of the update
+
+    Raises:
+      Exception:    In case of any error
+    """
+    def update(cur: sqlite3.Cursor) -> Ownership:
+      columns = ", ".join(f"{k} = ?" for k in data.keys())
+
+      return self._write_owned(cur, columns, tuple(data.values()), id_num, "id", editor, soft_deleted=False)[0]
+
+    try:
+      outcome = self._write(update)
+      self._invalidate(id_num)
+      return outcome
+    except Exception as err:
+      printer.print_fail(err)
+      raise err
+
+  def delete(self, id_num: int) -> bool:
+    """Delete a user (soft delete) and remove it from the cache.
+
+    Parameters:
+      id_num (int): The id of the user to delete.
+
+    Returns:
+      boolean:      True if the user was deleted, False otherwise
+
+    Raises:
+      Exception:    In case of any error
+    """
+    deleted = super().delete(id_num)
+    self._invalidate(id_num)
+
+    return deleted
 
   # # TODO make this method better, or move it to basedao if they all use it in the same way.
   # def update(self, id_num: int, data: dict) -> bool:
@@ -94,8 +245,12 @@ class UserDAO(DAO):
     Raises:
       Exception:      If an error occurs while retrieving the user.
     """
+    cached = self._cached(("username", username))
+    if cached is not None:
+      return cached
+
     try:
-      cur = self._connect_get_cursor()
+      cur = self._connect_get_cursor(read_only=True)
 
       cur.execute(self.GET_ONE_QUERY_USERNAME, (username, ))
       column_names = [description[0] for description in cur.description]
@@ -104,9 +259,10 @@ class UserDAO(DAO):
       if result is None:
         return result
 
-      user_data = dict(zip(column_names, result))
+      user_data = UserData(**dict(zip(column_names, result)))
+      self._cache_user(user_data)
 
-      return UserData(**user_data)
+      return user_data
     except Exception as error:
       printer.print_fail(error)
       raise error
@@ -126,8 +282,12 @@ class UserDAO(DAO):
     Raises:
       Exception:    If an error occurs while retrieving the user.
     """
+    cached = self._cached(("id", int(id_num) if str(id_num).isdigit() else id_num))
+    if cached is not None:
+      return cached
+
     try:
-      cur = self._connect_get_cursor()
+      cur = self._connect_get_cursor(read_only=True)
 
       cur.execute(self.GET_ONE_QUERY_ID, (id_num, ))
       column_names = [description[0] for description in cur.description]
@@ -136,11 +296,76 @@ class UserDAO(DAO):
       if result is None:
         return result
 
-      user_data = dict(zip(column_names, result))
+      user_data = UserData(**dict(zip(column_names, result)))
+      self._cache_user(user_data)
 
-      return UserData(**user_data)
+      return user_data
     except Exception as error:
       printer.print_fail(error)
       raise error
     finally:
       self._disconnect()
+
+  def get_version(self, id_num: int) -> tuple[int, str | None] | None:
+    """Retrieves the version of a user for conditional GET. The user is read with it and cached, so the cache
+    has the same version of the user when it was changed by another process.
+
+    Parameters:
+      id_num (int): The id of the user.
+
+    Returns:
+      tuple:        The version and the time of the latest change, None if never changed.
+      None:         None if not found.
+
+    Raises:
+      Exception:    If an error occurs while retrieving the user.
+    """
+    try:
+      cur = self._connect_get_cursor(read_only=True)
+      row = cur.execute(
+        "SELECT id AS user_id, username, role, signature, avatar, version, changed FROM user WHERE id = ?", (id_num, )
+      ).fetchone()
+
+      if row is None:
+        return None
+
+      self._cache_user(UserData(**dict(zip(USER_COLUMNS, row))))
+
+      return row[-2], row[-1]
+    except Exception as error:
+      printer.print_fail(error)
+      raise error
+    finally:
+      self._disconnect()
+
+  def get_many(self, ids: list[int]) -> list[UserData | None]:
+    """Retrieves many users by their ids, the ones not cached in one query with the ids as one JSON array.
+
+    Parameters:
+      ids (list):   The ids of the users to retrieve.
+
+    Returns:
+      list:         The user for every id in the same order, None for ids not found.
+
+    Raises:
+      Exception:    If an error occurs while retrieving the users.
+    """
+    users = {id_num: self._cached(("id", id_num)) for id_num in ids}
+    missing = [id_num for id_num, user in users.items() if user is None]
+
+    if missing:
+      try:
+        cur = self._connect_get_cursor(read_only=True)
+        rows = cur.execute(self.GET_MANY_QUERY_ID, (json.dumps(missing), ))
+
+        for row in rows:
+          user_data = UserData(**dict(zip(USER_COLUMNS, row)))
+          self._cache_user(user_data)
+          users[user_data["user_id"]] = user_data
+      except Exception as error:
+        printer.print_fail(error)
+        raise error
+      finally:
+        self._disconnect()
+
+    return [users[id_num] for id_num in ids]
@@ -0,0 +1,252 @@
+"""
+Writer owns the only connection that writes to the database and runs all writes on one thread.
+
+sqlite lets one connection write at a time, threads writing on their own connections wait for each other on
+the file lock and commit one by one. The DAOs hand their writes to the writer instead and wait for the result.
+Writes queued while a transaction is committed are run together in the next transaction (group commit),
+each in a savepoint of its own, so a failing write is rolled back alone and only fails its own caller.
+
+The writer is off unless SQLITE_WRITER=1. With the writer, the reads of a request and its writes run in
+different transactions, a request failing after a write can not roll the write back.
+"""
+from __future__ import annotations
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from typing import Callable, TypeVar
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.print_colors import ColorPrinter
+
+WRITER_ENABLED = os.environ.get("SQLITE_WRITER", "0") == "1"
+WRITER_BATCH_SIZE = int(os.environ.get("SQLITE_WRITER_BATCH", "100"))
+WRITER_TIMEOUT = float(os.environ.get("SQLITE_WRITER_TIMEOUT", "30"))
+
+printer = ColorPrinter()
+
+T = TypeVar("T")
+Work = Callable[[sqlite3.Cursor], T]
+
+
+class Writer:
+  """
+  Single writer thread with group commit.
+
+  The thread and its connection are started on the first write, and again in a forked process or if the
+  thread died. A group failing outside of its writes, like on connecting or committing, fails its writes only,
+  the connection is opened again for the next group.
+  """
+
+  def __init__(self, pool: ConnectionPool, batch_size: int = WRITER_BATCH_SIZE, timeout: float = WRITER_TIMEOUT):
+    """Initializes the Writer.
+
+    Args:
+      pool (ConnectionPool):  Pool for the database, used to open the write connection with its profile.
+      batch_size (int):       Most writes committed in one transaction.
+      timeout (float):        Seconds run() waits for a write to be committed.
+    """
+    self._pool = pool
+    self._batch_size = batch_size
+    self._timeout = timeout
+    self._lock = threading.Lock()
+    self._pid: int | None = None
+    self._queue: queue.SimpleQueue[tuple[Work, Future] | None] = queue.SimpleQueue()
+    self._thread: threading.Thread | None = None
+
+  @property
+  def pool(self) -> ConnectionPool:
+    """The pool for the database the writer writes to."""
+    return self._pool
+
+  def submit(self, work: Work[T]) -> Future[T]:
+    """Queue a write.
+
+    Args:
+      work (Callable):  Function doing the write with the given cursor, it must not commit.
+
+    Returns:
+      Future:           Gets the return value of work when the transaction is committed,
+                        or the exception raised by work or by the commit.
+    """
+    future: Future[T] = Future()
+
+    with self._lock:
+      self._start()
+      self._queue.put((work, future))
+
+    return future
+
+  def run(self, work: Work[T]) -> T:
+    """Queue a write and wait for it to be committed.
+
+    Args:
+      work (Callable):    Function doing the write with the given cursor, it must not commit.
+
+    Returns:
+      Any:                The return value of work
+
+    Raises:
+      RuntimeError:       If called from a write, that would wait for itself, or if the writer stopped.
+      FutureTimeoutError: If the write is not committed within the timeout, it is cancelled if not yet started.
+    """
+    if threading.current_thread() is self._thread:
+      raise RuntimeError("A write can not wait for another write.")
+
+    future = self.submit(work)
+
+    try:
+      return future.result(timeout=self._timeout)
+    except FutureTimeoutError:
+      future.cancel()
+      raise
+
+  def close(self) -> None:
+    """Commit the queued writes and stop the thread."""
+    with self._lock:
+      thread, self._thread = self._thread, None
+
+      if thread is None or self._pid != os.getpid():
+        return
+
+      self._queue.put(None)
+
+    thread.join()
+
+  def _start(self) -> None:
+    """Start a thread with a queue of its own, if none is running in this process. Called with the lock held."""
+    if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+      return
+
+    self._pid = os.getpid()
+    self._queue = queue.SimpleQueue()
+    self._thread = threading.Thread(target=self._run, args=(self._queue, ), name="sqlite-writer", daemon=True)
+    self._thread.start()
+
+  def _run(self, work_queue: queue.SimpleQueue) -> None:
+    """Take queued writes and commit them in groups until closed, the writes not committed when the thread
+    stops are failed. Writes are queued with the lock held, so once the thread has given up its place under
+    the lock no more writes are queued for it."""
+    connection: sqlite3.Connection | None = None
+    batch: list[tuple[Work, Future]] = []
+    stopping = False
+
+    try:
+      while not stopping:
+        item = work_queue.get()
+
+        if item is None:
+          break
+
+        batch = [item]
+
+        while len(batch) < self._batch_size:
+          try:
+            item = work_queue.get_nowait()
+          except queue.Empty:
+            break
+
+          if item is None:
+            stopping = True
+            break
+
+          batch.append(item)
+
+        try:
+          if connection is None:
+            connection = self._pool.connect()
+          self._commit_batch(connection, batch)
+        except Exception as err:  # pylint: disable=broad-except
+          printer.print_fail(err)
+          self._fail(batch, err)
+          self._close(connection)
+          connection = None
+    finally:
+      self._close(connection)
+
+      with self._lock:
+        if self._thread is threading.current_thread():
+          self._thread = None
+        batch = batch + self._drain(work_queue)
+
+      self._fail(batch, RuntimeError("The writer stopped before the write was run."))
+
+  @staticmethod
+  def _close(connection: sqlite3.Connection | None) -> None:
+    """Close the write connection, if open, ignoring errors of a broken connection."""
+    if connection is None:
+      return
+
+    try:
+      connection.close()
+    except sqlite3.Error as err:
+      printer.print_fail(err)
+
+  @staticmethod
+  def _fail(batch: list[tuple[Work, Future]], err: BaseException) -> None:
+    """Fail the writes of a group that have no result yet."""
+    for _, future in batch:
+      if not future.done():
+        try:
+          future.set_exception(err)
+        except InvalidStateError:
+          pass
+
+  @staticmethod
+  def _drain(work_queue: queue.SimpleQueue) -> list[tuple[Work, Future]]:
+    """Take the writes left in a queue."""
+    batch = []
+
+    while True:
+      try:
+        item = work_queue.get_nowait()
+      except queue.Empty:
+        return batch
+
+      if item is not None:
+        batch.append(item)
+
+  @staticmethod
+  def _commit_batch(connection: sqlite3.Connection, batch: list[tuple[Work, Future]]) -> None:
+    """Run a group of writes in one transaction and hand out the results when it is committed.
+
+    Args:
+      connection (Connection):  The write connection.
+      batch (list):             The writes and their futures.
+    """
+    results = []
+    cur = connection.cursor()
+
+    try:
+      cur.execute("BEGIN IMMEDIATE")
+
+      for work, future in batch:
+        if not future.set_running_or_notify_cancel():
+          continue
+
+        cur.execute("SAVEPOINT write")
+
+        try:
+          results.append((future, work(cur), None))
+          cur.execute("RELEASE write")
+        except Exception as err:  # pylint: disable=broad-except
+          cur.execute("ROLLBACK TO write")
+          cur.execute("RELEASE write")
+          results.append((future, None, err))
+
+      connection.commit()
+    except Exception as err:  # pylint: disable=broad-except
+      if connection.in_transaction:
+        connection.rollback()
+
+      for _, future in batch:
+        if not future.done():
+          future.set_exception(err)
+
+      return
+
+    for future, result, err in results:
+      if err is None:
+        future.set_result(result)
+      else:
+        future.set_exception(err)
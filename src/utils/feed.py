@@ -0,0 +1,153 @@
+"""
+In-memory feed of the latest topics, kept up to date by the writes instead of read from the database.
+
+The feed is loaded on first use, topics are then added and removed as they are created and deleted. It is
+reloaded every LATEST_TOPICS_FEED_TTL seconds, in case it drifted from writes made outside of the services.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Any, Callable
+from src.static.types import TopicData
+
+LATEST_TOPICS_FEED_SIZE = int(os.environ.get("LATEST_TOPICS_FEED_SIZE", "100"))
+LATEST_TOPICS_FEED_TTL = float(os.environ.get("LATEST_TOPICS_FEED_TTL", "300"))
+
+
+class LatestTopicsFeed:
+  """
+  The newest topics, sorted newest first like TopicDAO.get_latest_topics, safe to share between threads.
+  """
+
+  def __init__(
+    self,
+    loader: Callable[[int], list[TopicData]],
+    size: int = LATEST_TOPICS_FEED_SIZE,
+    ttl: float = LATEST_TOPICS_FEED_TTL
+  ):
+    """Initializes the LatestTopicsFeed.
+
+    Args:
+      loader (Callable):  Reads the given number of latest topics from the database, like get_latest_topics.
+      size (int):         Number of topics kept, 0 disables the feed.
+      ttl (float):        Seconds until the feed is reloaded from the database.
+    """
+    self._loader = loader
+    self._size = size
+    self._ttl = ttl
+    self._topics: list[TopicData] = []
+    self._loaded_at: float | None = None
+    self._complete = False
+    self._version = 0
+    self._lock = threading.Lock()
+
+  @property
+  def enabled(self) -> bool:
+    """True if the feed keeps any topics."""
+    return self._size > 0
+
+  def __contains__(self, topic_id: int) -> bool:
+    with self._lock:
+      return any(topic["topic_id"] == topic_id for topic in self._topics)
+
+  def get(self, limit: int) -> list[TopicData]:
+    """Get the latest topics, from the database only if the feed is not loaded or too short.
+
+    Args:
+      limit (int):  Number of topics.
+
+    Returns:
+      list:         Copies of the topics, newest first
+    """
+    if not self.enabled or limit > self._size:
+      return self._loader(limit)
+
+    with self._lock:
+      fresh = self._loaded_at is not None and time.monotonic() - self._loaded_at < self._ttl
+
+      if fresh and (limit <= len(self._topics) or self._complete):
+        return [TopicData(**topic) for topic in self._topics[:limit]]
+
+      version = self._version
+
+    topics = self._loader(self._size)
+    self._store(topics, version)
+
+    return [TopicData(**topic) for topic in topics[:limit]]
+
+  def rebuild(self) -> None:
+    """Reload the feed from the database now."""
+    with self._lock:
+      self._version += 1
+      version = self._version
+
+    self._store(self._loader(self._size), version)
+
+  def invalidate(self) -> None:
+    """Reload the feed from the database on next use."""
+    with self._lock:
+      self._version += 1
+      self._loaded_at = None
+
+  def add(self, topic: TopicData) -> None:
+    """Add a created topic.
+
+    Args:
+      topic (TopicData):  The topic, as read by TopicDAO.
+    """
+    key = (topic["created"], topic["topic_id"])
+
+    with self._lock:
+      self._version += 1
+      index = next(
+        (i for i, other in enumerate(self._topics) if (other["created"], other["topic_id"]) < key), len(self._topics)
+      )
+      self._topics.insert(index, TopicData(**topic))
+
+      if len(self._topics) > self._size:
+        self._topics.pop()
+        self._complete = False
+
+  def replace(self, topic: TopicData) -> None:
+    """Replace an updated topic, if it is in the feed.
+
+    Args:
+      topic (TopicData):  The topic, as read by TopicDAO.
+    """
+    with self._lock:
+      self._version += 1
+      self._topics = [
+        TopicData(**topic) if other["topic_id"] == topic["topic_id"] else other for other in self._topics
+      ]
+
+  def update(self, topic_id: int, fields: dict[str, Any]) -> None:
+    """Update some fields of a topic, if it is in the feed.
+
+    Args:
+      topic_id (int): The id of the topic.
+      fields (dict):  The new values, like the activity of the topic.
+    """
+    with self._lock:
+      self._version += 1
+      self._topics = [
+        TopicData(**{**topic, **fields}) if topic["topic_id"] == topic_id else topic for topic in self._topics
+      ]
+
+  def remove(self, topic_id: int) -> None:
+    """Remove a deleted topic, the feed is refilled from the database when it gets too short.
+
+    Args:
+      topic_id (int): The id of the topic.
+    """
+    with self._lock:
+      self._version += 1
+      self._topics = [topic for topic in self._topics if topic["topic_id"] != topic_id]
+
+  def _store(self, topics: list[TopicData], version: int) -> None:
+    """Store loaded topics, unless the feed changed since version was read."""
+    with self._lock:
+      if self._version == version:
+        self._topics = [TopicData(**topic) for topic in topics]
+        self._complete = len(topics) < self._size
+        self._loaded_at = time.monotonic()
@@ -0,0 +1,52 @@
+"""
+Opaque tokens for keyset pagination.
+
+A token holds the sort key of the last row on a page, the next page is read from right after it.
+"""
+import base64
+import binascii
+import json
+from typing import Any
+from src.errors.customerrors import InputInvalidException
+
+
+def encode_cursor(*values: Any) -> str:
+  """Encode the sort key of a row as an url safe token.
+
+  Args:
+    values (any): The values of the sort key, e.g. created and id.
+
+  Returns:
+    str:          The token
+  """
+  data = json.dumps(values, separators=(",", ":")).encode("utf-8")
+  return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str, *types: type) -> tuple:
+  """Decode a token made by encode_cursor.
+
+  Args:
+    token (str):    The token.
+    types (type):   Expected type of every value in the sort key.
+
+  Returns:
+    tuple:          The values of the sort key
+
+  Raises:
+    InputInvalidException: If the token is not valid.
+  """
+  try:
+    data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    values = json.loads(data)
+  except (binascii.Error, ValueError) as err:
+    raise InputInvalidException("Invalid page token.") from err
+
+  if (
+    not isinstance(values, list)
+    or len(values) != len(types)
+    or not all(isinstance(value, kind) and not isinstance(value, bool) for value, kind in zip(values, types))
+  ):
+    raise InputInvalidException("Invalid page token.")
+
+  return tuple(values)
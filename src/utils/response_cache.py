@@ -0,0 +1,356 @@
+"""
+Shared cache of whole responses to anonymous GET requests, in front of the API.
+
+A route is cached only if it has a CachePolicy, set next to the route in its blueprint with ResponseCache.route().
+A response is fresh for max_age seconds, clients and proxies get the same time in Cache-Control. It is then
+served stale for stale_while_revalidate seconds more, while one request refreshes it on a background thread.
+Requests with an Authorization header are never served from or stored in the cache.
+
+The cache is bounded by the bytes of the stored responses, RESPONSE_CACHE_SIZE, 0 turns it off. Responses are
+keyed by path and query string, and purged by key prefix when the data behind them changes in this process.
+A response read before a purge is not stored after it. Changes made by other processes are seen once the
+responses expire.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+from flask import Blueprint, Flask, Request, Response, current_app, g
+from flask.blueprints import BlueprintSetupState
+from src.utils.print_colors import ColorPrinter
+
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_MAX_ENTRY = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRY", str(1024 * 1024)))
+RESPONSE_CACHE_WORKERS = int(os.environ.get("RESPONSE_CACHE_WORKERS", "2"))
+
+# Set in the environ of the background requests refreshing a stale response.
+REFRESH_ENVIRON_KEY = "forum.response_cache.refresh"
+READ_METHODS = ("GET", "HEAD")
+
+printer = ColorPrinter()
+
+
+class CachePolicy(NamedTuple):
+  """How long the responses of a route are cached, in seconds."""
+  max_age: int
+  stale_while_revalidate: int = 0
+
+
+class CachedResponse(NamedTuple):
+  """A stored response."""
+  body: bytes
+  status: int
+  headers: list[tuple[str, str]]
+  policy: CachePolicy
+  stored: float
+  size: int
+
+
+class ResponseCache:
+  """
+  A byte-bounded mapping from request keys to responses, evicting the least recently used response first.
+  """
+
+  def __init__(self, max_bytes: int = RESPONSE_CACHE_SIZE, max_entry: int = RESPONSE_CACHE_MAX_ENTRY):
+    """Initializes the ResponseCache.
+
+    Args:
+      max_bytes (int):  Maximum bytes of all stored responses, 0 disables the cache.
+      max_entry (int):  Maximum bytes of one response, larger responses are not stored.
+    """
+    self._max_bytes = max_bytes
+    self._max_entry = min(max_entry, max_bytes)
+    self._policies: dict[str, CachePolicy] = {}
+    self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+    self._bytes = 0
+    self._generation = 0
+    self._refreshing: set[str] = set()
+    self._executor: ThreadPoolExecutor | None = None
+    self._executor_pid: int | None = None
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._stale_hits = 0
+    self._misses = 0
+    self._evictions = 0
+    self._purges = 0
+
+  @property
+  def enabled(self) -> bool:
+    """True if the cache keeps any responses."""
+    return self._max_bytes > 0
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def route(self, blueprint: Blueprint, rule: str, policy: CachePolicy) -> None:
+    """Cache a GET route of a blueprint, the full rule is known once the blueprint is registered.
+
+    Args:
+      blueprint (Blueprint):  The blueprint of the route.
+      rule (str):             The rule of the route, as given to blueprint.route().
+      policy (CachePolicy):   How long the responses are cached.
+    """
+    def register(state: BlueprintSetupState) -> None:
+      self._policies[(state.url_prefix or "") + rule] = policy
+
+    blueprint.record(register)
+
+  def policy(self, request: Request) -> CachePolicy | None:
+    """Get the policy of the route of a request.
+
+    Args:
+      request (Request):  The request.
+
+    Returns:
+      CachePolicy:        The policy, None if the route is not cached
+    """
+    if request.url_rule is None:
+      return None
+    return self._policies.get(request.url_rule.rule)
+
+  def get(self, key: str) -> tuple[CachedResponse, float] | None:
+    """Get a fresh or stale response and mark it as recently used.
+
+    Args:
+      key (str):  The key of the response.
+
+    Returns:
+      tuple:      The response and its age in seconds, None if missing or expired
+    """
+    with self._lock:
+      entry = self._entries.get(key)
+
+      if entry is None:
+        self._misses += 1
+        return None
+
+      age = time.monotonic() - entry.stored
+
+      if age >= entry.policy.max_age + entry.policy.stale_while_revalidate:
+        self._remove(key)
+        self._misses += 1
+        return None
+
+      self._entries.move_to_end(key)
+      if age < entry.policy.max_age:
+        self._hits += 1
+      else:
+        self._stale_hits += 1
+      return entry, age
+
+  def generation(self) -> int:
+    """Get the number of purges, to pass to set() for a response read after this call.
+
+    Returns:
+      int:  The generation
+    """
+    return self._generation
+
+  def set(self, key: str, response: Response, policy: CachePolicy, generation: int | None = None) -> bool:
+    """Store a response, evicting the least recently used responses until the cache fits in max_bytes.
+
+    Args:
+      key (str):              The key of the response.
+      response (Response):    The response, not streamed.
+      policy (CachePolicy):   How long the response is cached.
+      generation (int):       Generation from before the response was read, None to store it anyway.
+
+    Returns:
+      bool:                   True if stored, False if the cache is off, the response too large or purged since
+    """
+    if not self.enabled:
+      return False
+
+    body = response.get_data()
+    headers = list(response.headers.items())
+    size = len(key) + len(body) + sum(len(name) + len(value) for name, value in headers)
+
+    if size > self._max_entry:
+      return False
+
+    with self._lock:
+      if generation is not None and generation != self._generation:
+        return False
+
+      self._remove(key)
+      self._entries[key] = CachedResponse(body, response.status_code, headers, policy, time.monotonic(), size)
+      self._bytes += size
+
+      while self._bytes > self._max_bytes:
+        self._remove(next(iter(self._entries)))
+        self._evictions += 1
+
+    return True
+
+  def purge_prefix(self, *prefixes: str) -> int:
+    """Remove every response with a key starting with one of the prefixes.
+
+    Args:
+      prefixes (str): Prefixes of keys, like "/api/topics/1/".
+
+    Returns:
+      int:            Number of removed responses
+    """
+    with self._lock:
+      keys = [key for key in self._entries if key.startswith(prefixes)]
+
+      for key in keys:
+        self._remove(key)
+
+      self._generation += 1
+      self._purges += len(keys)
+      return len(keys)
+
+  def purge_topic(self, topic_id: int) -> int:
+    """Remove the responses of a topic, the topic and its pages, when its posts change.
+
+    Args:
+      topic_id (int): The id of the topic.
+
+    Returns:
+      int:            Number of removed responses
+    """
+    return self.purge_prefix(f"/api/topics/{topic_id}?", f"/api/topics/{topic_id}/")
+
+  def clear(self) -> None:
+    """Remove all responses, the counters are kept."""
+    with self._lock:
+      self._entries.clear()
+      self._bytes = 0
+
+  def stats(self) -> dict[str, Any]:
+    """Get the counters of the cache.
+
+    Returns:
+      dict: size, bytes, max_bytes, hits, stale_hits, misses, evictions and purges
+    """
+    with self._lock:
+      return {
+        "size": len(self._entries),
+        "bytes": self._bytes,
+        "max_bytes": self._max_bytes,
+        "hits": self._hits,
+        "stale_hits": self._stale_hits,
+        "misses": self._misses,
+        "evictions": self._evictions,
+        "purges": self._purges,
+      }
+
+  def serve(self, request: Request) -> Response | None:
+    """Get the cached response for a request, to be returned before the route is called.
+
+    A stale response is served while a background request refreshes it, a conditional request gets 304
+    if the cached response has the ETag or Last-Modified the client sent.
+
+    Args:
+      request (Request):  The request.
+
+    Returns:
+      Response:           The response, None if the request is not served from the cache
+    """
+    if not self._cacheable(request):
+      return None
+
+    g.response_cache_generation = self._generation
+
+    if request.environ.get(REFRESH_ENVIRON_KEY):
+      return None
+
+    cached = self.get(request.full_path)
+
+    if cached is None:
+      return None
+
+    entry, age = cached
+    if age >= entry.policy.max_age:
+      self._refresh(request)
+
+    g.response_cache_hit = True
+    response = Response(entry.body, status=entry.status, headers=entry.headers)
+    response.age = int(age)
+
+    return response.make_conditional(request)
+
+  def store(self, request: Request, response: Response) -> Response:
+    """Set the caching headers of a response to a cached route and store it, if the request is anonymous.
+
+    Args:
+      request (Request):    The request.
+      response (Response):  The response of the route.
+
+    Returns:
+      Response:             The same response
+    """
+    policy = self.policy(request)
+
+    if policy is None or g.get("response_cache_hit", False):
+      return response
+
+    response.vary.add("Authorization")
+
+    if not self._cacheable(request) or response.status_code != 200 or response.is_streamed:
+      return response
+
+    if "Set-Cookie" in response.headers:
+      return response
+
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = policy.max_age
+    if policy.stale_while_revalidate:
+      response.cache_control.stale_while_revalidate = policy.stale_while_revalidate
+
+    self.set(request.full_path, response, policy, g.get("response_cache_generation", -1))
+
+    return response
+
+  def _cacheable(self, request: Request) -> bool:
+    """True if the request can be served from and stored in the cache."""
+    return (
+      self.enabled
+      and request.method in READ_METHODS
+      and "Authorization" not in request.headers
+      and self.policy(request) is not None
+    )
+
+  def _refresh(self, request: Request) -> None:
+    """Send the request again on a background thread, unless it is already being refreshed."""
+    key = request.full_path
+
+    with self._lock:
+      if key in self._refreshing:
+        return
+      self._refreshing.add(key)
+
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    self._get_executor().submit(self._dispatch, app, key, request.host_url)
+
+  def _dispatch(self, app: Flask, key: str, base_url: str) -> None:
+    """Run a refreshing request through the app, store() keeps the new response."""
+    try:
+      with app.test_request_context(key, base_url=base_url, environ_overrides={REFRESH_ENVIRON_KEY: True}):
+        app.full_dispatch_request()
+    except Exception as err:  # pylint: disable=broad-except
+      printer.print_fail(err)
+    finally:
+      with self._lock:
+        self._refreshing.discard(key)
+
+  def _get_executor(self) -> ThreadPoolExecutor:
+    """Get the executor for refreshes, created on first use and again in a forked process."""
+    with self._lock:
+      if self._executor is None or self._executor_pid != os.getpid():
+        self._executor = ThreadPoolExecutor(RESPONSE_CACHE_WORKERS, thread_name_prefix="response-cache")
+        self._executor_pid = os.getpid()
+
+      return self._executor
+
+  def _remove(self, key: str) -> None:
+    """Remove a response if present, the lock is held by the caller."""
+    entry = self._entries.pop(key, None)
+
+    if entry is not None:
+      self._bytes -= entry.size
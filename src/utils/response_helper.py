@@ -30,6 +30,41 @@ class ResponseHelper:
 
     return response, status
 
+  def success_document_response(self, document: str, status: int = 200) -> tuple[str, int]:
+    """ Creates a success response around data that is already JSON, without decoding it.
+
+    Parameters:
+      document (str): JSON of the data to send in response
+      status(int):    Status to use for response, default 200
+
+    Returns:
+      str, int:       response as JSON equivalent to success_response(data) encoded by jsonify, status
+    """
+    return '{"data":' + document + ',"status":"success"}', status
+
+  def batch_response(self, results: list[dict[str, Any]], message: str | None = None) -> tuple[dict, int]:
+    """ Creates a response for a batch with a result for every item.
+
+    Parameters:
+      results (list): Result for every item, with the status of the item in "status"
+      message(str):   Message to send in response
+
+    Returns:
+      dict, int:      response dictionary, status 201 if all items are created, 207 if some are and 400 if none
+    """
+    created = sum(1 for result in results if result["status"] == 201)
+    status = 201 if created == len(results) else 207 if created > 0 else 400
+
+    response = {
+      "status": "success" if created > 0 else "error",
+      "data": results,
+    }
+
+    if message is not None:
+      response["message"] = message
+
+    return response, status
+
   def error_response(self, errorcode: int = 400, message: str | None = None, details: str | None = None) -> tuple[dict, int]:
     """ Creates a error response.
 
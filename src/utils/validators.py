@@ -0,0 +1,63 @@
+"""
+Validators for conditional GET, an ETag and a Last-Modified time computed from the version of the data
+instead of from the response body.
+
+A client that sends the ETag back in If-None-Match, or the time in If-Modified-Since, gets 304 Not Modified
+without the body being read or encoded. If-None-Match wins when both are sent.
+"""
+from __future__ import annotations
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+from flask import Request
+
+
+class Validator(NamedTuple):
+  """ETag and Last-Modified of a response."""
+  etag: str
+  last_modified: datetime | None
+
+
+def make_validator(version: Any, modified: str | None = None) -> Validator:
+  """Make the validator of a response.
+
+  Args:
+    version (any):    Values that change with every change of the response, like the version of a topic.
+    modified (str):   Time of the latest change, a timestamp from the database in UTC, None if not known.
+
+  Returns:
+    Validator:        The weak ETag and the Last-Modified time
+  """
+  etag = hashlib.blake2b(repr(version).encode("utf-8"), digest_size=8).hexdigest()
+
+  return Validator(etag, _parse_timestamp(modified))
+
+
+def is_not_modified(validator: Validator, request: Request) -> bool:
+  """Check the conditional headers of a request against a validator.
+
+  Args:
+    validator (Validator):  The validator of the current data.
+    request (Request):      The request.
+
+  Returns:
+    bool:                   True if the client already has the current data
+  """
+  if request.if_none_match:
+    return request.if_none_match.contains_weak(validator.etag)
+
+  if validator.last_modified is None or request.if_modified_since is None:
+    return False
+
+  return validator.last_modified <= request.if_modified_since
+
+
+def _parse_timestamp(timestamp: str | None) -> datetime | None:
+  """Read a timestamp from the database as UTC, None if it is missing or not a timestamp."""
+  if timestamp is None:
+    return None
+
+  try:
+    return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc)
+  except ValueError:
+    return None
@@ -0,0 +1,73 @@
+import os
+import json
+import sqlite3
+import pytest
+from db.load import find_sources, load
+
+base_dir = os.path.dirname(__file__)
+test_db = os.path.join(base_dir, "test_load.sqlite")
+
+
+@pytest.fixture
+def sources(tmp_path):
+  """A directory with users as CSV and 25 posts in two topics as NDJSON."""
+  (tmp_path / "user.csv").write_text("id,username,signature\n1,admin,Hi\n2,tony,\n")
+
+  with open(tmp_path / "post.ndjson", "w") as f:
+    for i in range(25):
+      f.write(json.dumps({"id": i + 1, "author": 1, "topic_id": 1 + i % 2, "body": f"Post {i}"}) + "\n")
+
+  yield tmp_path
+
+  for suffix in ("", "-wal", "-shm"):
+    if os.path.exists(test_db + suffix):
+      os.remove(test_db + suffix)
+
+
+def schema_objects(conn: sqlite3.Connection) -> set[str]:
+  """Names of all indexes and triggers."""
+  return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+
+
+@pytest.mark.integration
+class TestIntegrationLoad:
+  """Integration tests for the bulk loader."""
+
+  def test_load_order(self, sources):
+    """Test that users are loaded before posts."""
+    assert [os.path.basename(path) for path in find_sources([str(sources)])] == ["user.csv", "post.ndjson"]
+
+  def test_load(self, sources):
+    """Test that everything is loaded, with the schema, indexes and page index in place."""
+    assert load(test_db, find_sources([str(sources)]), chunk_size=10) == 27
+
+    conn = sqlite3.connect(test_db)
+    assert conn.execute("SELECT signature FROM user ORDER BY id").fetchall() == [("Hi", ), (None, )]
+    assert conn.execute("SELECT COUNT(*) FROM post").fetchone()[0] == 25
+    assert conn.execute("SELECT topic_id, COUNT(*) FROM post_page GROUP BY topic_id").fetchall() == [(1, 2), (2, 2)]
+    assert {"post_topic_created_IDX", "post_author_created_IDX", "trg_update_post"} <= schema_objects(conn)
+    assert not conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '_load%'").fetchall()
+    conn.close()
+
+  def test_resume(self, sources):
+    """Test that a load interrupted by a bad row continues after the last committed chunk."""
+    posts = sources / "post.ndjson"
+    lines = posts.read_text().splitlines()
+    posts.write_text("\n".join(lines[:15] + ["{broken"] + lines[15:]) + "\n")
+
+    with pytest.raises(json.JSONDecodeError):
+      load(test_db, find_sources([str(sources)]), chunk_size=10)
+
+    conn = sqlite3.connect(test_db)
+    assert conn.execute("SELECT COUNT(*) FROM post").fetchone()[0] == 10
+    assert "post_author_created_IDX" not in schema_objects(conn)
+    conn.close()
+
+    posts.write_text("\n".join(lines) + "\n")
+    assert load(test_db, find_sources([str(sources)]), chunk_size=10) == 15
+
+    conn = sqlite3.connect(test_db)
+    assert conn.execute("SELECT COUNT(*), COUNT(DISTINCT id) FROM post").fetchone() == (25, 25)
+    assert conn.execute("SELECT COUNT(*) FROM user").fetchone()[0] == 2
+    assert "post_author_created_IDX" in schema_objects(conn)
+    conn.close()
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+import pytest
+from db.migrate import load_migrations, migrate, current_version
+
+base_dir = os.path.dirname(__file__)
+test_db = os.path.join(base_dir, "test_migrate.sqlite")
+
+OLD_SCHEMA = """
+CREATE TABLE user (id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL UNIQUE);
+CREATE UNIQUE INDEX user_id_IDX ON user (id);
+CREATE TABLE category (id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, category TEXT(35) NOT NULL, description TEXT);
+CREATE TABLE topic (
+  id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, created_by INTEGER NOT NULL, category INTEGER NOT NULL,
+  title TEXT NOT NULL, created TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL, deleted TIMESTAMP
+);
+CREATE UNIQUE INDEX topic_id_IDX ON topic (id);
+CREATE TABLE post (
+  id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, author INTEGER NOT NULL, topic_id INTEGER NOT NULL,
+  created TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL, deleted TIMESTAMP, title TEXT, body TEXT NOT NULL
+);
+CREATE UNIQUE INDEX post_id_IDX ON post (id);
+"""
+
+
+@pytest.fixture
+def conn():
+  """Connection to a database with the schema from before the migrations."""
+  conn = sqlite3.connect(test_db)
+  conn.executescript(OLD_SCHEMA)
+  conn.executemany(
+    "INSERT INTO post (author, topic_id, body, created) VALUES (1, ?, 'body', ?)",
+    [(1 + i % 2, f"2024-06-{1 + i:02} 10:00:00") for i in range(25)]
+  )
+  conn.executemany("INSERT INTO category (category) VALUES (?)", [("Things", ), ("Empty", )])
+  conn.executemany("INSERT INTO topic (created_by, category, title) VALUES (1, 1, ?)", [("One", ), ("Two", )])
+  conn.commit()
+  yield conn
+  conn.close()
+  os.remove(test_db)
+
+
+def index_names(conn: sqlite3.Connection) -> set[str]:
+  """Names of all indexes created with CREATE INDEX."""
+  return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")}
+
+
+@pytest.mark.integration
+class TestIntegrationMigrate:
+  """Integration tests for the migration runner."""
+
+  def test_migrate_live_database(self, conn):
+    """Test that all migrations apply to an old database and keep its data."""
+    migrations = load_migrations()
+    applied = migrate(conn, migrations)
+
+    assert applied == [version for version, _, _ in migrations]
+    assert current_version(conn) == migrations[-1][0]
+    assert {"user_id_IDX", "topic_id_IDX", "post_id_IDX"}.isdisjoint(index_names(conn))
+    assert {"post_topic_created_IDX", "topic_created_IDX"} <= index_names(conn)
+    assert conn.execute("SELECT COUNT(*) FROM post_page").fetchone()[0] == 4
+    assert conn.execute("SELECT id, post_count, last_post_id, last_post_at FROM topic").fetchall() == [
+      (1, 13, 25, "2024-06-25 10:00:00"), (2, 12, 24, "2024-06-24 10:00:00")
+    ]
+    assert conn.execute("SELECT id, topic_count FROM category").fetchall() == [(1, 2), (2, 0)]
+
+  def test_migrate_twice(self, conn):
+    """Test that nothing is applied to an up to date database."""
+    migrate(conn, load_migrations())
+
+    assert migrate(conn, load_migrations()) == []
+
+  def test_migrate_target(self, conn):
+    """Test that migrations after target are not applied."""
+    assert migrate(conn, load_migrations(), target=1) == [1]
+    assert current_version(conn) == 1
+
+  def test_failing_migration_rolls_back(self, conn):
+    """Test that a failing migration leaves the database at the version before it."""
+    migrations = [(1, "works", "CREATE TABLE works (id INTEGER);"), (2, "fails", "CREATE TABLE x (id); SELECT * FROM nope;")]
+
+    with pytest.raises(sqlite3.OperationalError):
+      migrate(conn, migrations)
+
+    assert current_version(conn) == 1
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'x'").fetchone() is None
+
+  def test_failing_hook_rolls_back(self, conn):
+    """Test that a failing hook rolls back the migration it belongs to."""
+    def fail(cur):
+      cur.execute("SELECT * FROM nope")
+
+    with pytest.raises(sqlite3.OperationalError):
+      migrate(conn, [(1, "works", "CREATE TABLE works (id INTEGER);")], hooks={(1, "works"): fail})
+
+    assert current_version(conn) == 0
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'works'").fetchone() is None
+
+  def test_ddl_is_latest_version(self):
+    """Test that a database from ddl.sql is at the version of the latest migration."""
+    conn = sqlite3.connect(":memory:")
+    with open("./db/ddl.sql", "r") as f:
+      conn.executescript(f.read())
+
+    assert current_version(conn) == load_migrations()[-1][0]
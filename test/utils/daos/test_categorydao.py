@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import pytest
+import unittest.mock as mock
+from src.errors.customerrors import NoDataException
+from src.utils.daos import CategoryDAO, TopicDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.services.category_service import CategoryService
+
+base_dir = os.path.dirname(__file__)
+test_db = os.path.join(base_dir, "test_data/test_category.sqlite")
+
+
+@pytest.fixture
+def pool():
+  """Pool for a test database with the test data."""
+  conn = sqlite3.connect(test_db)
+
+  for file in ["./db/ddl.sql", os.path.join(base_dir, "test_data/insert.sql")]:
+    with open(file, 'r') as f:
+      conn.executescript(f.read())
+
+  conn.commit()
+  conn.close()
+
+  pool = ConnectionPool(test_db, size=2)
+  yield pool
+  pool.close()
+  os.remove(test_db)
+
+
+@pytest.mark.integration
+class TestIntegrationCategoryDAO:
+  """Integration tests for categories and the topics in them."""
+
+  def test_get_all(self, pool):
+    """Test that all categories are read in the order of their ids."""
+    categories = CategoryDAO("category", pool).get_all()
+
+    assert [category["category_id"] for category in categories] == [1, 2, 3, 4]
+    assert categories[1] == {"category_id": 2, "category": "AI", "description": None}
+
+  def test_topic_counts_follow_writes(self, pool):
+    """Test that the topic counts follow created, moved, deleted and restored topics."""
+    dao = CategoryDAO("category", pool)
+    topic_dao = TopicDAO("topic", pool)
+
+    assert dao.get_topic_counts() == {1: 0, 2: 2, 3: 0, 4: 1}
+
+    topic = topic_dao.create({"created_by": 1, "title": "New", "category": 1})
+    topic_dao.update(1, {"category": 3})
+    topic_dao.delete(2)
+
+    assert dao.get_topic_counts() == {1: 1, 2: 0, 3: 1, 4: 1}
+
+    topic_dao.update(topic["topic_id"], {"deleted": None})
+    topic_dao.update(2, {"deleted": None})
+
+    assert dao.get_topic_counts() == {1: 1, 2: 1, 3: 1, 4: 1}
+
+  def test_category_topics(self, pool):
+    """Test that the topics of a category are read newest first, page by page, without deleted ones."""
+    topic_dao = TopicDAO("topic", pool)
+    conn = sqlite3.connect(test_db)
+    conn.executemany(
+      "INSERT INTO topic (created_by, category, title, created) VALUES (1, 1, ?, ?)",
+      [(f"Topic {i}", f"2024-06-{1 + i % 3:02} 10:00:00") for i in range(7)]
+    )
+    conn.execute("UPDATE topic SET deleted = CURRENT_TIMESTAMP WHERE title = 'Topic 6'")
+    conn.commit()
+    conn.close()
+
+    first = topic_dao.get_category_topics(1, 4)
+    second = topic_dao.get_category_topics(1, 4, (first[-1]["created"], first[-1]["topic_id"]))
+    keys = [(topic["created"], topic["topic_id"]) for topic in first + second]
+
+    assert len(keys) == 6
+    assert keys == sorted(keys, reverse=True)
+    assert all(topic["category"] == 1 for topic in first + second)
+
+  def test_service_snapshot(self, pool):
+    """Test that the service reads categories from its snapshot, which cannot be changed."""
+    service = CategoryService(CategoryDAO("category", pool), TopicDAO("topic", pool))
+    page = service.get_category_topics("2")
+
+    assert service.get_by_id("4") == {
+      "category_id": 4, "category": "Back in buisness", "description": "Mistakes were made", "topic_count": 1
+    }
+    assert page["category"]["category"] == "AI"
+    assert [topic["topic_id"] for topic in page["topics"]] == [2, 1]
+    assert page["next"] is None
+
+    with pytest.raises(TypeError):
+      service._categories[9] = {}
+
+    with pytest.raises(NoDataException):
+      service.get_category_topics("9")
+
+  def test_service_lazy_snapshot(self, pool):
+    """Test that the service reads the categories once, on first use and not when it is created."""
+    dao = CategoryDAO("category", pool)
+
+    with mock.patch.object(dao, "get_all", wraps=dao.get_all) as get_all:
+      service = CategoryService(dao, TopicDAO("topic", pool))
+      assert get_all.call_count == 0
+
+      assert len(service.get_all()) == 4
+      assert service.get_by_id("2")["category"] == "AI"
+      assert get_all.call_count == 1
+
+  def test_get_many(self, pool):
+    """Test that many categories and topics are read in the order of the ids, with None for missing ones."""
+    categories = CategoryDAO("category", pool).get_many([4, 9, 2])
+    topics = TopicDAO("topic", pool).get_many([4, 3, 1])
+
+    assert [None if category is None else category["category"] for category in categories] == [
+      "Back in buisness", None, "AI"
+    ]
+    assert [None if topic is None else topic["title"] for topic in topics] == ["Magnus Tolander", None, "Donald Trump"]
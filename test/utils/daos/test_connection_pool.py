@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import pytest
+from src.utils.daos.connection_pool import ConnectionPool
+
+base_dir = os.path.dirname(__file__)
+test_db = os.path.join(base_dir, "test_data/test_pool.sqlite")
+
+
+@pytest.fixture
+def sut():
+  """SUT for pool tests, a pool with two connections."""
+  conn = sqlite3.connect(test_db)
+  conn.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)")
+  conn.commit()
+  conn.close()
+
+  sut = ConnectionPool(test_db, size=2, timeout=0.1)
+  yield sut
+  sut.close()
+  os.remove(test_db)
+
+
+@pytest.mark.unit
+class TestUnitConnectionPool:
+  """Unit tests for the connection pool."""
+
+  def test_reuses_connection(self, sut):
+    """Test that a closed connection is handed out again."""
+    conn = sut.acquire()
+    raw = conn._connection
+    conn.close()
+
+    assert sut.acquire()._connection is raw
+
+  def test_close_twice(self, sut):
+    """Test that closing a pooled connection twice only gives it back once."""
+    conn = sut.acquire()
+    conn.close()
+    conn.close()
+
+    assert len(sut._idle) == 1
+
+  def test_exhausted(self, sut):
+    """Test that checking out more than size connections times out."""
+    sut.acquire()
+    sut.acquire()
+
+    with pytest.raises(sqlite3.OperationalError):
+      sut.acquire()
+
+  def test_rollback_on_release(self, sut):
+    """Test that an uncommitted transaction is rolled back when given back."""
+    conn = sut.acquire()
+    conn.execute("INSERT INTO item (name) VALUES ('not committed')")
+    conn.close()
+
+    conn = sut.acquire()
+    assert conn.execute("SELECT COUNT(*) FROM item").fetchone()[0] == 0
+
+  def test_health_check_replaces_broken(self, sut):
+    """Test that a broken idle connection is replaced on checkout."""
+    sut._health_check_interval = 0
+    conn = sut.acquire()
+    raw = conn._connection
+    conn.close()
+    raw.close()
+
+    conn = sut.acquire()
+
+    assert conn._connection is not raw
+    assert conn.execute("SELECT 1").fetchone() == (1, )
+
+  def test_fork_drops_inherited(self, sut):
+    """Test that connections opened in another process are not reused."""
+    conn = sut.acquire()
+    raw = conn._connection
+    conn.close()
+    sut._pid = -1
+
+    assert sut.acquire()._connection is not raw
+    assert raw in sut._abandoned
+
+  def test_pooling_disabled(self):
+    """Test that size 0 opens and closes a connection for every checkout."""
+    sut = ConnectionPool(":memory:", size=0)
+    conn = sut.acquire()
+    raw = conn._connection
+    conn.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+      raw.execute("SELECT 1")
+
+  @pytest.mark.parametrize("profile, expected",[
+    ("default", ("delete", 2)),
+    ("read-heavy", ("wal", 1)),
+    ("durable", ("wal", 2)),
+  ])
+  def test_profile(self, sut, profile, expected):
+    """Test that new connections get the pragmas of the profile."""
+    pool = ConnectionPool(test_db, size=1, profile=profile)
+    conn = pool.acquire()
+    pragmas = tuple(conn.execute(f"PRAGMA {name}").fetchone()[0] for name in ("journal_mode", "synchronous"))
+    conn.close()
+    pool.close()
+
+    assert pragmas == expected
+
+  def test_unknown_profile(self):
+    """Test that an unknown profile is refused."""
+    with pytest.raises(ValueError):
+      ConnectionPool(":memory:", profile="fast")
+
+  def test_read_only(self, sut):
+    """Test that a read-only pool can read but not write."""
+    pool = ConnectionPool(test_db, size=1, read_only=True)
+    conn = pool.acquire()
+
+    assert conn.execute("SELECT COUNT(*) FROM item").fetchone() == (0, )
+    with pytest.raises(sqlite3.OperationalError):
+      conn.execute("INSERT INTO item (name) VALUES ('read-only')")
+
+    conn.close()
+    pool.close()
@@ -6,6 +6,13 @@ INSERT INTO user (id, username, role) VALUES (1, "admin", "admin");
 INSERT INTO user (id, username, role) VALUES (3, "moderator", "moderator");
 INSERT INTO user (id, username) VALUES (5, "johndoe");
 
+-- category
+
+INSERT INTO category (id, category, description) VALUES (1, "Things", "Just things");
+INSERT INTO category (id, category) VALUES (2, "AI");
+INSERT INTO category (id, category, description) VALUES (3, "Other things", "Never ends");
+INSERT INTO category (id, category, description) VALUES (4, "Back in buisness", "Mistakes were made");
+
 -- topic
 
 INSERT INTO topic (id, created_by, category, title) VALUES (1, 1, 2, "Donald Trump");
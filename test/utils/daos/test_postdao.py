@@ -1,9 +1,13 @@
+import json
 import os
 import re
 import pytest
 import sqlite3
 import unittest.mock as mock
+from src.utils.cache import PageSummary
+from src.utils.daos.basedao import Ownership
 from src.utils.daos.postdao import PostDAO
+from src.utils.daos.topicdao import TopicDAO
 
 base_dir = os.path.dirname(__file__)
 test_db = os.path.join(base_dir, "test_data/test_db.sqlite")
@@ -70,7 +74,7 @@ class TestIntegrationPostDAO:
   ])
   def test_get_post_and_topic(self, sut_int, topic_id, page, expected_posts):
     """Test get topic and posts, check amount."""
-    data = sut_int.get_posts_and_topic(topic_id, page)
+    data = json.loads(sut_int.get_page_json(topic_id, page)[0])
 
     assert len(data["posts"]) == expected_posts
   
@@ -80,6 +84,174 @@ class TestIntegrationPostDAO:
   ])
   def test_get_post_and_topic_last_body(self, sut_int, topic_id, page, expected_first, expected_last):
     """Test get topic and posts, check last body message."""
-    data = sut_int.get_posts_and_topic(topic_id, page)
+    data = json.loads(sut_int.get_page_json(topic_id, page)[0])
 
     assert data["posts"][0]["body"] == expected_first and data["posts"][-1]["body"] == expected_last
+
+  @pytest.mark.parametrize("index", [True, False])
+  def test_page_json_same_as_dicts(self, sut_int, index):
+    """Test that the JSON document and summary match get_page and TopicDAO.get_one, with or without page index."""
+    if not index:
+      conn = sqlite3.connect(test_db)
+      conn.execute("DELETE FROM post_page")
+      conn.commit()
+      conn.close()
+
+    topic_dao = TopicDAO("topic", sut_int._pool)
+
+    for page in (0, 1, 2):
+      document, summary = sut_int.get_page_json(1, page)
+      posts, pages = sut_int.get_page(1, page)
+      data = {"pages": pages, "posts": posts, "topic": topic_dao.get_one(1)}
+
+      assert json.loads(document) == data
+      assert summary == PageSummary.of({**data, "next": "token" if len(posts) == sut_int.PAGE_SIZE else None})
+
+    assert sut_int.get_page_json(200, 0) is None
+
+  @pytest.mark.parametrize("topic_id, page",[
+    (1, 1),
+    (4, 0),
+  ])
+  def test_get_post_and_users_after(self, sut_int, topic_id, page):
+    """Test that keyset pagination returns the same page as offset pagination."""
+    previous = sut_int.get_post_and_users_with_pagination(topic_id, page - 1) if page > 0 else []
+    after = (previous[-1]["created"], previous[-1]["post_id"]) if previous else None
+
+    result = sut_int.get_post_and_users_after(topic_id, after)
+
+    assert result == sut_int.get_post_and_users_with_pagination(topic_id, page)
+
+  @pytest.mark.parametrize("topic_id, page, expected_pages",[
+    (1, 0, 2),
+    (1, 1, 2),
+    (1, 2, 2),
+    (2, 0, 0),
+  ])
+  def test_get_page_without_index(self, sut_int, topic_id, page, expected_pages):
+    """Test that pages are read before the page index is built for a topic."""
+    posts, pages = sut_int.get_page(topic_id, page)
+
+    assert pages == expected_pages
+    assert posts == sut_int.get_post_and_users_with_pagination(topic_id, page)
+
+  @pytest.mark.parametrize("deleted, created, expected_pages",[
+    ((), 0, 2),
+    ((1, 16), 0, 2),
+    ((6, 7, 8, 10, 11), 0, 1),
+    ((), 5, 2),
+    ((), 7, 3),
+  ])
+  def test_page_index_maintained(self, sut_int, deleted, created, expected_pages):
+    """Test that the page index follows deletes and creates of posts."""
+    sut_int.rebuild_page_index()
+
+    for id_num in deleted:
+      sut_int.delete(id_num)
+
+    for _ in range(created):
+      sut_int.create({"author": 1, "topic_id": 1, "body": "New post"})
+
+    conn = sqlite3.connect(test_db)
+    index = conn.execute("SELECT page, post_id FROM post_page WHERE topic_id = 1 ORDER BY page").fetchall()
+    conn.close()
+    sut_int.rebuild_page_index(1)
+
+    assert sut_int.get_page_count(1) == expected_pages
+    for page in range(expected_pages + 1):
+      assert sut_int.get_page(1, page)[0] == sut_int.get_post_and_users_with_pagination(1, page)
+
+    conn = sqlite3.connect(test_db)
+    assert conn.execute("SELECT page, post_id FROM post_page WHERE topic_id = 1 ORDER BY page").fetchall() == index
+    conn.close()
+
+  def test_create_many(self, sut_int):
+    """Test that many posts are created in order, over several statements, and the page index follows."""
+    sut_int.rebuild_page_index()
+    sut_int.INSERT_BATCH_ROWS = 7
+    data = [{"author": 1, "topic_id": 1 + i % 2, "body": f"Post {i}"} for i in range(20)]
+
+    posts = sut_int.create_many(data)
+
+    assert [post["body"] for post in posts] == [item["body"] for item in data]
+    assert [post["post_id"] for post in posts] == sorted(post["post_id"] for post in posts)
+    assert sut_int.get_one(posts[0]["post_id"])["body"] == "Post 0"
+    for topic_id in (1, 2):
+      pages = sut_int.get_page_count(topic_id)
+      for page in range(pages + 1):
+        assert sut_int.get_page(topic_id, page)[0] == sut_int.get_post_and_users_with_pagination(topic_id, page)
+
+  def test_topic_activity(self, sut_int):
+    """Test that the triggers keep the post count and latest post of a topic on creates and deletes."""
+    before = sut_int.get_topic_activity(1)
+    post = sut_int.create({"author": 1, "topic_id": 1, "body": "New post"})
+
+    assert sut_int.get_topic_activity(1) == {
+      "post_count": before["post_count"] + 1, "last_post_id": post["post_id"], "last_post_at": post["created"],
+      "version": before["version"] + 1
+    }
+
+    sut_int.delete(post["post_id"])
+
+    after = sut_int.get_topic_activity(1)
+
+    assert {**after, "version": before["version"]} == before
+    assert after["version"] > before["version"] + 1
+    assert sut_int.get_topic_activity(2) == {"post_count": 0, "last_post_id": None, "last_post_at": None, "version": 0}
+
+  @pytest.mark.parametrize("post_id, author, expected, body",[
+    (2, 3, Ownership.WRITTEN, "Edited"),
+    (2, 1, Ownership.NOT_OWNER, "Has title."),
+    (3, 5, Ownership.NOT_FOUND, None),
+    (200, 1, Ownership.NOT_FOUND, None),
+  ])
+  def test_write_owned(self, sut_int, post_id, author, expected, body):
+    """Test that owned updates and deletes tell apart written, not owned and missing or deleted posts."""
+    outcome, topic_id = sut_int.update_owned(post_id, author, {"body": "Edited"})
+
+    assert (outcome, topic_id) == (expected, 1 if expected is Ownership.WRITTEN else None)
+    assert (sut_int.get_one(post_id) or {}).get("body") == body
+
+    outcome, post = sut_int.delete_owned(post_id, author)
+
+    assert outcome == expected
+    assert (post is None) == (expected is not Ownership.WRITTEN)
+    assert (sut_int.get_one(post_id) is None) == (expected is not Ownership.NOT_OWNER)
+
+  def test_get_many(self, sut_int):
+    """Test that many posts are read in the order of the ids, with None for deleted and missing posts."""
+    posts = sut_int.get_many([5, 1, 3, 200, 1])
+
+    assert [None if post is None else post["post_id"] for post in posts] == [5, 1, None, None, 1]
+    assert posts[0]["author"]["username"] == "moderator"
+    assert posts[1] == sut_int.get_one(1)
+
+  def test_get_user_posts(self, sut_int):
+    """Test that the posts of a user are read newest first, page by page and without deleted posts."""
+    first = sut_int.get_user_posts(1, 5)
+    second = sut_int.get_user_posts(1, 20, (first[-1]["created"], first[-1]["post_id"]))
+    created = [post["created"] for post in first + second]
+
+    assert len(first) == 5 and len(second) == 8
+    assert created == sorted(created, reverse=True)
+    assert {post["author"]["user_id"] for post in first + second} == {1}
+    assert 9 not in [post["post_id"] for post in first + second]
+
+  def test_versions_follow_changes(self, sut_int):
+    """Test that the version of a topic follows edited and deleted posts and renamed authors."""
+    topic_dao = TopicDAO("topic", sut_int._pool)
+    before = sut_int.get_version(2)[0]
+
+    sut_int.update(2, {"body": "Edited"})
+    edited = topic_dao.get_version(1)[0]
+    sut_int.delete(4)
+    deleted = topic_dao.get_version(4)[0]
+
+    conn = sqlite3.connect(test_db)
+    conn.execute("UPDATE user SET username = 'renamed' WHERE id = 3")
+    conn.commit()
+    conn.close()
+
+    assert before < edited < sut_int.get_version(2)[0]
+    assert deleted < topic_dao.get_version(4)[0]
+    assert sut_int.get_version(4) is None
@@ -0,0 +1,64 @@
+import os
+import sqlite3
+import pytest
+import unittest.mock as mock
+from src.utils.daos import TopicDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.replica import Replica
+
+base_dir = os.path.dirname(__file__)
+test_db = os.path.join(base_dir, "test_data/test_db.sqlite")
+replica_db = os.path.join(base_dir, "test_data/test_replica.sqlite")
+
+
+@pytest.fixture
+def pools():
+  """Pools for a test database with the test data and for its replica."""
+  conn = sqlite3.connect(test_db)
+
+  for file in ["./db/ddl.sql", os.path.join(base_dir, "test_data/insert.sql")]:
+    with open(file, 'r') as f:
+      conn.executescript(f.read())
+
+  conn.commit()
+  conn.close()
+
+  pool = ConnectionPool(test_db, size=2)
+  read_pool = ConnectionPool(test_db, size=2, read_only=True)
+  replica = Replica(read_pool, replica_db, interval=60)
+  replica.refresh()
+  replica_pool = ConnectionPool(replica_db, size=2, read_only=True)
+  yield pool, read_pool, replica, replica_pool
+
+  for each in (pool, read_pool, replica_pool):
+    each.close()
+  os.remove(test_db)
+  os.remove(replica_db)
+
+
+@pytest.mark.integration
+class TestIntegrationReplica:
+  """Integration tests for read-only pools and the replica."""
+
+  def test_reads_on_read_pool(self, pools):
+    """Test that DAO reads use the read pool and writes the read-write pool."""
+    pool, read_pool, _, _ = pools
+    dao = TopicDAO("topic", pool, read_pool=read_pool)
+
+    with mock.patch.object(pool, "acquire", wraps=pool.acquire) as acquire:
+      with mock.patch.object(read_pool, "acquire", wraps=read_pool.acquire) as read_acquire:
+        dao.get_one(1)
+        dao.get_latest_topics(5)
+        dao.delete(1)
+
+    assert (read_acquire.call_count, acquire.call_count) == (2, 1)
+
+  def test_refresh(self, pools):
+    """Test that the replica sees writes after a refresh only."""
+    pool, _, replica, replica_pool = pools
+    dao = TopicDAO("topic", pool, read_pool=replica_pool)
+    dao.delete(1)
+
+    assert dao.get_one(1) is not None
+    replica.refresh()
+    assert dao.get_one(1) is None
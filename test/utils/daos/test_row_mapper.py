@@ -0,0 +1,34 @@
+import pytest
+from src.utils.daos.row_mapper import RowMapper
+
+
+@pytest.mark.unit
+class TestUnitRowMapper:
+  """Unit tests for the row mapper."""
+
+  def test_map_nested(self):
+    """Test that nested columns end up in their own dictionary, after the other keys."""
+    sut = RowMapper(("post_id", "body"), author=("user_id", "username"))
+
+    result = sut((1, "Body", 5, "johndoe"))
+
+    assert result == {"post_id": 1, "body": "Body", "author": {"user_id": 5, "username": "johndoe"}}
+    assert list(result) == ["post_id", "body", "author"]
+
+  def test_map_one_none(self):
+    """Test that map_one passes on None from fetchone."""
+    assert RowMapper(("id", )).map_one(None) is None
+
+  def test_map_all(self):
+    """Test that every row is mapped to a new dictionary."""
+    sut = RowMapper(("id", "name"))
+
+    result = sut.map_all([(1, "a"), (2, "b")])
+
+    assert result == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+  def test_odd_column_names(self):
+    """Test that any column name can be a key."""
+    sut = RowMapper(("it's", "}{"))
+
+    assert sut(("a", "b")) == {"it's": "a", "}{": "b"}
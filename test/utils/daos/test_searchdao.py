@@ -0,0 +1,87 @@
+import os
+import sqlite3
+import pytest
+from src.utils.daos import PostDAO, SearchDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.services.search_service import SearchService
+
+base_dir = os.path.dirname(__file__)
+test_db = os.path.join(base_dir, "test_data/test_search.sqlite")
+
+
+@pytest.fixture
+def pool():
+  """Pool for a test database with the test data."""
+  conn = sqlite3.connect(test_db)
+
+  for file in ["./db/ddl.sql", os.path.join(base_dir, "test_data/insert.sql")]:
+    with open(file, 'r') as f:
+      conn.executescript(f.read())
+
+  conn.commit()
+  conn.close()
+
+  pool = ConnectionPool(test_db, size=2)
+  yield pool
+  pool.close()
+  os.remove(test_db)
+
+
+@pytest.mark.integration
+class TestIntegrationSearchDAO:
+  """Integration tests for the search."""
+
+  def test_search_posts_and_topics(self, pool):
+    """Test that posts and topics are found, the best match first."""
+    results = SearchDAO("search", pool).search('"biden"')
+
+    assert [(result["kind"], result["id"]) for result in results] == [("post", 2), ("topic", 2)]
+    assert results[0]["snippet"] == "Joe Biden"
+
+  def test_deleted_excluded(self, pool):
+    """Test that deleted posts are not found."""
+    assert SearchDAO("search", pool).search('"deleted"') == []
+
+  def test_index_follows_writes(self, pool):
+    """Test that the triggers keep the index up to date when posts are created, edited and deleted."""
+    sut = SearchDAO("search", pool)
+    posts = PostDAO("post", pool)
+    post = posts.create({"author": 1, "topic_id": 1, "body": "A zebra"})
+
+    assert [result["id"] for result in sut.search('"zebra"')] == [post["post_id"]]
+
+    posts.update(post["post_id"], {"body": "A giraffe"})
+
+    assert sut.search('"zebra"') == [] and len(sut.search('"giraffe"')) == 1
+
+    posts.delete(post["post_id"])
+
+    assert sut.search('"giraffe"') == []
+
+  def test_pages(self, pool):
+    """Test that the pages from the next tokens have all results once, in the same order."""
+    sut = SearchDAO("search", pool)
+    everything = sut.search('"title"')
+    service = SearchService(sut)
+    sut.PAGE_SIZE = 3
+    results, after = [], None
+
+    while True:
+      page = service.search("title", after)
+      results += page["results"]
+      after = page["next"]
+      if after is None:
+        break
+
+    assert [(result["kind"], result["id"]) for result in results] == [(row["kind"], row["id"]) for row in everything]
+
+  @pytest.mark.parametrize("query",[
+    ('"title'),
+    ("title OR"),
+    ("NEAR(title"),
+  ])
+  def test_query_syntax_ignored(self, pool, query):
+    """Test that FTS5 syntax in a search is ignored instead of failing."""
+    results = SearchService(SearchDAO("search", pool)).search(query)["results"]
+
+    assert isinstance(results, list)
@@ -0,0 +1,42 @@
+import os
+import sqlite3
+import pytest
+from src.utils.daos import TopicDAO
+from src.utils.daos.connection_pool import ConnectionPool
+
+base_dir = os.path.dirname(__file__)
+test_db = os.path.join(base_dir, "test_data/test_topic.sqlite")
+
+
+@pytest.fixture
+def pool():
+  """Pool for a test database with the test data."""
+  conn = sqlite3.connect(test_db)
+
+  for file in ["./db/ddl.sql", os.path.join(base_dir, "test_data/insert.sql")]:
+    with open(file, 'r') as f:
+      conn.executescript(f.read())
+
+  conn.commit()
+  conn.close()
+
+  pool = ConnectionPool(test_db, size=2)
+  yield pool
+  pool.close()
+  os.remove(test_db)
+
+
+@pytest.mark.integration
+class TestIntegrationTopicDAO:
+  """Integration tests for topics."""
+
+  def test_get_user_topics(self, pool):
+    """Test that the topics created by a user are read newest first, page by page."""
+    dao = TopicDAO("topic", pool)
+    newest = dao.create({"created_by": 1, "title": "Newest", "category": 1})
+    first = dao.get_user_topics(1, 1)
+
+    assert [topic["topic_id"] for topic in first] == [newest["topic_id"]]
+    assert [topic["title"] for topic in dao.get_user_topics(1, 10, (first[0]["created"], first[0]["topic_id"]))] == [
+      "Magnus Tolander", "Donald Trump"
+    ]
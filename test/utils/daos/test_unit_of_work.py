@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import pytest
+import unittest.mock as mock
+from flask import Flask
+from src.utils.daos import PostDAO, TopicDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.unit_of_work import begin_unit_of_work, end_unit_of_work, run_after_commit
+
+base_dir = os.path.dirname(__file__)
+test_db = os.path.join(base_dir, "test_data/test_db.sqlite")
+
+
+@pytest.fixture
+def pool():
+  """Pool for a test database with the test data."""
+  test_data = os.path.join(base_dir, "test_data/insert.sql")
+  conn = sqlite3.connect(test_db)
+
+  for file in ["./db/ddl.sql", test_data]:
+    with open(file, 'r') as f:
+      conn.executescript(f.read())
+
+  conn.commit()
+  conn.close()
+
+  with mock.patch("src.utils.daos.basedao.os.environ.get") as db_path:
+    db_path.return_value = test_db
+    pool = ConnectionPool(test_db, size=2)
+    yield pool
+    pool.close()
+    os.remove(test_db)
+
+
+@pytest.fixture
+def app():
+  """Flask app to get a request context from."""
+  return Flask(__name__)
+
+
+@pytest.mark.integration
+class TestIntegrationUnitOfWork:
+  """Integration tests for the unit of work."""
+
+  def test_one_connection_per_request(self, pool, app):
+    """Test that all DAOs in a request use the same connection."""
+    topic_dao = TopicDAO("topic", pool)
+    post_dao = PostDAO("post", pool)
+
+    with app.test_request_context():
+      begin_unit_of_work(pool)
+      with mock.patch.object(pool, "acquire", wraps=pool.acquire) as acquire:
+        topic_dao.get_one(1)
+        post_dao.get_post_and_users_with_pagination(1)
+        post_dao.get_one(1)
+      end_unit_of_work(commit=True)
+
+    assert acquire.call_count == 1
+
+  def test_commit_at_end(self, pool, app):
+    """Test that writes are only visible to others after the unit of work commits."""
+    post_dao = PostDAO("post", pool)
+
+    with app.test_request_context():
+      begin_unit_of_work(pool, write=True)
+      post_dao.delete(1)
+
+      conn = sqlite3.connect(test_db, timeout=0)
+      assert conn.execute("SELECT deleted FROM post WHERE id = 1").fetchone()[0] is None
+
+      end_unit_of_work(commit=True)
+
+    assert conn.execute("SELECT deleted FROM post WHERE id = 1").fetchone()[0] is not None
+    conn.close()
+
+  def test_rollback(self, pool, app):
+    """Test that writes are discarded when the unit of work is not committed."""
+    post_dao = PostDAO("post", pool)
+
+    with app.test_request_context():
+      begin_unit_of_work(pool, write=True)
+      post_dao.delete(1)
+      end_unit_of_work(commit=False)
+
+    assert post_dao.get_one(1) is not None
+
+  def test_snapshot(self, pool, app):
+    """Test that reads in a unit of work do not see writes committed after its first read."""
+    topic_dao = TopicDAO("topic", pool)
+
+    with app.test_request_context():
+      begin_unit_of_work(pool)
+      topic_dao.get_one(1)
+
+      conn = sqlite3.connect(test_db, timeout=0)
+      try:
+        conn.execute("UPDATE topic SET title = 'Changed' WHERE id = 1")
+        conn.commit()
+      except sqlite3.OperationalError:
+        pass  # Without WAL the writer has to wait for the reader instead.
+      finally:
+        conn.close()
+
+      assert topic_dao.get_one(1)["title"] == "Donald Trump"
+      end_unit_of_work(commit=True)
+
+  def test_after_commit(self, pool, app):
+    """Test that callbacks waiting for the commit run after it, when the writes are visible to others."""
+    post_dao = PostDAO("post", pool)
+    seen = []
+
+    def callback():
+      conn = sqlite3.connect(test_db, timeout=0)
+      seen.append(conn.execute("SELECT deleted FROM post WHERE id = 1").fetchone()[0])
+      conn.close()
+
+    with app.test_request_context():
+      begin_unit_of_work(pool, write=True)
+      post_dao.delete(1)
+      run_after_commit(callback)
+      assert seen == []
+
+      end_unit_of_work(commit=True)
+
+    assert len(seen) == 1 and seen[0] is not None
+
+  def test_after_commit_rollback(self, pool, app):
+    """Test that callbacks waiting for the commit are dropped when the unit of work rolls back."""
+    post_dao = PostDAO("post", pool)
+    callback = mock.Mock()
+
+    with app.test_request_context():
+      begin_unit_of_work(pool, write=True)
+      post_dao.delete(1)
+      run_after_commit(callback)
+      end_unit_of_work(commit=False)
+
+    callback.assert_not_called()
+
+  def test_after_commit_without_write_unit(self, pool, app):
+    """Test that a callback runs right away when the writes are not committed with the request."""
+    callback = mock.Mock()
+
+    with app.test_request_context():
+      begin_unit_of_work(pool)
+      run_after_commit(callback)
+      callback.assert_called_once()
+      end_unit_of_work(commit=True)
+
+    run_after_commit(callback)
+    assert callback.call_count == 2
@@ -3,7 +3,15 @@ import re
 import pytest
 import sqlite3
 import unittest.mock as mock
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from src.controllers.usercontroller import UserController
+from src.services.user_service import UserService
+from src.utils.cache import LRUCache
 from src.utils.daos import UserDAO
+from src.utils.daos.basedao import Ownership
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.unit_of_work import begin_unit_of_work, end_unit_of_work
 
 base_dir = os.path.dirname(__file__)
 test_db = os.path.join(base_dir, "test_data/test_db.sqlite")
@@ -155,6 +163,14 @@ class TestIntegrationUserDAO:
     with pytest.raises(Exception):
       sut_int.create(input_data)
 
+  def test_create_many(self, sut_int):
+    """Test to create many users, taken usernames give None."""
+    names = ["tony the tiger", "admin", "tony the tiger", "garfield"]
+    data = sut_int.create_many([{"username": name} for name in names])
+
+    assert [user["username"] if user else None for user in data] == ["tony the tiger", None, None, "garfield"]
+    assert sut_int.get_one(data[3]["user_id"]) == data[3]
+
   @pytest.mark.parametrize("id, input_data, expected",[
     (5, {"username": "tony the tiger"}, True),
     (2, {"username": "tony the tiger"}, False),
@@ -200,3 +216,85 @@ class TestIntegrationUserDAO:
     user = sut_int.get_user_by_username(username)
 
     assert user == expected_user
+
+  def test_cache_invalidated(self, sut_int):
+    """Test that cached users are read once and removed from the cache on update."""
+    sut_int._cache = LRUCache(10, 60)
+
+    with mock.patch.object(sut_int, "_connect_get_cursor", wraps=sut_int._connect_get_cursor) as connect:
+      assert sut_int.get_one(5) == sut_int.get_user_by_username("johndoe")
+      assert sut_int.get_one(5)["username"] == "johndoe"
+      assert connect.call_count == 1
+
+      sut_int.update(5, {"username": "tony the tiger"})
+
+      assert sut_int.get_user_by_username("johndoe") is None
+      assert sut_int.get_one(5)["username"] == "tony the tiger"
+      assert connect.call_count == 3
+
+  def test_route_string_ids(self, sut_int):
+    """Test that the user routes, getting the id as a string, read the cached user and remove it on update."""
+    sut_int._cache = LRUCache(10, 60)
+    controller = UserController(UserService(sut_int, None, None), "user")
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "a-test-secret-of-at-least-32-bytes"
+    # The identity of a token is the user, not a string
+    app.config["JWT_VERIFY_SUB"] = False
+    JWTManager(app)
+    app.route("/users/<id_num>", methods=["GET"])(controller.view("get_one"))
+    app.route("/users/<id_num>", methods=["PUT"])(controller.view("update"))
+    client = app.test_client()
+
+    with app.app_context():
+      headers = {"Authorization": f"Bearer {create_access_token(identity=sut_int.get_one(5))}"}
+
+    with mock.patch.object(sut_int, "_connect_get_cursor", wraps=sut_int._connect_get_cursor) as connect:
+      assert client.get("/users/5").json["data"]["username"] == "johndoe"
+      assert connect.call_count == 1
+
+      assert client.put("/users/5", json={"signature": "Mine"}, headers=headers).status_code == 200
+      assert sut_int._cached(("id", 5)) is None
+
+    assert client.get("/users/5").json["data"]["signature"] == "Mine"
+
+  def test_update_owned(self, sut_int):
+    """Test that a user is updated by itself only, and removed from the cache when updated by route id."""
+    sut_int._cache = LRUCache(10, 60)
+    sut_int.get_one(5)
+
+    assert sut_int.update_owned(5, 1, {"signature": "Not mine"}) == Ownership.NOT_OWNER
+    assert sut_int.update_owned(200, 200, {"signature": "Nobody"}) == Ownership.NOT_FOUND
+    assert sut_int.update_owned("5", 5, {"signature": "Mine"}) == Ownership.WRITTEN
+    assert sut_int.get_one(5)["signature"] == "Mine"
+
+  @pytest.mark.parametrize("commit", [True, False])
+  def test_cache_invalidated_on_commit(self, sut_int, commit):
+    """Test that a user written in a unit of work leaves the cache when the unit of work commits, not before."""
+    pool = ConnectionPool(test_db, size=1)
+    dao = UserDAO("user", pool, cache=LRUCache(10, 60))
+    dao.get_one(5)
+
+    with Flask(__name__).test_request_context():
+      begin_unit_of_work(pool, write=True)
+      assert dao.update_owned(5, 5, {"signature": "Mine"}) == Ownership.WRITTEN
+      assert dao._cached(("id", 5)) is not None
+
+      end_unit_of_work(commit=commit)
+
+    assert (dao._cached(("id", 5)) is None) == commit
+    pool.close()
+
+  def test_get_many(self, sut_int):
+    """Test that many users are read in the order of the ids, only the ones not cached from the database."""
+    sut_int._cache = LRUCache(10, 60)
+    sut_int.get_one(5)
+
+    with mock.patch.object(sut_int, "_connect_get_cursor", wraps=sut_int._connect_get_cursor) as connect:
+      users = sut_int.get_many([5, 2, 1])
+
+      assert [None if user is None else user["username"] for user in users] == ["johndoe", None, "admin"]
+      assert connect.call_count == 1
+
+      sut_int.get_many([1, 5])
+
+      assert connect.call_count == 1
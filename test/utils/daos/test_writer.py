@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import threading
+import pytest
+import unittest.mock as mock
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from src.utils.daos import PostDAO
+from src.utils.daos.connection_pool import ConnectionPool
+from src.utils.daos.writer import Writer
+
+base_dir = os.path.dirname(__file__)
+test_db = os.path.join(base_dir, "test_data/test_writer.sqlite")
+
+
+@pytest.fixture
+def sut():
+  """SUT for writer tests, a writer for a database with one table."""
+  conn = sqlite3.connect(test_db)
+  conn.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+  conn.commit()
+  conn.close()
+
+  pool = ConnectionPool(test_db, size=2)
+  sut = Writer(pool)
+  yield sut
+  sut.close()
+  pool.close()
+  os.remove(test_db)
+
+
+def insert(name: str | None):
+  """Work inserting an item, returns the new id."""
+  def work(cur: sqlite3.Cursor) -> int:
+    cur.execute("INSERT INTO item (name) VALUES (?)", (name, ))
+    return cur.lastrowid
+  return work
+
+
+def count_items() -> int:
+  """Number of committed items."""
+  conn = sqlite3.connect(test_db)
+  count = conn.execute("SELECT COUNT(*) FROM item").fetchone()[0]
+  conn.close()
+  return count
+
+
+@pytest.mark.unit
+class TestUnitWriter:
+  """Unit tests for the writer."""
+
+  def test_group_commit(self, sut):
+    """Test that writes queued together are committed in one transaction, each getting its own result."""
+    with mock.patch.object(Writer, "_commit_batch", wraps=Writer._commit_batch) as commit_batch:
+      started = threading.Event()
+      release = threading.Event()
+
+      def block(cur):
+        started.set()
+        release.wait()
+
+      first = sut.submit(block)
+      started.wait()
+      futures = [sut.submit(insert(f"item {i}")) for i in range(10)]
+      release.set()
+
+      assert [future.result() for future in futures] == list(range(1, 11))
+      first.result()
+
+    assert commit_batch.call_count == 2
+    assert count_items() == 10
+
+  def test_failing_write_alone(self, sut):
+    """Test that a failing write is rolled back and fails alone, the others in the group are committed."""
+    futures = [sut.submit(insert(name)) for name in ("a", None, "b")]
+
+    assert futures[0].result() is not None and futures[2].result() is not None
+    with pytest.raises(sqlite3.IntegrityError):
+      futures[1].result()
+    assert count_items() == 2
+
+  def test_dao_writes_through_writer(self, sut):
+    """Test that a DAO with a writer runs its writes on the writer thread."""
+    conn = sqlite3.connect(test_db)
+    with open("./db/ddl.sql", "r") as f:
+      conn.executescript(f.read())
+    conn.execute("INSERT INTO user (username) VALUES ('admin')")
+    conn.commit()
+    conn.close()
+
+    dao = PostDAO("post", sut.pool, sut)
+    with mock.patch.object(sut, "run", wraps=sut.run) as run:
+      post = dao.create({"author": 1, "topic_id": 1, "body": "Written by the writer"})
+
+    assert run.call_count == 1
+    assert dao.get_one(post["post_id"])["body"] == "Written by the writer"
+
+  def test_failing_connect(self, sut):
+    """Test that a group failing to connect fails its writes only, and the writer keeps running."""
+    connect = sut.pool.connect
+
+    with mock.patch.object(sut.pool, "connect", side_effect=sqlite3.OperationalError("unable to open database file")):
+      with pytest.raises(sqlite3.OperationalError):
+        sut.run(insert("a"))
+
+    with mock.patch.object(sut.pool, "connect", side_effect=connect):
+      assert sut.run(insert("b")) == 1
+    assert count_items() == 1
+
+  @pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+  def test_dead_thread_restarted(self, sut):
+    """Test that the writes queued when the thread dies are failed and the next write starts a new thread."""
+    threads = []
+
+    def die(*args):
+      threads.append(threading.current_thread())
+      raise SystemExit
+
+    with mock.patch.object(Writer, "_commit_batch", side_effect=die):
+      with pytest.raises(RuntimeError):
+        sut.run(insert("a"))
+
+      threads[0].join(timeout=5)
+
+    assert not threads[0].is_alive()
+    assert sut.run(insert("b")) == 1
+
+  def test_timeout(self, sut):
+    """Test that run() gives up on a write that is not committed within the timeout."""
+    release = threading.Event()
+    sut.submit(lambda cur: release.wait())
+    sut._timeout = 0.1
+
+    with pytest.raises(FutureTimeoutError):
+      sut.run(insert("a"))
+
+    release.set()
+    sut._timeout = 30
+    assert sut.run(insert("b")) == 1
+    assert count_items() == 1
@@ -0,0 +1,182 @@
+import pytest
+import unittest.mock as mock
+from src.services.post_service import PostService
+from src.utils.cache import LRUCache, PageSummary, TopicPageCache
+from src.utils.daos.basedao import Ownership
+
+
+def page(topic_id: int, number: int, pages: int, posts: int = 2) -> dict:
+  """A cached page of a topic with 2 posts per page, post ids in order of creation."""
+  first = number * 2 + 1
+  return {
+    "topic": {"topic_id": topic_id, "created_by": {"user_id": 1}},
+    "posts": [
+      {"post_id": i, "created": f"2024-06-{i:02}", "author": {"user_id": i}} for i in range(first, first + posts)
+    ],
+    "next": "token" if posts == 2 else None,
+    "pages": pages
+  }
+
+
+@pytest.fixture
+def pages():
+  """A page cache with the 3 pages of topic 1, the last with one post, and the first page of topic 2."""
+  cache = TopicPageCache(10, 60)
+  for number in range(3):
+    cache.set(1, number, page(1, number, 3, 1 if number == 2 else 2), 0)
+  cache.set(2, 0, page(2, 0, 1), 0)
+  return cache
+
+
+@pytest.mark.unit
+class TestUnitLRUCache:
+  """Unit tests for the LRU cache."""
+
+  def test_evicts_least_recently_used(self):
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache = LRUCache(2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats() == {
+      "size": 2, "max_size": 2, "hits": 3, "misses": 1, "evictions": 1, "expirations": 0
+    }
+
+  def test_ttl(self):
+    """Test that an entry older than the time to live is a miss."""
+    cache = LRUCache(2, 60)
+
+    with mock.patch("src.utils.cache.time.monotonic", side_effect=[0, 30, 61]):
+      cache.set("a", 1)
+      assert cache.get("a") == 1
+      assert cache.get("a") is None
+
+    assert cache.stats()["expirations"] == 1 and len(cache) == 0
+
+  def test_delete_where(self):
+    """Test removing entries by a predicate."""
+    cache = LRUCache(10, 60)
+    for i in range(5):
+      cache.set(i, i * 10)
+
+    assert cache.delete_where(lambda key, value: value >= 30) == 2
+    assert len(cache) == 3
+
+  def test_disabled(self):
+    """Test that a cache of size 0 keeps nothing."""
+    cache = LRUCache(0, 60)
+    cache.set("a", 1)
+
+    assert not cache.enabled and cache.get("a") is None
+
+
+@pytest.mark.unit
+class TestUnitTopicPageCache:
+  """Unit tests for the cache of topic pages."""
+
+  def test_new_post_on_last_page(self, pages):
+    """Test that a post added to the last page removes the last page only."""
+    assert pages.invalidate_from(1, "2024-06-06", 6, 3) == 1
+    assert [pages.get(1, number) is not None for number in range(3)] == [True, True, False]
+    assert pages.get(2, 0) is not None
+
+  def test_new_page(self, pages):
+    """Test that a change of the number of pages removes every page of the topic."""
+    assert pages.invalidate_from(1, "2024-06-06", 6, 4) == 3
+    assert pages.get(2, 0) is not None
+
+  def test_deleted_post(self, pages):
+    """Test that a deleted post removes its page and the pages after it."""
+    assert pages.invalidate_from(1, "2024-06-03", 3, 3) == 2
+    assert pages.get(1, 0) is not None
+
+  def test_edited_post(self, pages):
+    """Test that a post edited through the service, with the id as a string from the route, removes its page only."""
+    dao = mock.Mock(**{"update_owned.return_value": (Ownership.WRITTEN, 1)})
+    service = PostService(dao, None, page_cache=pages)
+
+    assert service.update("4", {"body": "Edited"}, {"user_id": 4, "username": "author", "role": "author"})
+    assert pages.get(1, 1) is None
+    assert pages.get(1, 0) is not None and pages.get(1, 2) is not None
+
+  def test_stale_read_not_stored(self, pages):
+    """Test that a page read before an invalidation of the topic is not stored after it."""
+    version = pages.version(2)
+    pages.invalidate_topic(2)
+    pages.set(2, 0, page(2, 0, 1), version)
+
+    assert pages.get(2, 0) is None
+
+  def test_versions_bounded(self):
+    """Test that versions are kept for max_size topics, a page read before its topic was dropped is not stored."""
+    cache = TopicPageCache(2, 60)
+    version = cache.version(1)
+    cache.invalidate_topic(1)
+
+    for topic_id in range(2, 10):
+      cache.invalidate_topic(topic_id)
+
+    assert list(cache._versions) == [8, 9]
+
+    cache.set(1, 0, page(1, 0, 1), version)
+    assert cache.get(1, 0) is None
+
+    cache.set(1, 0, page(1, 0, 1), cache.version(1))
+    assert cache.get(1, 0) is not None
+
+  def test_document_dropped_with_activity(self, pages):
+    """Test that the JSON document of a page is kept with the page, but not after the topic on it is patched."""
+    pages.set(2, 0, page(2, 0, 1), 0, '{"next":null}')
+
+    assert pages.get_document(2, 0) == '{"next":null}'
+    assert pages.get_document(1, 0) is None
+
+    pages.invalidate_from(2, "2024-06-09", 9, 1, {"post_count": 3})
+
+    assert pages.get_document(2, 0) is None
+    assert pages.get(2, 0)["topic"]["post_count"] == 3
+
+  def test_document_only(self, pages):
+    """Test that a page stored as document is invalidated by its summary and kept when stored as dict too."""
+    summary = PageSummary(1, None, frozenset([1]), frozenset([1, 7]), None)
+    pages.set_document(3, 0, '{"next":null}', summary, 0)
+    pages.set_document(3, 1, '{"next":"token"}', summary, 0)
+
+    assert pages.get(3, 0) is None and pages.get_document(3, 0) == '{"next":null}'
+
+    pages.set(3, 0, page(3, 0, 1), 0)
+
+    assert pages.get(3, 0) is not None and pages.get_document(3, 0) == '{"next":null}'
+    assert pages.invalidate_user(7) == 1
+    assert pages.get_document(3, 0) is not None and pages.get_document(3, 1) is None
+
+  def test_document_only_removed_with_activity(self, pages):
+    """Test that a page kept by a new post is removed if it is stored as document only."""
+    summary = PageSummary(2, ("2024-06-02", 2), frozenset([1, 2]), frozenset([1]), 1)
+    pages.set_document(3, 0, '{"next":"token"}', summary, 0)
+
+    assert pages.invalidate_from(3, "2024-06-09", 9, 2, {"post_count": 3}) == 1
+    assert pages.get_document(3, 0) is None and len(pages._pages) == 4
+
+  def test_changed_elsewhere(self, pages):
+    """Test that the pages of a topic are removed when a page shows another version of the topic than the database."""
+    pages.set(2, 0, {**page(2, 0, 1), "topic": {"topic_id": 2, "created_by": {"user_id": 1}, "version": 3}}, 0)
+
+    assert pages.invalidate_stale(2, 0, 3) == 0
+    assert pages.invalidate_stale(2, 0, 4) == 1
+    assert pages.get(2, 0) is None
+    assert pages.get(1, 0) is not None
+
+  def test_on_change(self):
+    """Test that every invalidated topic is passed to on_change, like for purging the response cache."""
+    on_change = mock.Mock()
+    cache = TopicPageCache(10, 60, on_change=on_change)
+    cache.set(1, 0, page(1, 0, 1), 0)
+
+    cache.invalidate_post(2, 3)
+    cache.invalidate_user(1)
+
+    assert on_change.call_args_list == [mock.call(2), mock.call(1)]
@@ -0,0 +1,67 @@
+import pytest
+import unittest.mock as mock
+from src.utils.feed import LatestTopicsFeed
+
+
+def topic(topic_id: int, created: str) -> dict:
+  """A topic as read by TopicDAO."""
+  return {"topic_id": topic_id, "created": created, "title": f"Topic {topic_id}"}
+
+
+@pytest.fixture
+def loader():
+  """Loader reading the latest of 5 topics, newest first."""
+  topics = [topic(i, f"2024-06-0{i}") for i in range(5, 0, -1)]
+  return mock.Mock(side_effect=lambda limit: topics[:limit])
+
+
+@pytest.mark.unit
+class TestUnitLatestTopicsFeed:
+  """Unit tests for the feed of latest topics."""
+
+  def test_loaded_once(self, loader):
+    """Test that the feed is loaded on first use and then served from memory."""
+    feed = LatestTopicsFeed(loader, size=3, ttl=60)
+
+    assert [t["topic_id"] for t in feed.get(2)] == [5, 4]
+    assert [t["topic_id"] for t in feed.get(3)] == [5, 4, 3]
+    assert loader.call_args_list == [mock.call(3)]
+
+  def test_add_and_remove(self, loader):
+    """Test that created topics are added first and deleted topics are removed, refilling when too short."""
+    feed = LatestTopicsFeed(loader, size=3, ttl=60)
+    feed.get(3)
+    feed.add(topic(6, "2024-06-06"))
+
+    assert [t["topic_id"] for t in feed.get(3)] == [6, 5, 4]
+
+    feed.remove(5)
+
+    assert [t["topic_id"] for t in feed.get(2)] == [6, 4]
+    assert loader.call_count == 1
+    assert [t["topic_id"] for t in feed.get(3)] == [5, 4, 3]
+    assert loader.call_count == 2
+
+  def test_larger_than_feed(self, loader):
+    """Test that asking for more topics than the feed keeps reads them from the database."""
+    feed = LatestTopicsFeed(loader, size=2, ttl=60)
+
+    assert len(feed.get(4)) == 4
+    assert loader.call_args_list == [mock.call(4)]
+
+  def test_rebuild(self, loader):
+    """Test that a rebuild reloads the feed from the database."""
+    feed = LatestTopicsFeed(loader, size=3, ttl=60)
+    feed.get(3)
+    feed.add(topic(9, "2024-06-09"))
+    feed.rebuild()
+
+    assert [t["topic_id"] for t in feed.get(3)] == [5, 4, 3]
+
+  def test_update(self, loader):
+    """Test that fields of a topic in the feed are updated, like the activity after a new post."""
+    feed = LatestTopicsFeed(loader, size=3, ttl=60)
+    feed.get(3)
+    feed.update(4, {"post_count": 3})
+
+    assert [t.get("post_count") for t in feed.get(3)] == [None, 3, None]
@@ -0,0 +1,84 @@
+import datetime
+import dataclasses
+import decimal
+import uuid
+import pytest
+import unittest.mock as mock
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from src.utils.json_provider import FastJSONProvider
+
+
+@dataclasses.dataclass
+class Score:
+  """A search result score, encoded by the default provider as a dict."""
+  score: float
+
+
+PAYLOADS = [
+  {"status": "success", "data": [{"post_id": i, "body": "hej", "deleted": None, "ok": True} for i in range(3)]},
+  {"title": "Smörgåsbord   \U0001f600", "control": "\x00\x1f\x7f\"\\/\n\t"},
+  {"title": "Smörgåsbord \U0001f600 \x7f", "body": "x 'Göteborg' ✓ ÿĀ\n"},
+  {"created": datetime.datetime(2024, 6, 1, 12, 30), "price": decimal.Decimal("1.50"), "id": uuid.UUID(int=1)},
+  {"big": 2 ** 70},
+  {1: "int key", 2: "sorted"},
+  {"results": [{"score": -1.0862196020633753e-06}, {"score": 1e16}, {"score": 0.00001}, {"score": 1.5}]},
+  {"result": Score(1e16)},
+  [],
+  None,
+]
+
+
+@pytest.fixture
+def app():
+  """An app with the fast JSON provider and an error handler returning a dict, like the API blueprint."""
+  app = Flask(__name__)
+  app.json = FastJSONProvider(app)
+
+  @app.route("/error")
+  def error():
+    raise ValueError("Hälsning")
+
+  @app.errorhandler(ValueError)
+  def handle(err):
+    return {"status": "error", "details": f"{err}"}, 400
+
+  return app
+
+
+@pytest.mark.unit
+class TestUnitFastJSONProvider:
+  """Unit tests for the fast JSON provider."""
+
+  @pytest.mark.parametrize("payload", PAYLOADS)
+  def test_same_as_default(self, app, payload):
+    """Test that a response has the same bytes as from Flask's default provider."""
+    default = DefaultJSONProvider(app)
+
+    with app.app_context():
+      assert app.json.fast
+      assert app.json.response(payload).get_data() == default.response(payload).get_data()
+
+  @pytest.mark.parametrize("payload", [{"score": -1.0862196020633753e-06}, [[1e16]], Score(0.5)])
+  def test_floats(self, app, payload):
+    """Test that data with floats is not encoded with orjson, which writes some of them differently."""
+    with pytest.raises(TypeError):
+      app.json.encode(payload)
+
+  def test_error_response(self, app):
+    """Test that an error handler returning a dict is encoded by the provider."""
+    with mock.patch.object(FastJSONProvider, "encode", wraps=app.json.encode) as encode:
+      response = app.test_client().get("/error")
+
+    assert encode.called
+    assert response.get_data() == b'{"details":"H\\u00e4lsning","status":"error"}\n'
+
+  def test_fallback(self, app):
+    """Test that responses are encoded by the default provider without orjson and in debug mode."""
+    with mock.patch("src.utils.json_provider.orjson", None):
+      assert not app.json.fast
+      with app.app_context():
+        assert app.json.response(PAYLOADS[1]).get_data() == DefaultJSONProvider(app).response(PAYLOADS[1]).get_data()
+
+    app.debug = True
+    assert not app.json.fast
@@ -0,0 +1,25 @@
+import pytest
+from src.utils.pagination import encode_cursor, decode_cursor
+from src.errors.customerrors import InputInvalidException
+
+
+@pytest.mark.unit
+class TestUnitPagination:
+  """Unit tests for page tokens."""
+
+  def test_round_trip(self):
+    """Test that a decoded token gives back the encoded values."""
+    token = encode_cursor("2024-06-11 10:20:31", 16)
+
+    assert decode_cursor(token, str, int) == ("2024-06-11 10:20:31", 16)
+
+  @pytest.mark.parametrize("token",[
+    ("not a token"),
+    (encode_cursor("2024-06-11 10:20:31")),
+    (encode_cursor(16, "2024-06-11 10:20:31")),
+    (encode_cursor("2024-06-11 10:20:31", True)),
+  ])
+  def test_invalid(self, token):
+    """Test that invalid or tampered tokens raise InputInvalidException."""
+    with pytest.raises(InputInvalidException):
+      decode_cursor(token, str, int)
@@ -0,0 +1,144 @@
+import time
+import pytest
+import unittest.mock as mock
+from flask import Blueprint, Flask, Response, jsonify, request
+from src.utils.response_cache import CachePolicy, ResponseCache
+
+
+def make_app(cache: ResponseCache) -> tuple[Flask, list[str]]:
+  """An app with the cached route /api/topics/<id_num>, with an ETag, and the uncached route /api/users. The
+  paths of the requests reaching the routes are collected in the returned list."""
+  calls = []
+  api = Blueprint("api", __name__, url_prefix="/api")
+  topics = Blueprint("topics", __name__, url_prefix="/topics")
+
+  @topics.route("/<id_num>")
+  def topic(id_num):
+    calls.append(request.full_path)
+    response = jsonify(topic_id=id_num, call=len(calls))
+    response.set_etag(f"topic-{id_num}", weak=True)
+    return response
+
+  @api.route("/users")
+  def users():
+    calls.append(request.full_path)
+    return {"call": len(calls)}
+
+  api.before_request(lambda: cache.serve(request))
+  api.after_request(lambda response: cache.store(request, response))
+  cache.route(topics, "/<id_num>", CachePolicy(max_age=10, stale_while_revalidate=60))
+  api.register_blueprint(topics)
+
+  app = Flask(__name__)
+  app.register_blueprint(api)
+  return app, calls
+
+
+def response(size: int) -> Response:
+  """A response with a body of size bytes."""
+  return Response(b"x" * size)
+
+
+@pytest.mark.unit
+class TestUnitResponseCache:
+  """Unit tests for the response cache."""
+
+  def test_anonymous_get_is_cached(self):
+    """Test that anonymous requests to a cached route get the same response, with the caching headers."""
+    app, calls = make_app(ResponseCache(1024 * 1024))
+    client = app.test_client()
+
+    first = client.get("/api/topics/1")
+    second = client.get("/api/topics/1")
+
+    assert calls == ["/api/topics/1?"]
+    assert first.get_data() == second.get_data()
+    assert second.headers["Cache-Control"] == "public, max-age=10, stale-while-revalidate=60"
+    assert second.headers["Vary"] == "Authorization" and second.headers["Age"] == "0"
+
+  def test_not_cached(self):
+    """Test that requests with an Authorization header and routes without a policy are not cached."""
+    app, calls = make_app(ResponseCache(1024 * 1024))
+    client = app.test_client()
+
+    for _ in range(2):
+      client.get("/api/topics/1", headers={"Authorization": "Bearer token"})
+      client.get("/api/users")
+
+    assert len(calls) == 4
+    assert "Cache-Control" not in client.get("/api/users").headers
+
+  def test_conditional_hit(self):
+    """Test that a conditional request for a cached response gets 304 without body."""
+    app, _ = make_app(ResponseCache(1024 * 1024))
+    client = app.test_client()
+    etag = client.get("/api/topics/1").headers["ETag"]
+
+    not_modified = client.get("/api/topics/1", headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304 and not_modified.get_data() == b""
+
+  def test_stale_while_revalidate(self):
+    """Test that a stale response is served while one background request refreshes it."""
+    cache = ResponseCache(1024 * 1024)
+    app, calls = make_app(cache)
+    client = app.test_client()
+    start = time.monotonic()
+
+    with mock.patch("src.utils.response_cache.time.monotonic", return_value=start):
+      client.get("/api/topics/1")
+
+    with mock.patch("src.utils.response_cache.time.monotonic", return_value=start + 20):
+      stale = client.get("/api/topics/1")
+      cache._get_executor().shutdown(wait=True)
+      refreshed = client.get("/api/topics/1")
+
+    assert stale.json["call"] == 1 and stale.headers["Age"] == "20"
+    assert refreshed.json["call"] == 2 and len(calls) == 2
+    assert cache.stats()["stale_hits"] == 1
+
+  def test_expired(self):
+    """Test that a response older than max_age and stale_while_revalidate is a miss."""
+    cache = ResponseCache(1024)
+    policy = CachePolicy(10, 60)
+
+    with mock.patch("src.utils.response_cache.time.monotonic", side_effect=[0, 69, 70]):
+      cache.set("a", response(10), policy)
+      assert cache.get("a")[1] == 69
+      assert cache.get("a") is None
+
+    assert len(cache) == 0
+
+  def test_byte_bound(self):
+    """Test that the least recently used responses are evicted to fit the bytes, too large ones not stored."""
+    cache = ResponseCache(1000, max_entry=600)
+    policy = CachePolicy(10)
+
+    for key in ("a", "b", "c"):
+      cache.set(key, response(300), policy)
+
+    assert not cache.set("d", response(700), policy)
+    assert [cache.get(key) is not None for key in "abcd"] == [False, True, True, False]
+    assert cache.stats()["bytes"] <= 1000 and cache.stats()["evictions"] == 1
+
+  def test_purge_prefix(self):
+    """Test that purging a topic removes the topic and its pages only, and a response read before is not stored."""
+    cache = ResponseCache(1024 * 1024)
+    policy = CachePolicy(10)
+    for key in ("/api/topics/1?", "/api/topics/1/page/0?", "/api/topics/10?", "/api/topics/latest?"):
+      cache.set(key, response(10), policy)
+    generation = cache.generation()
+
+    assert cache.purge_topic(1) == 2
+    assert sorted(key for key in cache._entries) == ["/api/topics/10?", "/api/topics/latest?"]
+    assert not cache.set("/api/topics/1?", response(10), policy, generation)
+
+  def test_disabled(self):
+    """Test that a cache of 0 bytes stores nothing."""
+    app, calls = make_app(ResponseCache(0))
+    client = app.test_client()
+
+    client.get("/api/topics/1")
+    client.get("/api/topics/1")
+
+    assert len(calls) == 2
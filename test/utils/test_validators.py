@@ -0,0 +1,37 @@
+import pytest
+from flask import Flask, request
+from src.utils.validators import make_validator, is_not_modified
+
+app = Flask(__name__)
+
+
+@pytest.mark.unit
+class TestUnitValidators:
+  """Unit tests for the validators of conditional GET."""
+
+  def test_make_validator(self):
+    """Test that the ETag follows the version and the timestamp is read as UTC."""
+    validator = make_validator((1, 2), "2024-06-11 10:20:31")
+
+    assert validator.etag == make_validator((1, 2)).etag != make_validator((1, 3)).etag
+    assert validator.last_modified.isoformat() == "2024-06-11T10:20:31+00:00"
+    assert make_validator(1, "not a timestamp").last_modified is None
+
+  @pytest.mark.parametrize("headers, expected",[
+    ({}, False),
+    ({"If-None-Match": 'W/"{etag}"'}, True),
+    ({"If-None-Match": '"{etag}"'}, True),
+    ({"If-None-Match": '"other", W/"{etag}"'}, True),
+    ({"If-None-Match": "*"}, True),
+    ({"If-None-Match": 'W/"other"'}, False),
+    ({"If-Modified-Since": "Tue, 11 Jun 2024 10:20:31 GMT"}, True),
+    ({"If-Modified-Since": "Tue, 11 Jun 2024 10:20:30 GMT"}, False),
+    ({"If-None-Match": 'W/"other"', "If-Modified-Since": "Tue, 11 Jun 2024 10:20:31 GMT"}, False),
+  ])
+  def test_is_not_modified(self, headers, expected):
+    """Test If-None-Match and If-Modified-Since, If-None-Match wins when both are sent."""
+    validator = make_validator(1, "2024-06-11 10:20:31")
+    headers = {key: value.replace("{etag}", validator.etag) for key, value in headers.items()}
+
+    with app.test_request_context(headers=headers):
+      assert is_not_modified(validator, request) == expected